@@ -0,0 +1,96 @@
+"""Бенчмарк вставки ответов: построчный путь против массового.
+
+    python -m benchmarks.bulk_insert --rows 10000
+    python -m benchmarks.bulk_insert --url postgresql://postgres@localhost/qa_bench
+
+База должна быть отдельной: таблицы создаются заново перед замером.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.questions_answers_api.core.database import Base, to_async_url
+from src.questions_answers_api.repositories import (
+    AnswerRepository,
+    QuestionRepository,
+)
+from src.questions_answers_api.schemas.bulk import MAX_BULK_SIZE
+
+
+async def insert_single(db: AsyncSession, question_id: int, rows: int) -> None:
+    """Вставить ответы по одному через AnswerRepository.create."""
+    repo = AnswerRepository(db)
+    for i in range(rows):
+        await repo.create(question_id, f"user{i % 100}", f"Ответ {i}")
+
+
+async def insert_bulk(db: AsyncSession, question_id: int, rows: int) -> None:
+    """Вставить ответы пачками через AnswerRepository.create_many."""
+    repo = AnswerRepository(db)
+    for start in range(0, rows, MAX_BULK_SIZE):
+        items = [
+            (f"user{i % 100}", f"Ответ {i}")
+            for i in range(start, min(start + MAX_BULK_SIZE, rows))
+        ]
+        await repo.create_many(question_id, items)
+
+
+async def measure(engine, insert, rows: int) -> dict:
+    """Замерить один способ вставки на чистой схеме."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        question = await QuestionRepository(db).create("Вопрос для бенчмарка")
+        event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+        started = time.perf_counter()
+        await insert(db, question.id, rows)
+        elapsed = time.perf_counter() - started
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed, 1),
+        "statements": statements,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    engine = create_async_engine(to_async_url(args.url))
+    try:
+        return {
+            "single": await measure(engine, insert_single, args.rows),
+            "bulk": await measure(engine, insert_bulk, args.rows),
+        }
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url is None:
+            args.url = f"sqlite:///{tmp}/bench.db"
+        print(json.dumps(asyncio.run(run(args)), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
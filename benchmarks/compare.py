@@ -0,0 +1,75 @@
+"""Сравнение двух JSON-результатов бенчмарков.
+
+    python -m benchmarks.load --output before.json
+    # ... изменения ...
+    python -m benchmarks.load --output after.json
+    python -m benchmarks.compare before.json after.json
+
+Для каждого сценария (или операции), который есть в обоих файлах,
+выводятся перцентили и пропускная способность и их изменение в процентах.
+Результаты сравнимы, только если совпадают набор данных и окружение.
+"""
+
+import argparse
+import json
+from typing import Optional
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+SECTIONS = ("scenarios", "operations")
+NAME_WIDTH = 52
+CELL_WIDTH = 32
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return "—"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def without(values: dict, key: str) -> dict:
+    return {name: value for name, value in values.items() if name != key}
+
+
+def compare(before: dict, after: dict) -> list[str]:
+    """Строки таблицы сравнения."""
+    lines = []
+    # Коммит и время генерации данных и должны отличаться, остальное — нет.
+    for key, label, ignored in (
+        ("dataset", "наборы данных", "seconds"),
+        ("environment", "окружения", "commit"),
+    ):
+        if without(before.get(key, {}), ignored) != without(
+            after.get(key, {}), ignored
+        ):
+            lines.append(f"Внимание: {label} различаются")
+    header = f"{'':<{NAME_WIDTH}}" + "".join(
+        f"{metric:>{CELL_WIDTH}}" for metric in METRICS
+    )
+    lines.append(header)
+    for section in SECTIONS:
+        common = before.get(section, {}).keys() & after.get(section, {}).keys()
+        for name in sorted(common):
+            old, new = before[section][name], after[section][name]
+            cells = "".join(
+                f"{f'{old[m]} → {new[m]} ({change(old[m], new[m])})':>{CELL_WIDTH}}"
+                for m in METRICS
+            )
+            lines.append(f"{name:<{NAME_WIDTH}}{cells}")
+    return lines
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+
+    with open(args.before, encoding="utf-8") as file:
+        before = json.load(file)
+    with open(args.after, encoding="utf-8") as file:
+        after = json.load(file)
+    print("\n".join(compare(before, after)))
+
+
+if __name__ == "__main__":
+    main()
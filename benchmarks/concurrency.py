@@ -0,0 +1,106 @@
+"""Нагрузочный бенчмарк: пропускная способность при конкурентных клиентах.
+
+Запускается против работающего сервера:
+
+    uvicorn src.questions_answers_api.main:app --port 8000
+    python -m benchmarks.concurrency --url http://127.0.0.1:8000 --clients 200
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from .stats import percentile
+
+
+async def seed(client: httpx.AsyncClient, questions: int, answers: int) -> list[int]:
+    """Создать тестовые вопросы с ответами и вернуть их ID."""
+    question_ids = []
+    for i in range(questions):
+        response = await client.post("/questions/", json={"text": f"Вопрос {i}"})
+        response.raise_for_status()
+        question_id = response.json()["id"]
+        question_ids.append(question_id)
+        for j in range(answers):
+            response = await client.post(
+                f"/questions/{question_id}/answers/",
+                json={"user_id": f"user{j}", "text": f"Ответ {j}"},
+            )
+            response.raise_for_status()
+    return question_ids
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    question_ids: list[int],
+    deadline: float,
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    """Отправлять запросы на чтение вопросов до истечения времени."""
+    while time.perf_counter() < deadline:
+        if random.random() < 0.1:
+            path = "/questions/"
+        else:
+            path = f"/questions/{random.choice(question_ids)}"
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Провести замер и вернуть сводку результатов."""
+    limits = httpx.Limits(max_connections=args.clients)
+    async with httpx.AsyncClient(
+        base_url=args.url, limits=limits, timeout=args.timeout
+    ) as client:
+        question_ids = await seed(client, args.questions, args.answers)
+
+        latencies: list[float] = []
+        errors: list[int] = []
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                worker(client, question_ids, deadline, latencies, errors)
+                for _ in range(args.clients)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "clients": args.clients,
+        "duration_s": round(elapsed, 2),
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--answers", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
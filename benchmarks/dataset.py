@@ -0,0 +1,163 @@
+"""Генератор синтетических данных для бенчмарков.
+
+    python -m benchmarks.dataset --scale small
+    python -m benchmarks.dataset --scale large --url postgresql://postgres@localhost/qa_bench
+
+Данные воспроизводимы: одинаковые масштаб, перекос и seed дают одинаковые
+вопросы и ответы. Число ответов на вопрос распределено по закону Ципфа —
+немного «горячих» вопросов с тысячами ответов и длинный хвост почти без
+ответов. База должна быть отдельной: таблицы создаются заново.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.questions_answers_api.core.database import Base, to_async_url
+from src.questions_answers_api.repositories import ImportRepository
+
+# Масштаб → (вопросов, ответов).
+SCALES = {
+    "tiny": (100, 1_000),
+    "small": (1_000, 10_000),
+    "medium": (10_000, 100_000),
+    "large": (100_000, 1_000_000),
+}
+CHUNK_SIZE = 10_000
+USERS = 1_000
+# Даты отсчитываются от фиксированного момента, а не от текущего: одинаковый
+# seed дает одинаковые created_at независимо от дня запуска.
+STARTED_AT = datetime(2024, 1, 1)
+PERIOD = timedelta(days=365)
+
+WORDS = (
+    "база данных индекс запрос транзакция кэш пул соединение сервер клиент "
+    "миграция таблица ключ ответ вопрос страница курсор поиск очередь "
+    "задержка нагрузка память диск сеть блокировка реплика версия схема"
+).split()
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Параметры набора данных."""
+
+    questions: int
+    answers: int
+    # Показатель закона Ципфа: 0 — ответы распределены равномерно.
+    skew: float = 1.0
+    seed: int = 42
+
+    @classmethod
+    def from_scale(cls, scale: str, skew: float = 1.0, seed: int = 42):
+        questions, answers = SCALES[scale]
+        return cls(questions, answers, skew, seed)
+
+
+def answers_per_question(spec: DatasetSpec) -> list[int]:
+    """Число ответов каждого вопроса; сумма равна spec.answers."""
+    weights = [1 / rank**spec.skew for rank in range(1, spec.questions + 1)]
+    total = sum(weights)
+    counts = [int(spec.answers * weight / total) for weight in weights]
+    for rank in range(spec.answers - sum(counts)):
+        counts[rank % spec.questions] += 1
+    # Популярность не должна совпадать с порядком создания вопросов.
+    random.Random(spec.seed).shuffle(counts)
+    return counts
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+async def generate(db: AsyncSession, spec: DatasetSpec) -> list[int]:
+    """Записать набор данных и вернуть ID вопросов в порядке создания."""
+    rng = random.Random(spec.seed)
+    repo = ImportRepository(db)
+    counts = answers_per_question(spec)
+    question_ids = await repo.reserve_question_ids(spec.questions)
+    step = PERIOD / spec.questions
+
+    questions, answers = [], []
+    for index, (question_id, count) in enumerate(zip(question_ids, counts)):
+        created_at = STARTED_AT + step * index
+        questions.append((question_id, f"{sentence(rng, 6)}?", created_at, count))
+        for _ in range(count):
+            answers.append(
+                (
+                    question_id,
+                    f"user{rng.randrange(USERS)}",
+                    sentence(rng, 12),
+                    created_at + timedelta(seconds=rng.randrange(86_400)),
+                )
+            )
+        # Вопросы пишутся раньше своих ответов: на question_id внешний ключ.
+        if len(questions) >= CHUNK_SIZE or len(answers) >= CHUNK_SIZE:
+            await repo.write_questions(questions)
+            await repo.write_answers(answers)
+            questions.clear()
+            answers.clear()
+    await repo.write_questions(questions)
+    await repo.write_answers(answers)
+    await db.commit()
+    return question_ids
+
+
+async def recreate(engine, spec: DatasetSpec) -> tuple[dict, list[int]]:
+    """Создать схему заново, заполнить ее и вернуть сводку и ID вопросов."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    async with AsyncSession(engine) as db:
+        question_ids = await generate(db, spec)
+    summary = {
+        **asdict(spec),
+        "max_answers_per_question": max(answers_per_question(spec)),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    return summary, question_ids
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Параметры набора данных, общие для всех бенчмарков."""
+    parser.add_argument("--url", default=None, help="URL отдельной базы данных")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    return DatasetSpec.from_scale(args.scale, args.skew, args.seed)
+
+
+async def run(url: str, spec: DatasetSpec) -> dict:
+    engine = create_async_engine(to_async_url(url))
+    try:
+        summary, _ = await recreate(engine, spec)
+        return summary
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{tmp}/bench.db"
+        result = asyncio.run(run(url, spec_from_args(args)))
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Нагрузочные сценарии внутри процесса: приложение без сетевого сервера.
+
+    python -m benchmarks.load --scale small --concurrency 16 --duration 10
+    python -m benchmarks.load --url postgresql://postgres@localhost/qa_bench \\
+        --scale large --scenario list --scenario get --output after.json
+    python -m benchmarks.load --scenario create_answer --concurrency 64 \\
+        --answer-batch-ms 5
+
+Запросы идут в FastAPI-приложение через ASGI-транспорт httpx, поэтому
+замеры не зависят от сети и uvicorn: видна стоимость самого приложения и
+базы. Каждый сценарий нагружает один эндпоинт заданным числом
+конкурентных клиентов. Набор данных создается заново перед замером (см.
+benchmarks.dataset); сценарий delete удаляет вопросы вместе с ответами и
+выполняется последним, пока не кончатся вопросы или время.
+
+Сценарий get_hot читает всеми клиентами один вопрос: так видно, сколько
+экономит объединение одинаковых чтений (см. core/singleflight.py).
+
+--answer-batch-ms включает групповую фиксацию ответов (см.
+services/answer_batcher.py), чтобы сравнить ее с фиксацией каждого ответа.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.questions_answers_api.core.database import (
+    enable_sqlite_foreign_keys,
+    get_db,
+    to_async_url,
+)
+from src.questions_answers_api.core.metrics import instrument_engine
+from src.questions_answers_api.core.pool import pool_options
+from src.questions_answers_api.main import app
+from src.questions_answers_api.services.answer_batcher import (
+    AnswerBatcher,
+    set_answer_batcher,
+)
+
+from .dataset import add_arguments, recreate, spec_from_args
+from .stats import environment, summarize
+
+PAGE_SIZE = 20
+
+
+@dataclass
+class Client:
+    """Состояние одного конкурентного клиента."""
+
+    http: httpx.AsyncClient
+    rng: random.Random
+    question_ids: list[int]
+    # Общая для всех клиентов очередь вопросов на удаление.
+    deletable: list[int]
+    cursor: Optional[str] = None
+    sort: str = "created_at"
+
+
+async def list_questions(client: Client) -> Optional[httpx.Response]:
+    """Листать список вопросов по курсору, с начала после последней страницы."""
+    params = {"limit": PAGE_SIZE, "sort": client.sort}
+    if client.cursor:
+        params["cursor"] = client.cursor
+    response = await client.http.get("/questions/", params=params)
+    if response.status_code == 200:
+        client.cursor = response.json()["next_cursor"]
+    return response
+
+
+async def get_question(client: Client) -> Optional[httpx.Response]:
+    """Получить случайный вопрос со страницей ответов."""
+    question_id = client.rng.choice(client.question_ids)
+    return await client.http.get(f"/questions/{question_id}")
+
+
+async def get_hot_question(client: Client) -> Optional[httpx.Response]:
+    """Получить всеми клиентами один вопрос — с наибольшим числом ответов."""
+    return await client.http.get(f"/questions/{client.question_ids[0]}")
+
+
+async def create_answer(client: Client) -> Optional[httpx.Response]:
+    """Добавить ответ к случайному вопросу."""
+    question_id = client.rng.choice(client.question_ids)
+    return await client.http.post(
+        f"/questions/{question_id}/answers/",
+        json={"user_id": f"user{client.rng.randrange(1000)}", "text": "Ответ"},
+    )
+
+
+async def delete_question(client: Client) -> Optional[httpx.Response]:
+    """Удалить следующий вопрос из очереди вместе с ответами."""
+    if not client.deletable:
+        return None
+    return await client.http.delete(f"/questions/{client.deletable.pop()}")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Нагрузочный сценарий: один запрос клиента и параметры прогона."""
+
+    request: Callable[[Client], Awaitable[Optional[httpx.Response]]]
+    # Прогрев удаления израсходовал бы вопросы, которые нужны замеру.
+    warmup: bool = True
+    # Варианты начального состояния клиента, чередуются между клиентами.
+    variants: tuple[dict, ...] = field(default=({},))
+
+
+SCENARIOS = {
+    "list": Scenario(
+        list_questions, variants=({"sort": "created_at"}, {"sort": "answers_count"})
+    ),
+    "get": Scenario(get_question),
+    "get_hot": Scenario(get_hot_question),
+    "create_answer": Scenario(create_answer),
+    "delete": Scenario(delete_question, warmup=False),
+}
+
+
+async def drive(clients: list[Client], scenario: Scenario, duration: float) -> dict:
+    """Нагружать приложение всеми клиентами до истечения времени."""
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(client: Client) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await scenario.request(client)
+            if response is None:
+                return
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(client) for client in clients))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def bind_app(url: str):
+    """Направить сессии приложения в базу url; вернуть движок и фабрику сессий.
+
+    Движок приложения создается при импорте из DATABASE_URL, поэтому база
+    подменяется переопределением get_db, как в тестах. Пул и метрики — те
+    же, что у приложения.
+    """
+    engine = create_async_engine(to_async_url(url), **pool_options())
+    enable_sqlite_foreign_keys(engine)
+    instrument_engine(engine)
+    sessions = async_sessionmaker(
+        bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+    async def get_benchmark_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_benchmark_db
+    return engine, sessions
+
+
+async def run(args: argparse.Namespace) -> dict:
+    engine, sessions = bind_app(args.url)
+    spec = spec_from_args(args)
+    dataset, question_ids = await recreate(engine, spec)
+    rng = random.Random(spec.seed)
+    deletable = list(question_ids)
+    rng.shuffle(deletable)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    # ASGI-транспорт не выполняет lifespan, поэтому очередь запускается здесь.
+    batcher = None
+    if args.answer_batch_ms > 0:
+        batcher = AnswerBatcher(sessions, max_delay=args.answer_batch_ms / 1000)
+        batcher.start()
+        set_answer_batcher(batcher)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as http:
+            for name in args.scenario or list(SCENARIOS):
+                scenario = SCENARIOS[name]
+                clients = [
+                    Client(
+                        http,
+                        random.Random(spec.seed + index),
+                        question_ids,
+                        deletable,
+                        **scenario.variants[index % len(scenario.variants)],
+                    )
+                    for index in range(args.concurrency)
+                ]
+                if scenario.warmup and args.warmup > 0:
+                    await drive(clients, scenario, args.warmup)
+                results[name] = await drive(clients, scenario, args.duration)
+    finally:
+        if batcher is not None:
+            set_answer_batcher(None)
+            await batcher.stop()
+        await engine.dispose()
+
+    return {
+        "environment": environment(args.url),
+        "dataset": dataset,
+        "concurrency": args.concurrency,
+        "answer_batch_ms": args.answer_batch_ms,
+        "scenarios": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument(
+        "--answer-batch-ms",
+        type=float,
+        default=0.0,
+        help="Групповая фиксация ответов с этой задержкой; 0 — выключена",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=SCENARIOS,
+        help="Сценарий (можно повторять); по умолчанию все по порядку",
+    )
+    parser.add_argument("--output", default=None, help="Файл для JSON-результатов")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url is None:
+            args.url = f"sqlite:///{tmp}/bench.db"
+        result = asyncio.run(run(args))
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Микробенчмарки репозиториев и сервисов.
+
+    python -m benchmarks.micro --scale small --iterations 500
+    python -m benchmarks.micro --url postgresql://postgres@localhost/qa_bench \\
+        --scale large --output micro.json
+
+Каждая операция выполняется последовательно в новой сессии, как в
+обработчике запроса: замер включает выдачу соединения из пула, но не
+HTTP-слой. Кэш отключен, чтобы сервисы каждый раз обращались к базе.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.questions_answers_api.core.cache import create_cache, set_cache
+from src.questions_answers_api.core.database import (
+    enable_sqlite_foreign_keys,
+    to_async_url,
+)
+from src.questions_answers_api.repositories import (
+    AnswerRepository,
+    QuestionRepository,
+)
+from src.questions_answers_api.schemas import AnswerCreate, QuestionSort
+from src.questions_answers_api.services import AnswerService, QuestionService
+
+from .dataset import WORDS, add_arguments, recreate, spec_from_args
+from .stats import environment, summarize
+
+PAGE_SIZE = 20
+
+
+async def repository_page(db: AsyncSession, rng: random.Random, ids: list[int]):
+    return await QuestionRepository(db).get_page(PAGE_SIZE + 1)
+
+
+async def repository_page_by_answers_count(
+    db: AsyncSession, rng: random.Random, ids: list[int]
+):
+    return await QuestionRepository(db).get_page_by_answers_count(PAGE_SIZE + 1)
+
+
+async def repository_with_answers(db: AsyncSession, rng: random.Random, ids: list[int]):
+    return await QuestionRepository(db).get_with_answers(rng.choice(ids), PAGE_SIZE + 1)
+
+
+async def repository_search(db: AsyncSession, rng: random.Random, ids: list[int]):
+    return await QuestionRepository(db).search(rng.choice(WORDS), PAGE_SIZE + 1)
+
+
+async def repository_answers(db: AsyncSession, rng: random.Random, ids: list[int]):
+    return await AnswerRepository(db).get_by_question_id(rng.choice(ids))
+
+
+async def service_page(db: AsyncSession, rng: random.Random, ids: list[int]):
+    return await QuestionService.get_questions_page(db, PAGE_SIZE)
+
+
+async def service_page_by_answers_count(
+    db: AsyncSession, rng: random.Random, ids: list[int]
+):
+    return await QuestionService.get_questions_page(
+        db, PAGE_SIZE, sort=QuestionSort.ANSWERS_COUNT
+    )
+
+
+async def service_question(db: AsyncSession, rng: random.Random, ids: list[int]):
+    return await QuestionService.get_question_by_id(db, rng.choice(ids))
+
+
+async def service_search(db: AsyncSession, rng: random.Random, ids: list[int]):
+    return await QuestionService.search_questions(db, rng.choice(WORDS), PAGE_SIZE)
+
+
+async def service_create_answer(db: AsyncSession, rng: random.Random, ids: list[int]):
+    answer = AnswerCreate(user_id=f"user{rng.randrange(1000)}", text="Ответ")
+    return await AnswerService.create_answer(db, rng.choice(ids), answer)
+
+
+Operation = Callable[[AsyncSession, random.Random, list[int]], Awaitable[object]]
+
+OPERATIONS: dict[str, Operation] = {
+    "QuestionRepository.get_page": repository_page,
+    "QuestionRepository.get_page_by_answers_count": repository_page_by_answers_count,
+    "QuestionRepository.get_with_answers": repository_with_answers,
+    "QuestionRepository.search": repository_search,
+    "AnswerRepository.get_by_question_id": repository_answers,
+    "QuestionService.get_questions_page": service_page,
+    "QuestionService.get_questions_page[answers_count]": (
+        service_page_by_answers_count
+    ),
+    "QuestionService.get_question_by_id": service_question,
+    "QuestionService.search_questions": service_search,
+    "AnswerService.create_answer": service_create_answer,
+}
+
+
+async def measure(
+    engine, operation: Operation, question_ids: list[int], iterations: int, seed: int
+) -> dict:
+    """Выполнить операцию iterations раз и вернуть сводку замеров."""
+    rng = random.Random(seed)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            await operation(db, rng, question_ids)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    set_cache(create_cache("none"))
+    engine = create_async_engine(to_async_url(args.url))
+    enable_sqlite_foreign_keys(engine)
+    try:
+        spec = spec_from_args(args)
+        dataset, question_ids = await recreate(engine, spec)
+        names = args.operation or list(OPERATIONS)
+        for name in names:
+            await measure(engine, OPERATIONS[name], question_ids, args.warmup, 0)
+        results = {
+            name: await measure(
+                engine, OPERATIONS[name], question_ids, args.iterations, spec.seed
+            )
+            for name in names
+        }
+    finally:
+        await engine.dispose()
+
+    return {
+        "environment": environment(args.url),
+        "dataset": dataset,
+        "iterations": args.iterations,
+        "operations": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--operation",
+        action="append",
+        choices=OPERATIONS,
+        help="Операция (можно повторять); по умолчанию все",
+    )
+    parser.add_argument("--output", default=None, help="Файл для JSON-результатов")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url is None:
+            args.url = f"sqlite:///{tmp}/bench.db"
+        result = asyncio.run(run(args))
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
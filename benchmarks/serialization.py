@@ -0,0 +1,165 @@
+"""Бенчмарк сериализации ответов: байт в секунду для 1 тыс. и 100 тыс. строк.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --rows 1000 --rows 100000 --output ser.json
+
+Сравниваются способы закодировать страницу вопросов и вопрос с ответами:
+
+- schema — объекты ORM через схему ответа (from_attributes, валидаторы) и
+  dump_json; так FastAPI кодирует ответ с response_model;
+- stdlib — то же, но через jsonable_encoder и json.dumps (JSONResponse);
+- adapter — словари из репозиториев через TypeAdapter из
+  core/serialization.py, без валидации (путь приложения);
+- orjson — те же словари через orjson, если он установлен (для сравнения).
+
+Замеряется только кодирование: объекты ORM создаются заранее, их загрузку
+из базы измеряет benchmarks.micro.
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import timedelta
+from typing import Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from src.questions_answers_api.core.serialization import (
+    QUESTION_PAGE,
+    QUESTION_WITH_ANSWERS,
+)
+from src.questions_answers_api.models import Answer, Question
+from src.questions_answers_api.schemas import QuestionPage, QuestionWithAnswers
+
+from .dataset import STARTED_AT, sentence
+from .stats import environment, summarize
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Сериализаций на замер: для больших ответов меньше, чтобы прогон был коротким.
+TARGET_ROWS = 200_000
+MIN_REPEAT = 3
+
+
+def question_rows(rng: random.Random, rows: int) -> list[dict]:
+    return [
+        {
+            "id": index + 1,
+            "text": f"{sentence(rng, 6)}?",
+            "created_at": STARTED_AT + timedelta(minutes=index),
+            "answers_count": rng.randrange(20),
+            "version": 1,
+        }
+        for index in range(rows)
+    ]
+
+
+def answer_rows(rng: random.Random, rows: int) -> list[dict]:
+    return [
+        {
+            "id": index + 1,
+            "question_id": 1,
+            "user_id": f"user{rng.randrange(1000)}",
+            "text": sentence(rng, 12),
+            "created_at": STARTED_AT + timedelta(seconds=index),
+        }
+        for index in range(rows)
+    ]
+
+
+def payloads(rows: int, seed: int) -> dict[str, tuple[dict, dict, type, TypeAdapter]]:
+    """Название → (словари, те же данные с объектами ORM, схема, адаптер)."""
+    rng = random.Random(seed)
+    questions = question_rows(rng, rows)
+    page = {"items": questions, "next_cursor": None}
+    orm_page = {"items": [Question(**row) for row in questions], "next_cursor": None}
+
+    question = {**question_rows(rng, 1)[0], "answers_next_cursor": None}
+    answers = answer_rows(rng, rows)
+    detail = {**question, "answers": answers}
+    orm_detail = {**question, "answers": [Answer(**row) for row in answers]}
+    return {
+        f"questions[{rows}]": (page, orm_page, QuestionPage, QUESTION_PAGE),
+        f"answers[{rows}]": (
+            detail,
+            orm_detail,
+            QuestionWithAnswers,
+            QUESTION_WITH_ANSWERS,
+        ),
+    }
+
+
+def encoders(
+    rows: dict, orm: dict, schema: type, adapter: TypeAdapter
+) -> dict[str, Callable[[], bytes]]:
+    model = TypeAdapter(schema)
+    found = {
+        "schema": lambda: model.dump_json(
+            model.validate_python(orm, from_attributes=True)
+        ),
+        "stdlib": lambda: json.dumps(
+            jsonable_encoder(model.validate_python(orm, from_attributes=True)),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode(),
+        "adapter": lambda: adapter.dump_json(rows),
+    }
+    if orjson is not None:
+        found["orjson"] = lambda: orjson.dumps(rows)
+    return found
+
+
+def measure(encode: Callable[[], bytes], repeat: int) -> dict:
+    """Закодировать ответ repeat раз; байт в секунду — по медиане."""
+    latencies = []
+    size = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call_started = time.perf_counter()
+        size = len(encode())
+        latencies.append(time.perf_counter() - call_started)
+    summary = summarize(latencies, time.perf_counter() - started)
+    median = sorted(latencies)[len(latencies) // 2]
+    return {**summary, "bytes": size, "bytes_per_s": round(size / median)}
+
+
+def run(args: argparse.Namespace) -> dict:
+    results = {}
+    for rows in args.rows or [1_000, 100_000]:
+        repeat = max(MIN_REPEAT, TARGET_ROWS // rows)
+        for name, payload in payloads(rows, args.seed).items():
+            for encoder, encode in encoders(*payload).items():
+                encode()
+                results[f"{name} {encoder}"] = measure(encode, repeat)
+    return {
+        "environment": environment("none"),
+        "operations": results,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        action="append",
+        help="Строк в ответе (можно повторять); по умолчанию 1000 и 100000",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Файл для JSON-результатов")
+    args = parser.parse_args(argv)
+
+    output = json.dumps(run(args), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
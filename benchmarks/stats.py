@@ -0,0 +1,49 @@
+"""Сводка замеров и сведения об окружении для JSON-результатов бенчмарков."""
+
+import platform
+import statistics
+import subprocess
+
+import sqlalchemy
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Вернуть перцентиль q (0..100) в миллисекундах."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0] * 1000
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1] * 1000
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int = 0) -> dict:
+    """Сводка серии замеров: количество, пропускная способность, перцентили."""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+def environment(url: str) -> dict:
+    """Сведения, без которых результаты разных запусков нельзя сравнивать."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "database": url.split(":", 1)[0],
+        "machine": platform.machine(),
+    }
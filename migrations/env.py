@@ -8,6 +8,7 @@ from alembic import context
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from src.questions_answers_api.core.database import Base
+from src.questions_answers_api import models  # noqa: F401  регистрирует таблицы в Base
 
 config = context.config
 
@@ -16,6 +17,23 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Не предлагать в autogenerate удаление объектов полнотекстового поиска.
+
+    Их нет в моделях: они создаются миграцией 9e1f4c7a2b35 (см.
+    models/search.py).
+    """
+    if reflected and compare_to is None:
+        if type_ == "column" and name == "search_vector":
+            return False
+        if type_ == "index" and name.endswith("_search_vector"):
+            return False
+        if type_ == "table" and "_fts" in name:
+            return False
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -38,6 +56,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -67,7 +86,11 @@ def run_migrations_online() -> None:
     connectable = create_engine(database_url)
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
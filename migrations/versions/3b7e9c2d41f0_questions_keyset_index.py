@@ -0,0 +1,33 @@
+"""questions keyset index
+
+Revision ID: 3b7e9c2d41f0
+Revises: 82dc508770a1
+Create Date: 2026-10-18 11:20:41.512309
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e9c2d41f0"
+down_revision: Union[str, Sequence[str], None] = "82dc508770a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_questions_created_at_id",
+        "questions",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_questions_created_at_id", table_name="questions")
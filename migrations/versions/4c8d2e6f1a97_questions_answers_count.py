@@ -0,0 +1,45 @@
+"""questions answers count
+
+Revision ID: 4c8d2e6f1a97
+Revises: 9e1f4c7a2b35
+Create Date: 2026-10-18 23:05:41.527830
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c8d2e6f1a97"
+down_revision: Union[str, Sequence[str], None] = "9e1f4c7a2b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "questions",
+        sa.Column("answers_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        "UPDATE questions SET answers_count = "
+        "(SELECT count(*) FROM answers WHERE answers.question_id = questions.id)"
+    )
+    op.create_index(
+        "ix_questions_answers_count_id",
+        "questions",
+        ["answers_count", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_questions_answers_count_id", table_name="questions")
+    # Без batch_alter_table: пересоздание таблицы в SQLite удалило бы
+    # триггеры полнотекстового поиска; DROP COLUMN есть в SQLite с 3.35.
+    op.drop_column("questions", "answers_count")
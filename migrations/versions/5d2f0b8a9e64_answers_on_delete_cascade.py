@@ -0,0 +1,44 @@
+"""answers question_id on delete cascade
+
+Revision ID: 5d2f0b8a9e64
+Revises: c41a8e5f7d23
+Create Date: 2026-10-18 16:42:03.218774
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2f0b8a9e64"
+down_revision: Union[str, Sequence[str], None] = "c41a8e5f7d23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Внешний ключ в начальной миграции создан без имени. Соглашение совпадает
+# с именем по умолчанию в PostgreSQL и позволяет найти ключ в SQLite,
+# где batch-режим пересоздает таблицу.
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+FK_NAME = "answers_question_id_fkey"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table(
+        "answers", naming_convention=NAMING_CONVENTION
+    ) as batch_op:
+        batch_op.drop_constraint(FK_NAME, type_="foreignkey")
+        batch_op.create_foreign_key(
+            FK_NAME, "questions", ["question_id"], ["id"], ondelete="CASCADE"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table(
+        "answers", naming_convention=NAMING_CONVENTION
+    ) as batch_op:
+        batch_op.drop_constraint(FK_NAME, type_="foreignkey")
+        batch_op.create_foreign_key(FK_NAME, "questions", ["question_id"], ["id"])
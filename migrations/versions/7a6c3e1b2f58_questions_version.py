@@ -0,0 +1,33 @@
+"""questions version
+
+Revision ID: 7a6c3e1b2f58
+Revises: 5d2f0b8a9e64
+Create Date: 2026-10-18 19:10:27.640385
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a6c3e1b2f58"
+down_revision: Union[str, Sequence[str], None] = "5d2f0b8a9e64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "questions",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("questions") as batch_op:
+        batch_op.drop_column("version")
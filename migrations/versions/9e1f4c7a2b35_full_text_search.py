@@ -0,0 +1,74 @@
+"""full text search
+
+Revision ID: 9e1f4c7a2b35
+Revises: 7a6c3e1b2f58
+Create Date: 2026-10-18 21:42:05.118406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e1f4c7a2b35"
+down_revision: Union[str, Sequence[str], None] = "7a6c3e1b2f58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("questions", "answers")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        for table in TABLES:
+            op.execute(
+                f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+                f"GENERATED ALWAYS AS (to_tsvector('russian', text)) STORED"
+            )
+            op.execute(
+                f"CREATE INDEX ix_{table}_search_vector ON {table} "
+                "USING gin (search_vector)"
+            )
+        return
+
+    for table in TABLES:
+        fts = f"{table}_fts"
+        delete_old = (
+            f"INSERT INTO {fts}({fts}, rowid, text) "
+            "VALUES ('delete', old.id, old.text);"
+        )
+        insert_new = f"INSERT INTO {fts}(rowid, text) VALUES (new.id, new.text);"
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5(text, content='{table}', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} "
+            f"BEGIN {insert_new} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} "
+            f"BEGIN {delete_old} END"
+        )
+        op.execute(
+            f"CREATE TRIGGER {fts}_update AFTER UPDATE OF text ON {table} "
+            f"BEGIN {delete_old} {insert_new} END"
+        )
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        for table in TABLES:
+            op.execute(f"DROP INDEX ix_{table}_search_vector")
+            op.execute(f"ALTER TABLE {table} DROP COLUMN search_vector")
+        return
+
+    for table in TABLES:
+        for trigger in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER {table}_fts_{trigger}")
+        op.execute(f"DROP TABLE {table}_fts")
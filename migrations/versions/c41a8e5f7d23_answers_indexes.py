@@ -0,0 +1,44 @@
+"""answers foreign key and time indexes
+
+Revision ID: c41a8e5f7d23
+Revises: 3b7e9c2d41f0
+Create Date: 2026-10-18 14:05:12.904117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41a8e5f7d23"
+down_revision: Union[str, Sequence[str], None] = "3b7e9c2d41f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_answers_question_id_created_at",
+        "answers",
+        ["question_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_answers_user_id_created_at",
+        "answers",
+        ["user_id", "created_at"],
+        unique=False,
+    )
+    op.drop_index("ix_answers_id", table_name="answers")
+    op.drop_index("ix_questions_id", table_name="questions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_questions_id", "questions", ["id"], unique=False)
+    op.create_index("ix_answers_id", "answers", ["id"], unique=False)
+    op.drop_index("ix_answers_user_id_created_at", table_name="answers")
+    op.drop_index("ix_answers_question_id_created_at", table_name="answers")
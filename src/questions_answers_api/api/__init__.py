@@ -1,4 +1,6 @@
 from .questions import router as questions_router
 from .answers import router as answers_router
+from .admin import router as admin_router
+from .export import router as export_router
 
-__all__ = ["questions_router", "answers_router"]
+__all__ = ["questions_router", "answers_router", "admin_router", "export_router"]
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.cache import get_cache
+from ..core.database import engine, get_db
+from ..core.pool import pool_status
+from ..services import QuestionService
+from ..schemas import (
+    AnswersCountReconcile,
+    AnswersCountReconcileResult,
+    CacheStatsResponse,
+    PoolStatsResponse,
+    QuestionPurge,
+    QuestionPurgeResult,
+)
+
+router = APIRouter(prefix="/admin", tags=["Администрирование"])
+
+
+@router.post(
+    "/questions/purge",
+    response_model=QuestionPurgeResult,
+    summary="Массово удалить вопросы",
+    description="Удаляет вопросы по списку ID или все вопросы старше `older_than` вместе с ответами. Удаление выполняется пачками по `batch_size` вопросов, каждая пачка — один DELETE в отдельной транзакции, поэтому запрос не держит длинных блокировок. Служебный эндпоинт: доступ к нему должен быть закрыт на уровне инфраструктуры.",
+)
+async def purge_questions(
+    purge_data: QuestionPurge, db: AsyncSession = Depends(get_db)
+):
+    """Массово удалить вопросы."""
+    result = await QuestionService.purge_questions(db, purge_data)
+    return result
+
+
+@router.post(
+    "/questions/answers-count/reconcile",
+    response_model=AnswersCountReconcileResult,
+    summary="Пересчитать счетчики ответов",
+    description="Сверяет `answers_count` каждого вопроса с фактическим количеством ответов и исправляет расхождения. Вопросы проверяются пачками по `batch_size` в порядке ID, каждая пачка — один UPDATE в отдельной транзакции. Счетчики поддерживаются при записи ответов, пересчет нужен после изменений в обход API. Служебный эндпоинт: доступ к нему должен быть закрыт на уровне инфраструктуры.",
+)
+async def reconcile_answers_counts(
+    reconcile_data: AnswersCountReconcile, db: AsyncSession = Depends(get_db)
+):
+    """Пересчитать счетчики ответов."""
+    result = await QuestionService.reconcile_answers_counts(
+        db, reconcile_data.batch_size
+    )
+    return result
+
+
+@router.get(
+    "/cache",
+    response_model=CacheStatsResponse,
+    summary="Статистика кэша",
+    description="Возвращает счетчики попаданий, промахов, вытеснений и инвалидаций кэша чтения вопросов и ответов с момента запуска процесса.",
+)
+async def get_cache_stats():
+    """Получить статистику кэша."""
+    cache = get_cache()
+    return {"backend": cache.name, **cache.stats.as_dict()}
+
+
+@router.get(
+    "/pool",
+    response_model=PoolStatsResponse,
+    summary="Статистика пула соединений",
+    description="Возвращает текущее состояние пула соединений с базой данных (выданные и свободные соединения, overflow) и накопленную с момента запуска статистику ожидания: количество выдач, суммарное и максимальное время ожидания, гистограмму и число таймаутов. Настройки пула задаются переменными `DB_POOL_*`.",
+)
+async def get_pool_stats():
+    """Получить статистику пула соединений."""
+    return pool_status(engine.pool)
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.database import get_db
+from ..core.replicas import get_read_db
+from ..core.etag import etag_matches, make_etag
+from ..core.serialization import FastJSONResponse
 from ..services import AnswerService
-from ..schemas import AnswerCreate, AnswerResponse
+from ..schemas import AnswerBulkCreate, AnswerBulkResult, AnswerCreate, AnswerResponse
 
 router = APIRouter(tags=["Ответы"])
 
@@ -12,26 +16,57 @@ router = APIRouter(tags=["Ответы"])
     response_model=AnswerResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Добавить ответ к вопросу",
-    description="Создает новый ответ для указанного вопроса. Нельзя создать ответ к несуществующему вопросу. Один пользователь может оставлять несколько ответов на один вопрос.",
+    description="Создает новый ответ для указанного вопроса. Нельзя создать ответ к несуществующему вопросу. Один пользователь может оставлять несколько ответов на один вопрос. При лимите частоты на пользователя (`ANSWER_RATE_LIMIT_PER_SECOND`) ответы сверх него получают 429 с Retry-After.",
 )
 async def create_answer(
-    question_id: int, answer_data: AnswerCreate, db: Session = Depends(get_db)
+    question_id: int, answer_data: AnswerCreate, db: AsyncSession = Depends(get_db)
 ):
     """Добавить ответ к вопросу."""
-    answer = AnswerService.create_answer(db, question_id, answer_data)
+    answer = await AnswerService.create_answer(db, question_id, answer_data)
     return answer
 
 
+@router.post(
+    "/questions/{question_id}/answers/bulk",
+    response_model=AnswerBulkResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Добавить несколько ответов к вопросу",
+    description="Создает до 1000 ответов к указанному вопросу одним запросом в одной транзакции. В режиме `atomic` при ошибке валидации любого элемента ничего не создается и возвращается ошибка 422. В режиме `partial` создаются валидные элементы, а ошибки остальных возвращаются в поле `errors`. Если вопрос не найден, возвращает ошибку 404.",
+)
+async def create_answers_bulk(
+    question_id: int, bulk_data: AnswerBulkCreate, db: AsyncSession = Depends(get_db)
+):
+    """Добавить несколько ответов к вопросу."""
+    result = await AnswerService.create_answers_bulk(db, question_id, bulk_data)
+    return result
+
+
 @router.get(
     "/answers/{answer_id}",
     response_model=AnswerResponse,
     summary="Получить ответ по ID",
-    description="Возвращает конкретный ответ по его идентификатору. Если ответ не найден, возвращает ошибку 404.",
+    description="Возвращает конкретный ответ по его идентификатору. Поддерживает условные запросы по `ETag`/`If-None-Match`. Если ответ не найден, возвращает ошибку 404.",
 )
-async def get_answer(answer_id: int, db: Session = Depends(get_db)):
+async def get_answer(
+    answer_id: int,
+    if_none_match: Optional[str] = Header(None, include_in_schema=False),
+    db: AsyncSession = Depends(get_read_db),
+):
     """Получить конкретный ответ."""
-    answer = AnswerService.get_answer_by_id(db, answer_id)
-    return answer
+    # Ответы не изменяются после создания, поэтому ETag зависит только от
+    # ID и метки строки: ID удаленного ответа может достаться новому.
+    if if_none_match:
+        stamp = await AnswerService.get_answer_stamp(db, answer_id)
+        etag = make_etag("answer", answer_id, stamp)
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+    stamp, body = await AnswerService.get_answer_by_id(db, answer_id)
+    return FastJSONResponse(
+        body, headers={"ETag": make_etag("answer", answer_id, stamp)}
+    )
 
 
 @router.delete(
@@ -40,7 +75,7 @@ async def get_answer(answer_id: int, db: Session = Depends(get_db)):
     summary="Удалить ответ",
     description="Удаляет конкретный ответ по его идентификатору. Если ответ не найден, возвращает ошибку 404.",
 )
-async def delete_answer(answer_id: int, db: Session = Depends(get_db)):
+async def delete_answer(answer_id: int, db: AsyncSession = Depends(get_db)):
     """Удалить ответ."""
-    AnswerService.delete_answer(db, answer_id)
+    await AnswerService.delete_answer(db, answer_id)
     return None
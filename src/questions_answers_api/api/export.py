@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.replicas import get_read_db
+from ..services import QuestionService
+from ..services.question_service import (
+    DEFAULT_EXPORT_BATCH_SIZE,
+    MAX_EXPORT_BATCH_SIZE,
+)
+
+router = APIRouter(prefix="/export", tags=["Экспорт"])
+
+
+@router.get(
+    "",
+    response_class=StreamingResponse,
+    summary="Экспортировать все вопросы с ответами",
+    description="Потоково отдает все вопросы вместе с ответами в формате NDJSON: одна строка — один вопрос в формате `QuestionResponse` с полем `answers`. Вопросы упорядочены по ID, ответы — по времени создания. Данные читаются из базы серверным курсором пачками по `batch_size` строк, поэтому потребление памяти не зависит от размера выгрузки.",
+)
+async def export_questions(
+    batch_size: int = Query(
+        DEFAULT_EXPORT_BATCH_SIZE,
+        ge=1,
+        le=MAX_EXPORT_BATCH_SIZE,
+        description="Количество строк, читаемых из базы за один раз",
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Экспортировать вопросы и ответы в формате NDJSON."""
+    return StreamingResponse(
+        QuestionService.export_questions(db, batch_size),
+        media_type="application/x-ndjson",
+    )
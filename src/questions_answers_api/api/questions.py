@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.database import get_db
+from ..core.etag import etag_matches, make_digest_etag, make_etag
+from ..core.replicas import get_read_db
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..core.serialization import QUESTION_PAGE, QUESTION_SEARCH_PAGE, FastJSONResponse
 from ..services import QuestionService
 from ..schemas import (
+    QuestionBulkCreate,
+    QuestionBulkResult,
     QuestionCreate,
+    QuestionPage,
     QuestionResponse,
+    QuestionSearchPage,
+    QuestionSort,
     QuestionWithAnswers,
 )
 
@@ -13,14 +23,29 @@ router = APIRouter(prefix="/questions", tags=["Вопросы"])
 
 @router.get(
     "/",
-    response_model=list[QuestionResponse],
-    summary="Получить все вопросы",
-    description="Возвращает список всех вопросов в системе. Если вопросов нет, возвращает пустой список.",
+    response_model=QuestionPage,
+    summary="Получить список вопросов",
+    description="Возвращает страницу вопросов в порядке создания или, с `sort=answers_count`, по убыванию количества ответов (`answers_count`). Для получения следующей страницы передайте значение `next_cursor` в параметре `cursor` с тем же `sort`. Размер страницы не превышает 100 вопросов. Поддерживает условные запросы: при совпадении `If-None-Match` с текущим `ETag` возвращает 304.",
 )
-async def get_all_questions(db: Session = Depends(get_db)):
-    """Получить список всех вопросов."""
-    questions = QuestionService.get_all_questions(db)
-    return questions
+async def get_all_questions(
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"
+    ),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    sort: QuestionSort = Query(QuestionSort.CREATED_AT, description="Порядок"),
+    if_none_match: Optional[str] = Header(None, include_in_schema=False),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Получить страницу списка вопросов."""
+    page = await QuestionService.get_questions_page(db, limit, cursor, sort)
+    etag = make_digest_etag(
+        page["next_cursor"], *(f"{q['id']}.{q['version']}" for q in page["items"])
+    )
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return FastJSONResponse(QUESTION_PAGE.dump_json(page), headers={"ETag": etag})
 
 
 @router.post(
@@ -30,22 +55,81 @@ async def get_all_questions(db: Session = Depends(get_db)):
     summary="Создать новый вопрос",
     description="Создает новый вопрос в системе. Текст вопроса не может быть пустым или состоять только из пробелов.",
 )
-async def create_question(question_data: QuestionCreate, db: Session = Depends(get_db)):
+async def create_question(
+    question_data: QuestionCreate, db: AsyncSession = Depends(get_db)
+):
     """Создать новый вопрос."""
-    question = QuestionService.create_question(db, question_data)
+    question = await QuestionService.create_question(db, question_data)
     return question
 
 
+@router.post(
+    "/bulk",
+    response_model=QuestionBulkResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Создать несколько вопросов",
+    description="Создает до 1000 вопросов одним запросом в одной транзакции. В режиме `atomic` при ошибке валидации любого элемента ничего не создается и возвращается ошибка 422. В режиме `partial` создаются валидные элементы, а ошибки остальных возвращаются в поле `errors` с их позицией в списке.",
+)
+async def create_questions_bulk(
+    bulk_data: QuestionBulkCreate, db: AsyncSession = Depends(get_db)
+):
+    """Создать несколько вопросов."""
+    result = await QuestionService.create_questions_bulk(db, bulk_data)
+    return result
+
+
+@router.get(
+    "/search",
+    response_model=QuestionSearchPage,
+    summary="Найти вопросы",
+    description="Полнотекстовый поиск по тексту вопросов и ответов. Возвращает вопросы в порядке убывания релевантности (`rank`); совпадение в тексте вопроса весит больше, чем в ответе. В PostgreSQL запрос разбирается как `websearch_to_tsquery` (поддерживаются кавычки, `or` и `-`) с русской морфологией, в SQLite ищутся вопросы, содержащие все слова запроса. Для следующей страницы передайте `next_cursor` в параметре `cursor`.",
+)
+async def search_questions(
+    q: str = Query(..., min_length=1, max_length=200, description="Поисковый запрос"),
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Размер страницы"
+    ),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Найти вопросы по тексту."""
+    page = await QuestionService.search_questions(db, q, limit, cursor)
+    return FastJSONResponse(QUESTION_SEARCH_PAGE.dump_json(page))
+
+
 @router.get(
     "/{question_id}",
     response_model=QuestionWithAnswers,
     summary="Получить вопрос с ответами",
-    description="Возвращает конкретный вопрос со всеми ответами на него. Если вопрос не найден, возвращает ошибку 404.",
+    description="Возвращает конкретный вопрос и первую страницу ответов на него в порядке создания. Для следующей страницы ответов передайте значение `answers_next_cursor` в параметре `answers_cursor`. Поддерживает условные запросы: `ETag` меняется при добавлении и удалении ответов, при совпадении `If-None-Match` возвращает 304 без загрузки ответов. Если вопрос не найден, возвращает ошибку 404.",
 )
-async def get_question_with_answers(question_id: int, db: Session = Depends(get_db)):
-    """Получить вопрос и все ответы на него."""
-    question = QuestionService.get_question_by_id(db, question_id)
-    return question
+async def get_question_with_answers(
+    question_id: int,
+    answers_limit: int = Query(
+        DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Размер страницы ответов",
+    ),
+    answers_cursor: Optional[str] = Query(
+        None, description="Курсор следующей страницы ответов"
+    ),
+    if_none_match: Optional[str] = Header(None, include_in_schema=False),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Получить вопрос и страницу ответов на него."""
+    if if_none_match:
+        version = await QuestionService.get_question_version(db, question_id)
+        etag = make_etag(question_id, version)
+        if etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+    version, body = await QuestionService.get_question_by_id(
+        db, question_id, answers_limit, answers_cursor
+    )
+    return FastJSONResponse(body, headers={"ETag": make_etag(question_id, version)})
 
 
 @router.delete(
@@ -54,7 +138,7 @@ async def get_question_with_answers(question_id: int, db: Session = Depends(get_
     summary="Удалить вопрос",
     description="Удаляет вопрос и все связанные с ним ответы (каскадное удаление). Если вопрос не найден, возвращает ошибку 404.",
 )
-async def delete_question(question_id: int, db: Session = Depends(get_db)):
+async def delete_question(question_id: int, db: AsyncSession = Depends(get_db)):
     """Удалить вопрос (вместе с ответами)."""
-    QuestionService.delete_question(db, question_id)
+    await QuestionService.delete_question(db, question_id)
     return None
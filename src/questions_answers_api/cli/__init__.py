@@ -0,0 +1 @@
+"""Консольные команды сервиса."""
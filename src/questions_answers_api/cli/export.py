@@ -0,0 +1,49 @@
+"""Экспорт всех вопросов с ответами в NDJSON.
+
+    python -m src.questions_answers_api.cli.export > dump.ndjson
+    python -m src.questions_answers_api.cli.export --output dump.ndjson --url postgresql://...
+
+По умолчанию используется база из DATABASE_URL.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import BinaryIO, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from ..core.database import DATABASE_URL, to_async_url
+from ..services import QuestionService
+from ..services.question_service import DEFAULT_EXPORT_BATCH_SIZE
+
+
+async def export(url: str, output: BinaryIO, batch_size: int) -> None:
+    """Записать выгрузку базы url в поток output."""
+    engine = create_async_engine(to_async_url(url))
+    try:
+        async with AsyncSession(engine) as db:
+            async for chunk in QuestionService.export_questions(db, batch_size):
+                output.write(chunk)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=DATABASE_URL, help="URL базы данных")
+    parser.add_argument(
+        "--output", default="-", help="Файл выгрузки, '-' — стандартный вывод"
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_EXPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.output == "-":
+        asyncio.run(export(args.url, sys.stdout.buffer, args.batch_size))
+    else:
+        with open(args.output, "wb") as output:
+            asyncio.run(export(args.url, output, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
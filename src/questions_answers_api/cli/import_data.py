@@ -0,0 +1,110 @@
+"""Массовый импорт вопросов и ответов из NDJSON или CSV.
+
+    python -m src.questions_answers_api.cli.import_data ndjson dump.ndjson
+    python -m src.questions_answers_api.cli.import_data csv questions.csv --answers answers.csv
+
+NDJSON — формат выгрузки GET /export: строка на вопрос с вложенными ответами.
+CSV вопросов: id, text, created_at; CSV ответов: question_id, user_id, text,
+created_at (question_id — id вопроса из файла вопросов). ID из файлов
+заменяются новыми. По умолчанию используется база из DATABASE_URL.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import sys
+from contextlib import ExitStack
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from ..core.database import DATABASE_URL, enable_sqlite_foreign_keys, to_async_url
+from ..services import ImportService
+from ..services.import_service import DEFAULT_IMPORT_CHUNK_SIZE, ImportStats
+
+
+def report_progress(stats: ImportStats) -> None:
+    """Вывести прогресс импорта в stderr."""
+    progress = stats.as_dict()
+    print(
+        "вопросов: {questions}, ответов: {answers}, пропущено: {rejected}, "
+        "{rows_per_s} строк/с".format(**progress),
+        file=sys.stderr,
+    )
+
+
+def open_sources(args: argparse.Namespace, files: ExitStack) -> dict:
+    """Открыть входные файлы до запуска цикла событий.
+
+    Чтение строк остается блокирующим, но файлы открываются здесь, а не в
+    корутине.
+    """
+    if args.format == "ndjson":
+        lines = (
+            sys.stdin
+            if args.path == "-"
+            else files.enter_context(open(args.path, encoding="utf-8"))
+        )
+        return {"lines": lines}
+    questions = csv.DictReader(
+        files.enter_context(open(args.path, newline="", encoding="utf-8"))
+    )
+    answers = (
+        csv.DictReader(
+            files.enter_context(open(args.answers, newline="", encoding="utf-8"))
+        )
+        if args.answers
+        else ()
+    )
+    return {"questions": questions, "answers": answers}
+
+
+async def run(args: argparse.Namespace, sources: dict) -> ImportStats:
+    engine = create_async_engine(to_async_url(args.url))
+    enable_sqlite_foreign_keys(engine)
+    try:
+        # Одно соединение на весь импорт: в нем живет временная таблица ID.
+        async with engine.connect() as connection:
+            async with AsyncSession(bind=connection, expire_on_commit=False) as db:
+                if args.format == "ndjson":
+                    return await ImportService.import_ndjson(
+                        db, sources["lines"], args.chunk_size, report_progress
+                    )
+                return await ImportService.import_csv(
+                    db,
+                    sources["questions"],
+                    sources["answers"],
+                    args.chunk_size,
+                    report_progress,
+                )
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=DATABASE_URL, help="URL базы данных")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_IMPORT_CHUNK_SIZE,
+        help="Количество строк в одной транзакции",
+    )
+    formats = parser.add_subparsers(dest="format", required=True)
+    ndjson = formats.add_parser("ndjson", help="Вопросы с вложенными ответами")
+    ndjson.add_argument("path", help="Файл NDJSON, '-' — стандартный ввод")
+    csv_parser = formats.add_parser("csv", help="Вопросы и ответы в CSV")
+    csv_parser.add_argument("path", help="CSV вопросов")
+    csv_parser.add_argument("--answers", help="CSV ответов")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    with ExitStack() as files:
+        stats = asyncio.run(run(args, open_sources(args, files)))
+    print(json.dumps(stats.as_dict(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
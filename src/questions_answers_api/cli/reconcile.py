@@ -0,0 +1,48 @@
+"""Пересчет счетчиков ответов answers_count у всех вопросов.
+
+    python -m src.questions_answers_api.cli.reconcile
+    python -m src.questions_answers_api.cli.reconcile --batch-size 5000 --url postgresql://...
+
+Исправляет расхождения после изменений ответов в обход API; подходит для
+запуска по расписанию. По умолчанию используется база из DATABASE_URL,
+исправленные вопросы удаляются из кэша, заданного CACHE_BACKEND.
+"""
+
+import argparse
+import asyncio
+import json
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from ..core.database import DATABASE_URL, to_async_url
+from ..services import QuestionService
+
+
+async def reconcile(url: str, batch_size: int) -> dict:
+    """Пересчитать счетчики в базе url."""
+    engine = create_async_engine(to_async_url(url))
+    try:
+        async with AsyncSession(engine) as db:
+            return await QuestionService.reconcile_answers_counts(db, batch_size)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=DATABASE_URL, help="URL базы данных")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Количество вопросов в одной транзакции",
+    )
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(reconcile(args.url, args.batch_size))
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
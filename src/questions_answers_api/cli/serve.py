@@ -0,0 +1,235 @@
+"""Запуск сервиса в production: воркеры uvicorn, прогрев и пулы соединений.
+
+    python -m src.questions_answers_api.cli.serve
+    python -m src.questions_answers_api.cli.serve --workers 8 --db-max-connections 90
+
+Число воркеров по умолчанию — число доступных процессу CPU с учетом
+ограничения cgroup (квоты контейнера); его переопределяют --workers или
+WEB_CONCURRENCY. При --db-max-connections (DB_MAX_CONNECTIONS) размер пула
+каждого воркера уменьшается так, чтобы все воркеры вместе не открыли
+больше соединений с базой (с каждой репликой — так же); соединение фоновой
+проверки готовности каждого воркера входит в этот предел.
+
+Приложение импортируется в родительском процессе до запуска воркеров:
+ошибка импорта останавливает запуск сразу. Каждый воркер перед приемом
+запросов строит схему OpenAPI и открывает постоянные соединения пула
+(APP_WARMUP). Время от запуска до первого успешного запроса к /health
+пишется в лог.
+
+SIGHUP родительскому процессу перезапускает воркеры по одному: новый
+воркер принимает запросы раньше, чем завершается старый. SIGTERM
+завершает воркеры, давая текущим запросам --graceful-timeout секунд.
+"""
+
+import argparse
+import logging
+import logging.config
+import math
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from copy import deepcopy
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+from uvicorn.config import LOGGING_CONFIG
+
+# Модули приложения (и prometheus_client через них) импортируются только
+# после prepare_metrics_dir: метрики сразу открывают файлы в
+# PROMETHEUS_MULTIPROC_DIR.
+
+APP = "src.questions_answers_api.main:app"
+PACKAGE_LOGGER = "src.questions_answers_api"
+# При запуске через -m __name__ — "__main__", а логи должны идти от пакета.
+logger = logging.getLogger(f"{PACKAGE_LOGGER}.cli.serve")
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+# Сколько ждать первого ответа /health, прежде чем перестать измерять.
+FIRST_REQUEST_TIMEOUT = 120.0
+
+
+def available_cpus(cpu_max: Path = CGROUP_CPU_MAX) -> int:
+    """Число CPU, доступных процессу: маска affinity и квота cgroup v2."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = cpu_max.read_text().split()
+    except (OSError, ValueError):
+        return cpus
+    if quota == "max":
+        return cpus
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
+def worker_count(requested: Optional[int] = None) -> int:
+    """Число воркеров: --workers, WEB_CONCURRENCY или число CPU."""
+    if requested:
+        return requested
+    configured = os.getenv("WEB_CONCURRENCY")
+    if configured:
+        return int(configured)
+    return available_cpus()
+
+
+def prepare_metrics_dir() -> None:
+    """Создать пустой PROMETHEUS_MULTIPROC_DIR, если он задан.
+
+    Вызывается до импорта приложения: prometheus_client пишет в каталог с
+    создания первой метрики и падает, если каталога нет.
+    """
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        # Значения метрик прошлого запуска не должны попасть в сумму воркеров.
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir)
+
+
+def configure_environment(args: argparse.Namespace, workers: int) -> None:
+    """Передать воркерам настройки через окружение (они наследуют его)."""
+    from ..core.health import HEALTH_CHECK_INTERVAL
+    from ..core.pool import split_connections
+
+    if args.db_max_connections:
+        # Фоновая проверка готовности держит свое соединение вне пула.
+        pool_size, max_overflow = split_connections(
+            args.db_max_connections,
+            workers,
+            reserved=1 if HEALTH_CHECK_INTERVAL > 0 else 0,
+        )
+        os.environ["DB_POOL_SIZE"] = str(pool_size)
+        os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+        logger.info(
+            "Пул воркера: pool_size=%d, max_overflow=%d "
+            "(до %d соединений на %d воркеров)",
+            pool_size,
+            max_overflow,
+            args.db_max_connections,
+            workers,
+        )
+    os.environ["APP_WARMUP"] = "true" if args.warmup else "false"
+
+    if workers > 1:
+        if os.getenv("CACHE_BACKEND") == "memory":
+            logger.warning(
+                "CACHE_BACKEND=memory у каждого воркера свой: инвалидация "
+                "не доходит до других воркеров, используйте redis"
+            )
+        if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            logger.warning(
+                "PROMETHEUS_MULTIPROC_DIR не задан: /metrics покажет метрики "
+                "только одного воркера"
+            )
+
+
+def log_config() -> dict:
+    """Конфигурация логов uvicorn плюс INFO-логи приложения."""
+    config = deepcopy(LOGGING_CONFIG)
+    config["loggers"][PACKAGE_LOGGER] = {
+        "handlers": ["default"],
+        "level": "INFO",
+        "propagate": False,
+    }
+    # SQLAlchemy пишет в лог класса пула каждое закрытие пула при остановке.
+    config["loggers"][f"{PACKAGE_LOGGER}.core.pool.ObservedQueuePool"] = {
+        "level": "WARNING"
+    }
+    return config
+
+
+def preload_app() -> None:
+    """Импортировать приложение в родительском процессе.
+
+    Ошибка импорта должна остановить запуск до старта воркеров. При импорте
+    создается движок, и пул записывает свои gauge (db_pool_max_connections)
+    от имени родителя; родитель запросов не обслуживает, поэтому его
+    значения убираются из суммы воркеров в /metrics.
+    """
+    __import__(APP.partition(":")[0], fromlist=["app"])
+    from ..core.metrics import mark_process_dead
+
+    mark_process_dead()
+
+
+def report_first_request(url: str, started: float) -> None:
+    """Дождаться первого успешного ответа url и записать время в лог."""
+    deadline = started + FIRST_REQUEST_TIMEOUT
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    logger.info(
+                        "Первый запрос обслужен через %.3f с после запуска",
+                        time.perf_counter() - started,
+                    )
+                    return
+        except OSError:
+            pass
+        time.sleep(0.05)
+    logger.warning(
+        "Сервис не ответил на %s за %.0f с после запуска", url, FIRST_REQUEST_TIMEOUT
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    started = time.perf_counter()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Число воркеров; по умолчанию — CPU"
+    )
+    parser.add_argument(
+        "--db-max-connections",
+        type=int,
+        default=int(os.getenv("DB_MAX_CONNECTIONS", "0")) or None,
+        help="Предел соединений с базой на все воркеры",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=30.0,
+        help="Сколько секунд воркер дорабатывает текущие запросы при остановке",
+    )
+    parser.add_argument(
+        "--no-warmup",
+        dest="warmup",
+        action="store_false",
+        help="Не прогревать воркеры перед приемом запросов",
+    )
+    args = parser.parse_args(argv)
+
+    logging.config.dictConfig(log_config())
+    prepare_metrics_dir()
+    workers = worker_count(args.workers)
+    configure_environment(args, workers)
+
+    import_started = time.perf_counter()
+    preload_app()
+    logger.info(
+        "Приложение импортировано за %.3f с, запускаем %d воркеров",
+        time.perf_counter() - import_started,
+        workers,
+    )
+
+    host = "127.0.0.1" if args.host in ("0.0.0.0", "::") else args.host
+    threading.Thread(
+        target=report_first_request,
+        args=(f"http://{host}:{args.port}/health", started),
+        daemon=True,
+    ).start()
+    uvicorn.run(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        log_config=log_config(),
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Контроль допуска: сброс нагрузки, когда база не успевает.
+
+Когда база замедляется, запросы копятся в очереди пула соединений, и
+задержка растет у всех без ограничения. AdmissionMiddleware пропускает к
+эндпоинтам /questions и /answers не больше ADMISSION_READ_CONCURRENCY
+чтений и ADMISSION_WRITE_CONCURRENCY изменений одновременно. Остальные
+ждут в очереди до ADMISSION_MAX_QUEUE запросов своего класса. Запрос сразу
+получает 503 с Retry-After, если очередь заполнена или ожидаемое время
+ожидания (длина очереди × среднее время запроса / предел) больше
+ADMISSION_MAX_WAIT_MS, и тоже 503 — если не дождался за это время.
+Отказ стоит микросекунды и не занимает соединение с базой.
+
+Служебные эндпоинты (/health, /metrics, /admin, документация) и потоковая
+выгрузка /export не ограничиваются: проверки и диагностика должны работать
+именно при перегрузке.
+
+TokenBucketLimiter ограничивает частоту POST /questions/{id}/answers/ для
+одного user_id (ANSWER_RATE_LIMIT_PER_SECOND, запас ANSWER_RATE_LIMIT_BURST),
+чтобы один клиент не занял весь путь записи: сверх лимита — 429.
+
+Пределы, очереди и корзины свои у каждого воркера.
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+from prometheus_client import Counter, Histogram
+
+from .serialization import FastJSONResponse
+
+ADMISSION_READ_CONCURRENCY = int(os.getenv("ADMISSION_READ_CONCURRENCY", "0"))
+ADMISSION_WRITE_CONCURRENCY = int(os.getenv("ADMISSION_WRITE_CONCURRENCY", "0"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "100"))
+ADMISSION_MAX_WAIT_MS = float(os.getenv("ADMISSION_MAX_WAIT_MS", "1000"))
+ANSWER_RATE_LIMIT_PER_SECOND = float(os.getenv("ANSWER_RATE_LIMIT_PER_SECOND", "0"))
+ANSWER_RATE_LIMIT_BURST = int(os.getenv("ANSWER_RATE_LIMIT_BURST", "10"))
+ANSWER_RATE_LIMIT_MAX_USERS = int(os.getenv("ANSWER_RATE_LIMIT_MAX_USERS", "100000"))
+
+LIMITED_PREFIXES = ("/questions", "/answers")
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Вес нового замера в скользящем среднем времени запроса.
+SERVICE_TIME_WEIGHT = 0.1
+
+ADMISSION_REJECTED = Counter(
+    "admission_rejected",
+    "Запросы, отклоненные контролем допуска",
+    ["route_class", "reason"],
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "admission_wait_seconds",
+    "Ожидание в очереди контроля допуска",
+    ["route_class"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+ANSWER_RATE_LIMITED = Counter(
+    "answer_rate_limited", "Ответы, отклоненные лимитом частоты на пользователя"
+)
+
+
+class Overloaded(Exception):
+    """Запрос не допущен: очередь заполнена или ждать слишком долго."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Предел одновременных запросов с ограниченной очередью FIFO."""
+
+    def __init__(
+        self,
+        limit: int,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        max_wait: float = ADMISSION_MAX_WAIT_MS / 1000,
+    ):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        # Скользящее среднее времени запроса, секунды.
+        self.service_time = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        """Сколько ждать новому запросу при текущей очереди."""
+        return (len(self._waiters) + 1) * self.service_time / self.limit
+
+    async def acquire(self) -> None:
+        """Занять место или дождаться его; иначе Overloaded."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        expected = self.expected_wait()
+        if len(self._waiters) >= self.max_queue:
+            raise Overloaded("queue_full", expected)
+        if expected > self.max_wait:
+            raise Overloaded("deadline", expected)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, self.max_wait)
+        except BaseException as exc:
+            if future.done() and not future.cancelled():
+                # Место передали в момент отмены: вернуть его следующему.
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(future)
+                except ValueError:
+                    pass
+            if isinstance(exc, TimeoutError):
+                raise Overloaded("timeout", self.expected_wait()) from None
+            raise
+
+    def release(self, seconds: Optional[float] = None) -> None:
+        """Освободить место; seconds — сколько занимал его запрос."""
+        if seconds is not None:
+            self.service_time += SERVICE_TIME_WEIGHT * (seconds - self.service_time)
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                # Место переходит к ожидающему, active не меняется.
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionControl:
+    """Пределы для чтений и изменений; None — класс не ограничен."""
+
+    def __init__(
+        self,
+        read: Optional[ConcurrencyLimiter] = None,
+        write: Optional[ConcurrencyLimiter] = None,
+    ):
+        self.limiters = {"read": read, "write": write}
+
+    def limiter_for(self, scope) -> tuple[str, Optional[ConcurrencyLimiter]]:
+        """Класс запроса и его предел."""
+        route_class = "read" if scope["method"] in READ_METHODS else "write"
+        return route_class, self.limiters[route_class]
+
+
+def create_admission() -> Optional[AdmissionControl]:
+    """Контроль допуска по настройкам окружения; None, если выключен."""
+    if ADMISSION_READ_CONCURRENCY <= 0 and ADMISSION_WRITE_CONCURRENCY <= 0:
+        return None
+    return AdmissionControl(
+        read=ConcurrencyLimiter(ADMISSION_READ_CONCURRENCY)
+        if ADMISSION_READ_CONCURRENCY > 0
+        else None,
+        write=ConcurrencyLimiter(ADMISSION_WRITE_CONCURRENCY)
+        if ADMISSION_WRITE_CONCURRENCY > 0
+        else None,
+    )
+
+
+_admission: Optional[AdmissionControl] = create_admission()
+
+
+def get_admission() -> Optional[AdmissionControl]:
+    """Получить контроль допуска (None — выключен)."""
+    return _admission
+
+
+def set_admission(admission: Optional[AdmissionControl]) -> None:
+    """Заменить контроль допуска (в тестах и бенчмарках)."""
+    global _admission
+    _admission = admission
+
+
+def retry_after_header(seconds: float) -> str:
+    """Значение Retry-After: целые секунды, не меньше одной."""
+    return str(max(1, math.ceil(seconds)))
+
+
+class AdmissionMiddleware:
+    """ASGI-middleware: допускает запросы к API в пределах ConcurrencyLimiter.
+
+    Место освобождается, когда приложение отправило ответ целиком.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        admission = get_admission()
+        if (
+            scope["type"] != "http"
+            or admission is None
+            or not scope["path"].startswith(LIMITED_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+        route_class, limiter = admission.limiter_for(scope)
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        waiting = time.perf_counter()
+        try:
+            await limiter.acquire()
+        except Overloaded as exc:
+            ADMISSION_REJECTED.labels(route_class, exc.reason).inc()
+            response = FastJSONResponse(
+                {"detail": "Сервис перегружен, повторите запрос позже"},
+                status_code=503,
+                headers={"Retry-After": retry_after_header(exc.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        started = time.perf_counter()
+        ADMISSION_WAIT_SECONDS.labels(route_class).observe(started - waiting)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+
+class TokenBucketLimiter:
+    """Лимит частоты по ключу: корзина на burst токенов, rate токенов в секунду.
+
+    Хранит не больше max_keys корзин, давно не использованные вытесняются
+    (вытесненный ключ снова начинает с полной корзины).
+    """
+
+    def __init__(
+        self,
+        rate: float = ANSWER_RATE_LIMIT_PER_SECOND,
+        burst: int = ANSWER_RATE_LIMIT_BURST,
+        max_keys: int = ANSWER_RATE_LIMIT_MAX_USERS,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # Ключ → (токены, время обновления по time.monotonic()).
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """Взять токен; вернуть 0 или сколько секунд ждать следующего."""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+_answer_rate_limiter: Optional[TokenBucketLimiter] = (
+    TokenBucketLimiter() if ANSWER_RATE_LIMIT_PER_SECOND > 0 else None
+)
+
+
+def get_answer_rate_limiter() -> Optional[TokenBucketLimiter]:
+    """Получить лимит частоты ответов на пользователя (None — выключен)."""
+    return _answer_rate_limiter
+
+
+def set_answer_rate_limiter(limiter: Optional[TokenBucketLimiter]) -> None:
+    """Заменить лимит частоты ответов (в тестах и бенчмарках)."""
+    global _answer_rate_limiter
+    _answer_rate_limiter = limiter
@@ -0,0 +1,295 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from .singleflight import forget
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "none")
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+LINK_FIELD = "@link"
+# Сколько Redis помнит инвалидацию ключа; чтение из базы должно быть короче.
+INVALIDATION_TTL_SECONDS = 3600
+
+
+@dataclass
+class CacheStats:
+    """Счетчики работы кэша."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class CacheBackend:
+    """Кэш с записями вида ключ → {поле: значение}.
+
+    Все поля ключа удаляются вместе, поэтому под одним ключом хранятся
+    записи, которые инвалидируются одним событием (например, все страницы
+    одного вопроса).
+
+    Инвалидации нумеруются по порядку. Чтение из базы начинается с
+    generation(), и номер передается в set: если ключ инвалидирован после
+    него, данные могли устареть до записи в кэш, и set ничего не делает.
+    Иначе чтение, начатое до изменения, вернуло бы в кэш старую версию
+    после инвалидации.
+    """
+
+    name = "none"
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    async def get(self, key: str, field: str) -> Optional[bytes]:
+        """Прочитать значение и учесть попадание или промах."""
+        return self._record(await self._get(key, field))
+
+    async def get_linked(self, link_key: str, field: str) -> Optional[bytes]:
+        """Прочитать поле ключа, имя которого сохранено в link_key.
+
+        Так запись хранится под ключом владельца и удаляется вместе с ним,
+        а найти ее можно по собственному идентификатору.
+        """
+        target = await self._get(link_key, LINK_FIELD)
+        value = await self._get(target.decode(), field) if target else None
+        return self._record(value)
+
+    async def set_linked(
+        self,
+        link_key: str,
+        key: str,
+        field: str,
+        value: bytes,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Сохранить поле ключа key и ссылку на него из link_key."""
+        await self.set(key, field, value, generation)
+        await self.set(link_key, LINK_FIELD, key.encode(), generation)
+
+    async def generation(self) -> int:
+        """Номер последней инвалидации; берется перед чтением из базы."""
+        return 0
+
+    async def set(
+        self, key: str, field: str, value: bytes, generation: Optional[int] = None
+    ) -> None:
+        """Сохранить значение, если ключ не инвалидирован после generation."""
+
+    async def invalidate(self, *keys: str) -> None:
+        """Удалить ключи со всеми полями.
+
+        Выполняющиеся загрузки этих ключей забываются (см. singleflight.py),
+        даже если кэш выключен.
+        """
+        if keys:
+            forget(*keys)
+            self.stats.invalidations += len(keys)
+            await self._delete(*keys)
+
+    def _record(self, value: Optional[bytes]) -> Optional[bytes]:
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def _get(self, key: str, field: str) -> Optional[bytes]:
+        return None
+
+    async def _delete(self, *keys: str) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """Кэш в памяти процесса с вытеснением LRU и временем жизни ключей.
+
+    Инвалидация видна только текущему процессу; при нескольких воркерах
+    используйте RedisCache.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SECONDS
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, dict[str, bytes]]] = OrderedDict()
+        self._generation = 0
+        # Ключ → номер его последней инвалидации, не больше max_entries ключей.
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        # Наибольший номер, вытесненный из _invalidated: для забытых ключей
+        # считается, что их инвалидировали тогда.
+        self._forgotten_generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def _get(self, key: str, field: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, fields = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return fields.get(field)
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def set(
+        self, key: str, field: str, value: bytes, generation: Optional[int] = None
+    ) -> None:
+        if generation is not None and generation < self._invalidated.get(
+            key, self._forgotten_generation
+        ):
+            return
+        entry = self._entries.get(key)
+        fields = entry[1] if entry and entry[0] > time.monotonic() else {}
+        fields[field] = value
+        self._entries[key] = (time.monotonic() + self.ttl, fields)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def _delete(self, *keys: str) -> None:
+        self._generation += 1
+        for key in keys:
+            self._entries.pop(key, None)
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self.max_entries:
+            _, forgotten = self._invalidated.popitem(last=False)
+            self._forgotten_generation = max(self._forgotten_generation, forgotten)
+
+
+class RedisCache(CacheBackend):
+    """Кэш в Redis (или любом сервере с протоколом Redis) на хэшах HSET/HGET.
+
+    Номер инвалидации — счетчик INCR, номер последней инвалидации ключа
+    хранится INVALIDATION_TTL_SECONDS рядом с ним. Запись с generation
+    проверяет его под WATCH, поэтому проигрывает и инвалидации, выполненной
+    одновременно с ней, в том числе в другом воркере.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl: float = CACHE_TTL_SECONDS, prefix: str = "qa:"):
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def _get(self, key: str, field: str) -> Optional[bytes]:
+        try:
+            return await self.client.hget(self.prefix + key, field)
+        except Exception:
+            logger.warning("Ошибка чтения из Redis", exc_info=True)
+            return None
+
+    async def generation(self) -> int:
+        try:
+            return int(await self.client.get(self._generation_key) or 0)
+        except Exception:
+            logger.warning("Ошибка чтения из Redis", exc_info=True)
+            # Запись с таким номером не пройдет проверку.
+            return -1
+
+    async def set(
+        self, key: str, field: str, value: bytes, generation: Optional[int] = None
+    ) -> None:
+        from redis.exceptions import WatchError
+
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                if generation is not None:
+                    marker = self._invalidated_key(key)
+                    await pipe.watch(marker)
+                    if generation < int(await pipe.get(marker) or 0):
+                        return
+                    pipe.multi()
+                pipe.hset(self.prefix + key, field, value)
+                pipe.pexpire(self.prefix + key, int(self.ttl * 1000))
+                await pipe.execute()
+        except WatchError:
+            # Ключ инвалидирован во время записи.
+            pass
+        except Exception:
+            logger.warning("Ошибка записи в Redis", exc_info=True)
+
+    @property
+    def _generation_key(self) -> str:
+        return self.prefix + "@generation"
+
+    def _invalidated_key(self, key: str) -> str:
+        return self.prefix + "@invalidated:" + key
+
+    async def _delete(self, *keys: str) -> None:
+        try:
+            generation = await self.client.incr(self._generation_key)
+            async with self.client.pipeline(transaction=True) as pipe:
+                for key in keys:
+                    pipe.set(
+                        self._invalidated_key(key),
+                        generation,
+                        ex=INVALIDATION_TTL_SECONDS,
+                    )
+                pipe.delete(*(self.prefix + key for key in keys))
+                await pipe.execute()
+        except Exception:
+            # Запись в БД уже зафиксирована; устаревшая запись проживет до TTL.
+            logger.error("Ошибка инвалидации ключей Redis %s", keys, exc_info=True)
+
+
+def create_cache(backend: str = CACHE_BACKEND) -> CacheBackend:
+    """Создать кэш по имени бэкенда: none, memory или redis."""
+    if backend == "memory":
+        return MemoryCache()
+    if backend == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "Для CACHE_BACKEND=redis установите пакет redis"
+            ) from exc
+        return RedisCache(redis.from_url(REDIS_URL))
+    if backend == "none":
+        return CacheBackend()
+    raise ValueError(f"Неизвестный CACHE_BACKEND: {backend}")
+
+
+_cache = create_cache()
+
+
+def get_cache() -> CacheBackend:
+    """Получить текущий кэш приложения."""
+    return _cache
+
+
+def set_cache(cache: CacheBackend) -> None:
+    """Заменить кэш приложения (например, в тестах)."""
+    global _cache
+    _cache = cache
+
+
+def question_key(question_id: int) -> str:
+    return f"question:{question_id}"
+
+
+def answer_key(answer_id: int) -> str:
+    return f"answer:{answer_id}"
@@ -0,0 +1,332 @@
+"""Сжатие ответов по Accept-Encoding.
+
+CompressionMiddleware сжимает ответы JSON, NDJSON и текстовые ответы
+кодеком, который выбран по Accept-Encoding клиента из COMPRESSION_ENCODINGS
+(в порядке предпочтения сервера). gzip доступен всегда, zstd и br — если
+установлены пакеты zstandard и brotli (pip install .[compression]).
+Ответы меньше COMPRESSION_MIN_SIZE байт отдаются как есть: заголовки и
+время сжатия съели бы выигрыш.
+
+Потоковые ответы (выгрузка NDJSON) сжимаются по частям: каждая часть
+дожимается до границы блока, поэтому клиент может разбирать строки, не
+дожидаясь конца выгрузки.
+
+Сжатый ответ с ETag кладется в CompressedCache под ключом (путь, запрос,
+ETag, кодек). ETag меняется вместе с версией данных, поэтому популярный
+неизменный вопрос сжимается один раз, а не на каждый запрос; устаревшие
+версии вытесняются по LRU в пределах COMPRESSION_CACHE_MAX_BYTES. ETag
+сжатого ответа становится слабым: байты представления другие, а сравнение
+If-None-Match в API слабое, поэтому 304 продолжают работать.
+"""
+
+import logging
+import os
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from prometheus_client import Counter
+from starlette.datastructures import Headers, MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_ENCODINGS = [
+    name.strip()
+    for name in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",")
+    if name.strip()
+]
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_CACHE_MAX_BYTES = int(
+    os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+)
+
+# Уровни для динамических ответов: быстрые, с хорошим сжатием текста.
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+COMPRESSION_INPUT_BYTES = Counter(
+    "http_compression_input_bytes", "Байты ответов до сжатия", ["encoding"]
+)
+COMPRESSION_OUTPUT_BYTES = Counter(
+    "http_compression_output_bytes", "Байты ответов после сжатия", ["encoding"]
+)
+COMPRESSION_SECONDS = Counter(
+    "http_compression_seconds", "Время сжатия ответов", ["encoding"]
+)
+COMPRESSION_CACHE_HITS = Counter(
+    "http_compression_cache_hits", "Ответы, отданные из кэша сжатых ответов"
+)
+
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level: int = GZIP_LEVEL):
+        self.level = level
+
+    def _compressobj(self):
+        # wbits=31 — формат gzip, а не голый zlib.
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = self._compressobj()
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self) -> "StreamCompressor":
+        compressor = self._compressobj()
+        return StreamCompressor(
+            lambda chunk: (
+                compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            ),
+            compressor.flush,
+        )
+
+
+class BrotliCodec:
+    name = "br"
+
+    def __init__(self, quality: int = BROTLI_QUALITY):
+        import brotli
+
+        self._brotli = brotli
+        self.quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.compress(data, quality=self.quality)
+
+    def stream(self) -> "StreamCompressor":
+        compressor = self._brotli.Compressor(quality=self.quality)
+        return StreamCompressor(
+            lambda chunk: compressor.process(chunk) + compressor.flush(),
+            compressor.finish,
+        )
+
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level: int = ZSTD_LEVEL):
+        import zstandard
+
+        self._zstandard = zstandard
+        self._compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def stream(self) -> "StreamCompressor":
+        compressor = self._compressor.compressobj()
+        flush_block = self._zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return StreamCompressor(
+            lambda chunk: compressor.compress(chunk) + compressor.flush(flush_block),
+            compressor.flush,
+        )
+
+
+class StreamCompressor:
+    """Сжатие потока: compress отдает сжатую часть целиком, finish — хвост."""
+
+    def __init__(self, compress, finish):
+        self.compress = compress
+        self.finish = finish
+
+
+CODECS = {"gzip": GzipCodec, "br": BrotliCodec, "zstd": ZstdCodec}
+
+
+def available_codecs(names: list[str] = COMPRESSION_ENCODINGS) -> dict:
+    """Кодеки из списка в порядке предпочтения; без пакета кодек пропускается."""
+    codecs = {}
+    for name in names:
+        try:
+            codecs[name] = CODECS[name]()
+        except KeyError:
+            logger.warning("Неизвестный кодек сжатия: %s", name)
+        except ImportError:
+            logger.info("Сжатие %s недоступно: не установлен пакет", name)
+    return codecs
+
+
+def choose_encoding(accept_encoding: str, codecs) -> Optional[str]:
+    """Первый из кодеков сервера, который клиент принимает (q > 0)."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for name in codecs:
+        if accepted.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+class CompressedCache:
+    """LRU сжатых ответов с пределом суммарного размера в байтах."""
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is not None:
+            self._entries.move_to_end(key)
+        return body
+
+    def set(self, key: tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+def weak_etag(etag: str) -> str:
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+class CompressionMiddleware:
+    """ASGI-middleware: сжатие ответов по Accept-Encoding (см. модуль)."""
+
+    def __init__(
+        self,
+        app,
+        codecs: Optional[dict] = None,
+        min_size: int = COMPRESSION_MIN_SIZE,
+        cache: Optional[CompressedCache] = None,
+    ):
+        self.app = app
+        self.codecs = available_codecs() if codecs is None else codecs
+        self.min_size = min_size
+        self.cache = CompressedCache() if cache is None else cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.codecs or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.codecs
+        )
+        responder = CompressingResponder(self, scope, send, encoding)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressingResponder:
+    """Состояние сжатия одного ответа."""
+
+    def __init__(self, middleware: CompressionMiddleware, scope, send, encoding):
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.start: Optional[dict] = None
+        # Сжатие потокового ответа; до первой части тела — None.
+        self.stream: Optional[StreamCompressor] = None
+        # Ответ отдается без изменений.
+        self.passthrough = False
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            message.setdefault("headers", [])
+            headers = Headers(raw=message.get("headers", []))
+            content_type = headers.get("content-type", "")
+            if (
+                message["status"] < 200
+                or message["status"] in (204, 304)
+                or "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                self.passthrough = True
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is None:
+            MutableHeaders(raw=self.start["headers"]).add_vary_header("Accept-Encoding")
+            if self.encoding is None or (
+                not more_body and len(body) < self.middleware.min_size
+            ):
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+            if not more_body:
+                await self._send_whole(body)
+                return
+            self.stream = self.middleware.codecs[self.encoding].stream()
+            headers = self._compressed_headers()
+            del headers["content-length"]
+            await self._send(self.start)
+
+        started = time.perf_counter()
+        if more_body:
+            compressed = self.stream.compress(body)
+        else:
+            compressed = self.stream.compress(body) + self.stream.finish()
+        self._observe(len(body), len(compressed), time.perf_counter() - started)
+        await self._send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
+
+    async def _send_whole(self, body: bytes) -> None:
+        headers = self._compressed_headers()
+        etag = headers.get("etag")
+        key = None
+        compressed = None
+        if etag is not None:
+            key = (
+                self.scope["path"],
+                self.scope.get("query_string", b""),
+                etag,
+                self.encoding,
+            )
+            compressed = self.middleware.cache.get(key)
+        if compressed is not None:
+            COMPRESSION_CACHE_HITS.inc()
+        else:
+            started = time.perf_counter()
+            compressed = self.middleware.codecs[self.encoding].compress(body)
+            self._observe(len(body), len(compressed), time.perf_counter() - started)
+            if key is not None:
+                self.middleware.cache.set(key, compressed)
+        headers["content-length"] = str(len(compressed))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    def _compressed_headers(self) -> MutableHeaders:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["content-encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag is not None:
+            headers["etag"] = weak_etag(etag)
+        return headers
+
+    def _observe(self, size: int, compressed: int, seconds: float) -> None:
+        COMPRESSION_INPUT_BYTES.labels(self.encoding).inc(size)
+        COMPRESSION_OUTPUT_BYTES.labels(self.encoding).inc(compressed)
+        COMPRESSION_SECONDS.labels(self.encoding).inc(seconds)
@@ -1,27 +1,90 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from .metrics import instrument_engine
+from .pool import pool_options
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./questions_answers.db")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}
-    if DATABASE_URL.startswith("sqlite")
-    else {},
-    echo=False,
-)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Заменить синхронный драйвер в URL базы данных на асинхронный."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        return url
+    return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+
+
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+
+
+def enable_sqlite_foreign_keys(async_engine) -> None:
+    """Включить проверку внешних ключей и ON DELETE CASCADE в SQLite."""
+    if async_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+# Нарушение внешнего ключа: SQLSTATE в PostgreSQL, расширенный код в SQLite.
+PG_FOREIGN_KEY_VIOLATION = "23503"
+SQLITE_CONSTRAINT_FOREIGNKEY = 787
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def is_foreign_key_violation(exc: IntegrityError) -> bool:
+    """Проверить, что запись отклонена из-за несуществующей родительской строки."""
+    return (
+        getattr(exc.orig, "sqlstate", None) == PG_FOREIGN_KEY_VIOLATION
+        or getattr(exc.orig, "sqlite_errorcode", None) == SQLITE_CONSTRAINT_FOREIGNKEY
+    )
+
+
+# Транзакция откачена из-за конфликта с другой: повтор обычно проходит.
+PG_DEADLOCK_DETECTED = "40P01"
+PG_SERIALIZATION_FAILURE = "40001"
+
+
+def is_transaction_conflict(exc: DBAPIError) -> bool:
+    """Проверить, что транзакция откачена из-за взаимоблокировки или сериализации."""
+    return getattr(exc.orig, "sqlstate", None) in (
+        PG_DEADLOCK_DETECTED,
+        PG_SERIALIZATION_FAILURE,
+    )
+
+
+def make_engine(url: str, **options):
+    """Создать асинхронный движок приложения: пул, внешние ключи, метрики."""
+    async_engine = create_async_engine(
+        to_async_url(url), echo=False, **{**pool_options(), **options}
+    )
+    enable_sqlite_foreign_keys(async_engine)
+    instrument_engine(async_engine)
+    return async_engine
+
+
+engine = make_engine(DATABASE_URL)
+
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Зависимость для получения сессии базы данных."""
-    db = SessionLocal()
-    try:
+async def get_db():
+    """Зависимость для получения асинхронной сессии базы данных."""
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
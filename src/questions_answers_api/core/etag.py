@@ -0,0 +1,39 @@
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """Собрать сильный ETag из частей, однозначно определяющих представление."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def row_stamp(created_at: datetime) -> str:
+    """Метка строки для ETag: время ее создания с микросекундами.
+
+    SQLite отдает новой строке ID удаленной последней, и номер версии у новой
+    строки начинается заново, поэтому ID и версии мало: без метки новая
+    строка получила бы ETag удаленной.
+    """
+    return created_at.strftime("%Y%m%d%H%M%S%f")
+
+
+def make_digest_etag(*parts) -> str:
+    """Собрать сильный ETag из хэша частей (для списков)."""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode())
+    return '"' + digest.hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Проверить заголовок If-None-Match (слабое сравнение, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -0,0 +1,204 @@
+"""Проверки живости и готовности для оркестратора и балансировщика.
+
+/health/live отвечает, пока процесс обслуживает запросы, и к базе не
+обращается: его провал означает, что воркер нужно перезапустить.
+
+/health/ready говорит, стоит ли направлять в воркер трафик. Проверять базу
+на каждый запрос пробы нельзя: частые пробы нескольких оркестраторов сами
+стали бы нагрузкой, а при исчерпанном пуле проба ждала бы соединение вместе
+с запросами. Поэтому базу раз в HEALTH_CHECK_INTERVAL секунд проверяет
+фоновая задача воркера (HealthProber): SELECT 1 и сверка ревизии
+alembic_version с head миграций. Соединение для проверки открывается
+отдельно от пула приложения, поэтому проверка не ждет очереди пула и не
+занимает в нем место; предел --db-max-connections учитывает его отдельно
+(split_connections в core/pool.py). Проба отдает сохраненный результат, а
+заполненность пула считает на месте по счетчикам пула — без ввода-вывода,
+так что исчерпание пула снимает воркер с трафика сразу, а не к следующей
+проверке.
+
+Результат старше трех интервалов считается недействительным: фоновая задача
+остановилась или зависла.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+
+from .database import enable_sqlite_foreign_keys, to_async_url
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+HEALTH_CHECK_MIGRATIONS = os.getenv("HEALTH_CHECK_MIGRATIONS", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+# Доля занятых соединений пула, при которой воркер перестает быть готовым.
+HEALTH_POOL_SATURATION = float(os.getenv("HEALTH_POOL_SATURATION", "1.0"))
+# Сколько интервалов проверки результат остается действительным.
+STALE_INTERVALS = 3
+
+ALEMBIC_INI = Path(__file__).resolve().parents[3] / "alembic.ini"
+
+
+def migration_heads(alembic_ini: Path = ALEMBIC_INI) -> Optional[set[str]]:
+    """Head-ревизии миграций; None, если миграций рядом с кодом нет."""
+    if not alembic_ini.exists():
+        return None
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(Config(str(alembic_ini))).get_heads())
+
+
+def pool_saturation(pool: Pool, threshold: float = HEALTH_POOL_SATURATION) -> dict:
+    """Заполненность пула по его счетчикам; ok=False, если пул исчерпан."""
+    if not isinstance(pool, QueuePool):
+        return {"ok": True}
+    limit = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "ok": checked_out < limit * threshold,
+        "checked_out": checked_out,
+        "max_connections": limit,
+    }
+
+
+@dataclass
+class HealthState:
+    """Результат последней фоновой проверки базы."""
+
+    checked_at: float = 0.0
+    database: dict = field(
+        default_factory=lambda: {"ok": False, "error": "не проверялась"}
+    )
+    migrations: dict = field(default_factory=lambda: {"ok": True})
+
+    @property
+    def ok(self) -> bool:
+        return self.database["ok"] and self.migrations["ok"]
+
+
+class HealthProber:
+    """Фоновая проверка базы с сохранением результата для проб готовности."""
+
+    def __init__(
+        self,
+        url: str,
+        interval: float = HEALTH_CHECK_INTERVAL,
+        timeout: float = HEALTH_CHECK_TIMEOUT,
+        expected_heads: Optional[set[str]] = None,
+    ):
+        self.engine = create_async_engine(to_async_url(url), poolclass=NullPool)
+        enable_sqlite_foreign_keys(self.engine)
+        self.interval = interval
+        self.timeout = timeout
+        self.expected_heads = expected_heads
+        self.state = HealthState()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Проверить базу сразу и продолжать проверки в фоне."""
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить фоновые проверки и закрыть их соединения."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def check(self) -> HealthState:
+        """Проверить соединение с базой и ревизию миграций."""
+        state = HealthState(checked_at=time.monotonic())
+        try:
+            revisions = await asyncio.wait_for(self._query(), self.timeout)
+        except TimeoutError:
+            state.database = {
+                "ok": False,
+                "error": f"нет ответа за {self.timeout:g} с",
+            }
+        except Exception as exc:
+            state.database = {"ok": False, "error": type(exc).__name__}
+        else:
+            state.database = {"ok": True}
+            if self.expected_heads is not None:
+                state.migrations = {
+                    "ok": revisions == self.expected_heads,
+                    "current": sorted(revisions or ()),
+                    "head": sorted(self.expected_heads),
+                }
+        if state.ok != self.state.ok:
+            log = logger.info if state.ok else logger.warning
+            log("Готовность воркера [%d]: %s", os.getpid(), state)
+        self.state = state
+        return state
+
+    async def _query(self) -> Optional[set[str]]:
+        async with self.engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            if self.expected_heads is None:
+                return None
+            try:
+                result = await connection.execute(
+                    text("SELECT version_num FROM alembic_version")
+                )
+            except DBAPIError:
+                # Таблицы нет — схема создана не миграциями.
+                return set()
+            return set(result.scalars())
+
+
+_prober: Optional[HealthProber] = None
+
+
+def readiness(pool: Pool) -> dict:
+    """Готовность воркера: результат фоновой проверки и текущий пул.
+
+    Без фоновой проверки (HEALTH_CHECK_INTERVAL=0) учитывается только пул.
+    """
+    checks = {"pool": pool_saturation(pool)}
+    ready = checks["pool"]["ok"]
+    prober = get_health_prober()
+    if prober is not None:
+        state = prober.state
+        age = time.monotonic() - state.checked_at
+        ready = ready and state.ok and age <= prober.interval * STALE_INTERVALS
+        checks.update(
+            database=state.database,
+            migrations=state.migrations,
+            checked_seconds_ago=round(age, 3),
+        )
+    return {"status": "ready" if ready else "not_ready", **checks}
+
+
+def get_health_prober() -> Optional[HealthProber]:
+    """Получить фоновую проверку (None — проверка базы выключена)."""
+    return _prober
+
+
+def set_health_prober(prober: Optional[HealthProber]) -> None:
+    """Заменить фоновую проверку (при запуске приложения и в тестах)."""
+    global _prober
+    _prober = prober
@@ -0,0 +1,329 @@
+"""Метрики Prometheus: HTTP-запросы и запросы к базе данных в них.
+
+Метрики пула соединений определены в core/pool.py. С несколькими воркерами
+uvicorn задайте PROMETHEUS_MULTIPROC_DIR — пустой каталог, общий для всех
+воркеров: prometheus_client пишет в него значения каждого процесса, а
+/metrics в любом воркере отдает их сумму.
+
+Запросы к базе в рамках HTTP-запроса группируются по форме (SQL без
+значений параметров). Форма, повторенная SQL_REPEAT_THRESHOLD раз и более,
+— признак N+1: такой запрос пишется в лог и учитывается в метриках.
+"""
+
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "3"))
+# Отладка: число запросов к базе в заголовках X-DB-Queries и
+# X-DB-Repeated-Queries каждого ответа.
+SQL_DEBUG_HEADERS = os.getenv("SQL_DEBUG_HEADERS", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Запросы, не попавшие ни в один маршрут, учитываются под одной меткой,
+# чтобы произвольные URL не размножали временные ряды.
+UNMATCHED_ROUTE = "<unmatched>"
+
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUERY_SECONDS_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+HTTP_REQUESTS = Counter(
+    "http_requests", "HTTP-запросы по статусу ответа", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route"],
+)
+HTTP_REQUEST_SIZE = Histogram(
+    "http_request_size_bytes",
+    "Размер тела HTTP-запроса",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Размер тела HTTP-ответа",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Количество запросов к базе за один HTTP-запрос",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Суммарное время запросов к базе за один HTTP-запрос",
+    ["method", "route"],
+    buckets=QUERY_SECONDS_BUCKETS,
+)
+HTTP_REQUEST_REPEATED_QUERIES = Counter(
+    "http_request_repeated_queries",
+    "HTTP-запросы с повторяющимися запросами к базе (N+1)",
+    ["method", "route"],
+)
+
+# Списки параметров IN (?, ?, ?) и номера $1, $2 (asyncpg) не меняют форму.
+_PARAM_NUMBER = re.compile(r"\$\d+")
+_PARAM = r"\s*\$?\?(?:::\w+)?\s*"
+_PARAM_LIST = re.compile(rf"\({_PARAM}(?:,{_PARAM})*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# Текстов запросов в приложении немного, форма каждого вычисляется один раз.
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """Форма SQL-запроса: текст без различий в числе и номерах параметров."""
+    shape = _PARAM_NUMBER.sub("$?", statement)
+    shape = _PARAM_LIST.sub("(?...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass(slots=True)
+class RequestUsage:
+    """Счетчики одного HTTP-запроса."""
+
+    status: int = 500
+    request_bytes: int = 0
+    response_bytes: int = 0
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    # Текст запроса → количество выполнений; формы считаются только при
+    # разборе, чтобы не тратить время на каждом запросе.
+    statements: dict[str, int] = field(default_factory=dict)
+
+    def shapes(self) -> dict[str, int]:
+        """Количество выполнений каждой формы запроса."""
+        shapes: dict[str, int] = {}
+        for statement, count in self.statements.items():
+            shape = statement_shape(statement)
+            shapes[shape] = shapes.get(shape, 0) + count
+        return shapes
+
+    def repeated_queries(self) -> int:
+        """Количество запросов, повторяющих форму более раннего запроса."""
+        return self.db_queries - len(self.shapes())
+
+
+@dataclass(slots=True)
+class RequestReport:
+    """Итог HTTP-запроса для наблюдателей collect_requests()."""
+
+    method: str
+    path: str
+    route: str
+    usage: RequestUsage
+
+
+# Счетчики текущего HTTP-запроса; вне запросов (CLI, фоновые задачи) — None.
+_current_usage: ContextVar[Optional[RequestUsage]] = ContextVar(
+    "current_usage", default=None
+)
+
+
+def instrument_engine(async_engine) -> None:
+    """Учитывать запросы движка к базе в метриках текущего HTTP-запроса."""
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if context is not None and _current_usage.get() is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        usage = _current_usage.get()
+        started = getattr(context, "_metrics_started", None)
+        if usage is None or started is None:
+            return
+        usage.db_queries += 1
+        usage.db_seconds += time.perf_counter() - started
+        usage.statements[statement] = usage.statements.get(statement, 0) + 1
+
+
+class MetricsMiddleware:
+    """ASGI-middleware, собирающее метрики HTTP-запросов.
+
+    Маршрут в метках — шаблон пути (/questions/{question_id}), а не URL.
+    Размеры считаются по фактически прочитанному и отправленному телу,
+    поэтому учитываются и потоковые ответы без Content-Length.
+
+    При SQL_DEBUG_HEADERS в ответ добавляются X-DB-Queries и
+    X-DB-Repeated-Queries: запросы к базе до начала ответа (для потоковых
+    ответов — без запросов, выполненных во время передачи тела).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        usage = RequestUsage()
+        token = _current_usage.set(usage)
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                usage.request_bytes += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                usage.status = message["status"]
+                if SQL_DEBUG_HEADERS:
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", ()),
+                            (b"x-db-queries", str(usage.db_queries).encode()),
+                            (
+                                b"x-db-repeated-queries",
+                                str(usage.repeated_queries()).encode(),
+                            ),
+                        ],
+                    }
+            elif message["type"] == "http.response.body":
+                usage.response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            _current_usage.reset(token)
+            observe_request(scope, usage, time.perf_counter() - started)
+
+
+# Дочерние метрики по (метод, маршрут): labels() берет блокировку и строит
+# ключ на каждом вызове, а набор маршрутов конечен.
+_route_metrics: dict[tuple[str, str], tuple] = {}
+_status_counters: dict[tuple[str, str, int], Counter] = {}
+_request_observers: list[Callable[[RequestReport], None]] = []
+
+
+def observe_request(scope, usage: RequestUsage, seconds: float) -> None:
+    """Записать метрики завершенного HTTP-запроса."""
+    route = scope.get("route")
+    key = (scope["method"], getattr(route, "path", UNMATCHED_ROUTE))
+    children = _route_metrics.get(key)
+    if children is None:
+        children = _route_metrics[key] = tuple(
+            histogram.labels(*key)
+            for histogram in (
+                HTTP_REQUEST_DURATION,
+                HTTP_REQUEST_SIZE,
+                HTTP_RESPONSE_SIZE,
+                HTTP_REQUEST_DB_QUERIES,
+                HTTP_REQUEST_DB_SECONDS,
+            )
+        )
+    duration, request_size, response_size, db_queries, db_seconds = children
+    duration.observe(seconds)
+    request_size.observe(usage.request_bytes)
+    response_size.observe(usage.response_bytes)
+    db_queries.observe(usage.db_queries)
+    db_seconds.observe(usage.db_seconds)
+    # Повтор возможен только при числе запросов не меньше порога.
+    if usage.db_queries >= SQL_REPEAT_THRESHOLD:
+        report_repeated_queries(key, scope["path"], usage)
+    for observer in _request_observers:
+        observer(RequestReport(key[0], scope["path"], key[1], usage))
+
+    status_key = (*key, usage.status)
+    counter = _status_counters.get(status_key)
+    if counter is None:
+        counter = _status_counters[status_key] = HTTP_REQUESTS.labels(
+            *key, str(usage.status)
+        )
+    counter.inc()
+
+
+def report_repeated_queries(
+    key: tuple[str, str], path: str, usage: RequestUsage
+) -> None:
+    """Записать в лог и метрики формы запросов, повторенные не меньше порога."""
+    repeated = {
+        shape: count
+        for shape, count in usage.shapes().items()
+        if count >= SQL_REPEAT_THRESHOLD
+    }
+    if not repeated:
+        return
+    HTTP_REQUEST_REPEATED_QUERIES.labels(*key).inc()
+    for shape, count in repeated.items():
+        logger.warning(
+            "Возможный N+1 в %s %s: %s × %s",
+            key[0],
+            path,
+            count,
+            shape,
+        )
+
+
+@contextmanager
+def collect_requests() -> Iterator[list[RequestReport]]:
+    """Собрать итоги HTTP-запросов, завершившихся внутри блока (для тестов)."""
+    reports: list[RequestReport] = []
+    _request_observers.append(reports.append)
+    try:
+        yield reports
+    finally:
+        _request_observers.remove(reports.append)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Текущие значения всех метрик в текстовом формате Prometheus."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Убрать значения gauge завершающегося воркера из общей суммы."""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursorError(ValueError):
+    """Курсор пагинации поврежден или подделан."""
+
+
+def _encode(position: list) -> str:
+    payload = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    position = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(position, list) or len(position) != 2:
+        raise TypeError(position)
+    if not isinstance(position[1], int):
+        raise TypeError(position[1])
+    return position
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Упаковать позицию (created_at, id) в непрозрачный курсор."""
+    return _encode([created_at.isoformat(), item_id])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Распаковать курсор в позицию (created_at, id)."""
+    try:
+        created_at, item_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), item_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Некорректный курсор пагинации") from exc
+
+
+def encode_rank_cursor(rank: float, item_id: int) -> str:
+    """Упаковать позицию (релевантность, id) результатов поиска в курсор."""
+    return _encode([rank, item_id])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    """Распаковать курсор результатов поиска в позицию (релевантность, id)."""
+    try:
+        rank, item_id = _decode(cursor)
+        if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+            raise TypeError(rank)
+        return float(rank), item_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Некорректный курсор пагинации") from exc
+
+
+def encode_count_cursor(count: int, item_id: int) -> str:
+    """Упаковать позицию (количество, id) в курсор."""
+    return _encode([count, item_id])
+
+
+def decode_count_cursor(cursor: str) -> tuple[int, int]:
+    """Распаковать курсор в позицию (количество, id)."""
+    try:
+        count, item_id = _decode(cursor)
+        if isinstance(count, bool) or not isinstance(count, int):
+            raise TypeError(count)
+        return count, item_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Некорректный курсор пагинации") from exc
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_POOL_SLOW_WAIT_SECONDS = float(os.getenv("DB_POOL_SLOW_WAIT_SECONDS", "1"))
+DB_POOL_LOG_INTERVAL = float(os.getenv("DB_POOL_LOG_INTERVAL", "0"))
+
+# Верхние границы корзин гистограммы ожидания соединения, в секундах.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+# Метрики Prometheus; с несколькими воркерами значения воркеров складываются.
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Соединения пула по состоянию",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+POOL_MAX_CONNECTIONS = Gauge(
+    "db_pool_max_connections",
+    "Предел соединений пула (pool_size + max_overflow)",
+    multiprocess_mode="livesum",
+)
+POOL_CHECKED_OUT = POOL_CONNECTIONS.labels("checked_out")
+POOL_CHECKED_IN = POOL_CONNECTIONS.labels("checked_in")
+POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Время ожидания соединения из пула",
+    buckets=WAIT_BUCKETS,
+)
+POOL_TIMEOUTS = Counter("db_pool_timeouts", "Таймауты ожидания соединения из пула")
+
+
+@dataclass
+class PoolStats:
+    """Счетчики ожидания соединений из пула."""
+
+    waits: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    timeouts: int = 0
+    wait_buckets: list[int] = field(default_factory=lambda: [0] * len(WAIT_BUCKETS))
+
+    def observe(self, seconds: float) -> None:
+        """Учесть одно ожидание соединения."""
+        self.waits += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                self.wait_buckets[i] += 1
+                break
+
+    def histogram(self) -> dict[str, int]:
+        """Накопительная гистограмма ожиданий: граница корзины → количество."""
+        histogram = {}
+        total = 0
+        for bound, count in zip(WAIT_BUCKETS, self.wait_buckets):
+            total += count
+            histogram[str(bound)] = total
+        histogram["+Inf"] = self.waits
+        return histogram
+
+
+class ObservedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, который измеряет время ожидания и считает таймауты.
+
+    Ожидание длиннее DB_POOL_SLOW_WAIT_SECONDS и каждый таймаут пишутся
+    в лог вместе с текущим состоянием пула. Ожидания, таймауты и число
+    соединений также публикуются в метриках Prometheus.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        POOL_MAX_CONNECTIONS.set(self.size() + self._max_overflow)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            POOL_TIMEOUTS.inc()
+            logger.warning("Таймаут ожидания соединения из пула: %s", pool_status(self))
+            raise
+        waited = time.perf_counter() - started
+        self.stats.observe(waited)
+        POOL_WAIT_SECONDS.observe(waited)
+        self._update_gauges()
+        if waited >= DB_POOL_SLOW_WAIT_SECONDS:
+            logger.warning(
+                "Соединение из пула получено через %.3f с: %s",
+                waited,
+                pool_status(self),
+            )
+        return connection
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        POOL_CHECKED_OUT.set(self.checkedout())
+        POOL_CHECKED_IN.set(self.checkedin())
+
+    def recreate(self) -> "ObservedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def pool_options() -> dict:
+    """Параметры create_async_engine для пула из переменных окружения."""
+    return {
+        "poolclass": ObservedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def split_connections(
+    max_connections: int,
+    workers: int,
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    reserved: int = 0,
+) -> tuple[int, int]:
+    """pool_size и max_overflow воркера, при которых все воркеры вместе
+    открывают не больше max_connections соединений с базой.
+
+    reserved — соединения воркера мимо пула (фоновая проверка базы в
+    core/health.py), они вычитаются из доли каждого воркера.
+    """
+    per_worker = max_connections // workers - reserved
+    if per_worker < 1:
+        raise ValueError(
+            f"{max_connections} соединений с базой не хватит на {workers} воркеров"
+        )
+    size = min(pool_size, per_worker)
+    return size, min(max_overflow, per_worker - size)
+
+
+def pool_status(pool: Pool) -> dict:
+    """Текущее состояние пула и накопленная статистика ожиданий."""
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(
+            waits=stats.waits,
+            wait_seconds_total=stats.wait_seconds_total,
+            wait_seconds_max=stats.wait_seconds_max,
+            timeouts=stats.timeouts,
+            wait_histogram=stats.histogram(),
+        )
+    return status
+
+
+async def log_pool_status(pool_getter, interval: float) -> None:
+    """Периодически писать состояние пула в лог (для фоновой задачи)."""
+    while True:
+        await asyncio.sleep(interval)
+        logger.info("Состояние пула соединений: %s", pool_status(pool_getter()))
@@ -0,0 +1,172 @@
+"""Чтение с реплик базы данных с гарантией read-your-writes.
+
+Если задан READ_DATABASE_URL (один URL или несколько через запятую),
+GET-эндпоинты получают сессию реплики через get_read_db, реплики
+выбираются по кругу. Запись по-прежнему идет в основную базу через get_db.
+
+Реплики отстают от основной базы, поэтому клиент, который только что
+что-то изменил, мог бы не увидеть свою запись. После успешного изменяющего
+запроса ReadYourWritesMiddleware ставит cookie READ_YOUR_WRITES_COOKIE со
+временем, до которого чтения этого клиента идут в основную базу
+(READ_YOUR_WRITES_SECONDS). Такие чтения также не берут данные из кэша:
+его могло заполнить чтение с отстающей реплики.
+"""
+
+import math
+import os
+import time
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .database import get_db, make_engine
+
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", "")
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_COOKIE = "qa_primary_until"
+
+# Флаг в Session.info: чтение закреплено за основной базой после записи.
+PINNED_TO_PRIMARY = "pinned_to_primary"
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ReplicaSet:
+    """Реплики для чтения; сессии выдаются по кругу."""
+
+    def __init__(self, engines: list):
+        if not engines:
+            raise ValueError("Нужна хотя бы одна реплика")
+        self.engines = engines
+        self._sessions = [
+            async_sessionmaker(
+                bind=replica,
+                class_=AsyncSession,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+            for replica in engines
+        ]
+        self._next = 0
+
+    @classmethod
+    def from_urls(cls, urls: list[str]) -> "ReplicaSet":
+        # Метрики пула в Prometheus описывают пул основной базы, поэтому
+        # у реплик обычный пул без них.
+        return cls([make_engine(url, poolclass=AsyncAdaptedQueuePool) for url in urls])
+
+    def session(self) -> AsyncSession:
+        """Открыть сессию следующей по кругу реплики."""
+        sessions = self._sessions[self._next]
+        self._next = (self._next + 1) % len(self._sessions)
+        return sessions()
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+
+def parse_urls(value: str) -> list[str]:
+    """Разобрать список URL через запятую."""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+def create_replicas(value: str = READ_DATABASE_URL) -> Optional[ReplicaSet]:
+    """Создать реплики из READ_DATABASE_URL; None, если реплик нет."""
+    urls = parse_urls(value)
+    return ReplicaSet.from_urls(urls) if urls else None
+
+
+_replicas = create_replicas()
+
+
+def get_replicas() -> Optional[ReplicaSet]:
+    """Получить реплики приложения (None — читать из основной базы)."""
+    return _replicas
+
+
+def set_replicas(replicas: Optional[ReplicaSet]) -> None:
+    """Заменить реплики приложения (например, в тестах)."""
+    global _replicas
+    _replicas = replicas
+
+
+def pinned_until(request: Request) -> float:
+    """Время (Unix), до которого чтения клиента идут в основную базу."""
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+    except ValueError:
+        return 0.0
+
+
+def is_pinned(db: AsyncSession) -> bool:
+    """Проверить, что сессия читает свежие данные после записи клиента."""
+    return db.info.get(PINNED_TO_PRIMARY, False)
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)):
+    """Зависимость для сессии чтения: реплика или основная база.
+
+    Сессия основной базы соединение не занимает, пока к ней нет запросов,
+    поэтому она создается всегда (и переопределение get_db в тестах
+    действует и здесь).
+    """
+    replicas = get_replicas()
+    if replicas is None:
+        yield db
+        return
+    if pinned_until(request) > time.time():
+        db.info[PINNED_TO_PRIMARY] = True
+        yield db
+        return
+    async with replicas.session() as replica_db:
+        yield replica_db
+
+
+class ReadYourWritesMiddleware:
+    """ASGI-middleware: закрепляет чтения клиента за основной базой после записи.
+
+    На успешный ответ изменяющего запроса (не GET/HEAD/OPTIONS, статус
+    меньше 400) добавляет cookie READ_YOUR_WRITES_COOKIE со временем
+    окончания окна. Без реплик ничего не делает.
+    """
+
+    def __init__(self, app, window: float = READ_YOUR_WRITES_SECONDS):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or get_replicas() is None
+            or self.window <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def pinning_send(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", ()),
+                        (b"set-cookie", self._cookie().encode("latin-1")),
+                    ],
+                }
+            await send(message)
+
+        await self.app(scope, receive, pinning_send)
+
+    def _cookie(self) -> str:
+        cookie = SimpleCookie()
+        cookie[READ_YOUR_WRITES_COOKIE] = f"{time.time() + self.window:.3f}"
+        morsel = cookie[READ_YOUR_WRITES_COOKIE]
+        morsel["max-age"] = math.ceil(self.window)
+        morsel["path"] = "/"
+        morsel["httponly"] = True
+        morsel["samesite"] = "Lax"
+        return morsel.OutputString()
@@ -0,0 +1,93 @@
+"""Быстрая сериализация ответов API без повторной валидации.
+
+Схемы ответов (QuestionResponse, QuestionWithAnswers, ...) при выдаче
+проверяют каждый объект ORM через from_attributes и заново прогоняют
+валидаторы текста. Для списков это большая часть времени запроса. Здесь те
+же ответы описаны как TypedDict над словарями, которые возвращают
+репозитории, и кодируются в JSON заранее собранными TypeAdapter без
+валидации. Лишние ключи (например, version) в JSON не попадают.
+
+Поля обязаны совпадать со схемами из schemas/ (порядок ключей в JSON
+задают словари): это проверяет tests/test_serialization.py.
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+# typing.TypedDict pydantic принимает только с Python 3.12.
+from typing_extensions import TypedDict
+
+
+class QuestionRow(TypedDict):
+    """Вопрос в ответах API (QuestionResponse)."""
+
+    id: int
+    text: str
+    created_at: datetime
+    answers_count: int
+
+
+class AnswerRow(TypedDict):
+    """Ответ в ответах API (AnswerResponse)."""
+
+    id: int
+    question_id: int
+    user_id: str
+    text: str
+    created_at: datetime
+
+
+class QuestionPageBody(TypedDict):
+    """Страница списка вопросов (QuestionPage)."""
+
+    items: list[QuestionRow]
+    next_cursor: Optional[str]
+
+
+class QuestionSearchRow(QuestionRow):
+    """Найденный вопрос (QuestionSearchResult)."""
+
+    rank: float
+
+
+class QuestionSearchPageBody(TypedDict):
+    """Страница результатов поиска (QuestionSearchPage)."""
+
+    items: list[QuestionSearchRow]
+    next_cursor: Optional[str]
+
+
+class QuestionWithAnswersBody(QuestionRow):
+    """Вопрос со страницей ответов (QuestionWithAnswers)."""
+
+    answers: list[AnswerRow]
+    answers_next_cursor: Optional[str]
+
+
+class QuestionExportRow(QuestionRow):
+    """Строка выгрузки (QuestionExport)."""
+
+    answers: list[AnswerRow]
+
+
+QUESTION_PAGE = TypeAdapter(QuestionPageBody)
+QUESTION_SEARCH_PAGE = TypeAdapter(QuestionSearchPageBody)
+QUESTION_WITH_ANSWERS = TypeAdapter(QuestionWithAnswersBody)
+QUESTION_EXPORT = TypeAdapter(QuestionExportRow)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-ответ приложения по умолчанию.
+
+    Готовые байты (результат dump_json) отдаются как есть, остальное
+    кодируется pydantic_core.to_json — в несколько раз быстрее json.dumps.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return pydantic_core.to_json(content)
@@ -0,0 +1,112 @@
+"""Объединение одинаковых конкурентных чтений (single-flight).
+
+Когда вопрос становится популярным, сотни одновременных GET
+/questions/{question_id} при промахе кэша выполнили бы один и тот же
+запрос к базе и одинаково закодировали бы JSON. SingleFlight.do выполняет
+загрузку только в первом запросе («ведущем»), а запросы с тем же ключом,
+пришедшие до ее окончания, ждут и получают тот же результат — готовый
+JSON — или то же исключение (например, 404).
+
+Загрузка выполняется в сессии ведущего запроса. Если ведущий запрос
+отменен (клиент отключился), ожидающие не получают ошибку: один из них
+становится ведущим и загружает заново.
+
+Загрузки сгруппированы по ключу кэша (question_key, answer_key). Инвалидация
+кэша (CacheBackend.invalidate) забывает загрузки своих ключей, поэтому
+запрос, пришедший после записи, не присоединится к загрузке, начатой до
+нее. Загрузки свои у каждого воркера.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from prometheus_client import Counter
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_FETCHES = Counter(
+    "singleflight_fetches", "Загрузки, выполненные ведущими запросами", ["name"]
+)
+SINGLEFLIGHT_COALESCED = Counter(
+    "singleflight_coalesced",
+    "Запросы, получившие результат чужой загрузки",
+    ["name"],
+)
+
+
+class LeaderCancelled(Exception):
+    """Ведущий запрос отменен до окончания загрузки."""
+
+
+class SingleFlight:
+    """Одна загрузка на ключ для всех конкурентных запросов."""
+
+    def __init__(self, name: str):
+        self.name = name
+        # Ключ кэша → {ключ загрузки → ее результат}.
+        self._flights: dict[str, dict[Hashable, asyncio.Future]] = {}
+        self._fetches = SINGLEFLIGHT_FETCHES.labels(name)
+        self._coalesced = SINGLEFLIGHT_COALESCED.labels(name)
+        _instances.append(self)
+
+    def in_flight(self) -> int:
+        """Число выполняющихся загрузок."""
+        return sum(len(flights) for flights in self._flights.values())
+
+    async def do(
+        self, group: str, key: Hashable, fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Вернуть результат fetch(), выполнив его один раз на (group, key)."""
+        while True:
+            future = self._flights.get(group, {}).get(key)
+            if future is None:
+                break
+            self._coalesced.inc()
+            try:
+                # shield: отмена ожидающего не должна отменять общую загрузку.
+                return await asyncio.shield(future)
+            except LeaderCancelled:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights.setdefault(group, {})[key] = future
+        self._fetches.inc()
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.set_exception(LeaderCancelled())
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._discard(group, key, future)
+            if future.done() and not future.cancelled():
+                # Без ожидающих asyncio иначе писал бы в лог о непрочитанной ошибке.
+                future.exception()
+
+    def forget(self, *groups: str) -> None:
+        """Не присоединять новые запросы к текущим загрузкам этих ключей."""
+        for group in groups:
+            self._flights.pop(group, None)
+
+    def _discard(self, group: str, key: Hashable, future: asyncio.Future) -> None:
+        flights = self._flights.get(group)
+        # Загрузку могли забыть и начать заново: чужую не удалять.
+        if flights is None or flights.get(key) is not future:
+            return
+        del flights[key]
+        if not flights:
+            del self._flights[group]
+
+
+_instances: list[SingleFlight] = []
+
+
+def forget(*groups: str) -> None:
+    """Забыть загрузки ключей кэша во всех SingleFlight."""
+    for instance in _instances:
+        instance.forget(*groups)
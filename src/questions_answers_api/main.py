@@ -1,15 +1,157 @@
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.responses import RedirectResponse
-from .api import questions_router, answers_router
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import QueuePool
+from .api import questions_router, answers_router, admin_router, export_router
+from .core.admission import AdmissionMiddleware
+from .core.compression import CompressionMiddleware
+from .core.database import DATABASE_URL, SessionLocal, engine
+from .core.health import (
+    HEALTH_CHECK_INTERVAL,
+    HEALTH_CHECK_MIGRATIONS,
+    HealthProber,
+    get_health_prober,
+    migration_heads,
+    readiness,
+    set_health_prober,
+)
+from .core.metrics import MetricsMiddleware, mark_process_dead, render_metrics
+from .core.pool import DB_POOL_LOG_INTERVAL, log_pool_status
+from .core.replicas import ReadYourWritesMiddleware, get_replicas
+from .core.serialization import FastJSONResponse
+from .repositories.question_repository import QuestionRepository
+from .services.answer_batcher import (
+    ANSWER_BATCH_MAX_DELAY_MS,
+    AnswerBatcher,
+    get_answer_batcher,
+    set_answer_batcher,
+)
+
+logger = logging.getLogger(__name__)
+
+# Прогрев воркера перед приемом запросов; включает cli/serve.py.
+APP_WARMUP = os.getenv("APP_WARMUP", "false").lower() in ("1", "true", "yes")
+
+
+async def warm_pool(async_engine) -> int:
+    """Открыть постоянные соединения пула заранее; вернуть их число."""
+    pool = async_engine.pool
+    count = pool.size() if isinstance(pool, QueuePool) else 1
+    async with contextlib.AsyncExitStack() as stack:
+        for _ in range(count):
+            connection = await stack.enter_async_context(async_engine.connect())
+            await connection.execute(text("SELECT 1"))
+    return count
+
+
+async def warm_queries(async_engine) -> None:
+    """Выполнить частые запросы чтения, чтобы SQLAlchemy и драйвер заранее
+    скомпилировали и подготовили их."""
+    async with AsyncSession(async_engine) as db:
+        repo = QuestionRepository(db)
+        await repo.get_page(1)
+        await repo.get_page_by_answers_count(1)
+        await repo.get_version(0)
+        await repo.get_with_answers(0, 1)
+
+
+async def warm_up(app: FastAPI, async_engine, replica_engines=()) -> dict:
+    """Прогреть воркер: схема OpenAPI, соединения с базой и репликами и
+    частые запросы к ним.
+
+    Без прогрева их создают первые запросы воркера, и они отвечают
+    заметно медленнее остальных. Возвращает время этапов в секундах.
+    """
+    started = time.perf_counter()
+    app.openapi()
+    schema_done = time.perf_counter()
+    connections = 0
+    for database in (async_engine, *replica_engines):
+        connections += await warm_pool(database)
+        await warm_queries(database)
+    return {
+        "openapi_s": round(schema_done - started, 3),
+        "database_s": round(time.perf_counter() - schema_done, 3),
+        "connections": connections,
+    }
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Прогреть воркер, запустить фоновую проверку базы для /health/ready,
+    периодическое логирование пула соединений и групповую фиксацию ответов,
+    если они включены.
+
+    При остановке закрыть пулы основной базы и реплик и убрать gauge-метрики
+    воркера из общей суммы.
+    """
+    if APP_WARMUP:
+        replicas = get_replicas()
+        timings = await warm_up(
+            app, engine, replicas.engines if replicas is not None else ()
+        )
+        logger.info("Воркер [%d] прогрет: %s", os.getpid(), timings)
+    if HEALTH_CHECK_INTERVAL > 0:
+        set_health_prober(
+            HealthProber(
+                DATABASE_URL,
+                expected_heads=migration_heads() if HEALTH_CHECK_MIGRATIONS else None,
+            )
+        )
+        await get_health_prober().start()
+    task = None
+    if DB_POOL_LOG_INTERVAL > 0:
+        task = asyncio.create_task(
+            log_pool_status(lambda: engine.pool, DB_POOL_LOG_INTERVAL)
+        )
+    if ANSWER_BATCH_MAX_DELAY_MS > 0:
+        set_answer_batcher(AnswerBatcher(SessionLocal))
+        get_answer_batcher().start()
+    yield
+    batcher = get_answer_batcher()
+    if batcher is not None:
+        await batcher.stop()
+        set_answer_batcher(None)
+    if task is not None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    prober = get_health_prober()
+    if prober is not None:
+        await prober.stop()
+        set_health_prober(None)
+    await engine.dispose()
+    replicas = get_replicas()
+    if replicas is not None:
+        await replicas.dispose()
+    mark_process_dead()
+
 
 app = FastAPI(
     title="Questions & Answers API",
     description="API-сервис для вопросов и ответов",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(questions_router)
 app.include_router(answers_router)
+app.include_router(admin_router)
+app.include_router(export_router)
 
 
 @app.get("/", include_in_schema=False)
@@ -21,9 +163,46 @@ async def root():
 @app.get(
     "/health",
     summary="Проверка здоровья сервиса",
-    description="Эндпоинт для проверки работоспособности API сервиса",
+    description="Эндпоинт для проверки работоспособности API сервиса. Базу не проверяет; для оркестратора — `/health/live` и `/health/ready`.",
     tags=["System"],
 )
 async def health_check():
     """Проверка состояния сервиса."""
     return {"status": "healthy", "message": "API работает нормально"}
+
+
+@app.get(
+    "/health/live",
+    summary="Проверка живости",
+    description="Отвечает 200, пока процесс обслуживает запросы. К базе не обращается: недоступная база не повод перезапускать воркер.",
+    tags=["System"],
+)
+async def liveness():
+    """Проверка живости воркера."""
+    return {"status": "alive"}
+
+
+@app.get(
+    "/health/ready",
+    summary="Проверка готовности",
+    description="200, если воркер может обслуживать запросы, иначе 503. База и ревизия миграций проверяются в фоне раз в `HEALTH_CHECK_INTERVAL` секунд, проба отдает сохраненный результат. Пул соединений проверяется при каждой пробе: исчерпанный пул сразу дает 503, и балансировщик перестает направлять в воркер трафик.",
+    tags=["System"],
+    responses={503: {"description": "Воркер не готов принимать запросы"}},
+)
+async def readiness_check():
+    """Проверка готовности воркера."""
+    checks = readiness(engine.pool)
+    status_code = 200 if checks["status"] == "ready" else 503
+    return FastJSONResponse(checks, status_code=status_code)
+
+
+@app.get(
+    "/metrics",
+    summary="Метрики Prometheus",
+    description="Метрики в текстовом формате Prometheus: время, статусы и размеры HTTP-запросов по маршрутам, количество и время запросов к базе на HTTP-запрос, состояние пула соединений. С несколькими воркерами (`PROMETHEUS_MULTIPROC_DIR`) значения суммируются по всем воркерам.",
+    tags=["System"],
+)
+async def metrics():
+    """Отдать метрики для Prometheus."""
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
@@ -1,4 +1,5 @@
 from .question import Question
 from .answer import Answer
+from . import search  # noqa: F401  регистрирует DDL полнотекстового поиска
 
 __all__ = ["Question", "Answer"]
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
@@ -8,9 +8,15 @@ class Answer(Base):
     """Модель ответа."""
 
     __tablename__ = "answers"
+    __table_args__ = (
+        Index("ix_answers_question_id_created_at", "question_id", "created_at"),
+        Index("ix_answers_user_id_created_at", "user_id", "created_at"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    id = Column(Integer, primary_key=True)
+    question_id = Column(
+        Integer, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False
+    )
     user_id = Column(String, nullable=False)
     text = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
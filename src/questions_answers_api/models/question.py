@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
@@ -8,11 +8,20 @@ class Question(Base):
     """Модель вопроса."""
 
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_created_at_id", "created_at", "id"),
+        Index("ix_questions_answers_count_id", "answers_count", "id"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     text = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    answers_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     answers = relationship(
-        "Answer", back_populates="question", cascade="all, delete-orphan"
+        "Answer",
+        back_populates="question",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
@@ -0,0 +1,58 @@
+"""Объекты полнотекстового поиска, которых нет в моделях SQLAlchemy.
+
+PostgreSQL: вычисляемые столбцы search_vector (tsvector) с GIN-индексами
+в questions и answers. SQLite: таблицы FTS5 questions_fts и answers_fts
+с внешним содержимым, которые синхронизируются триггерами.
+
+Объекты создаются миграцией 9e1f4c7a2b35, а при create_all (в тестах) —
+обработчиками событий ниже; DDL здесь и в миграции должен совпадать.
+"""
+
+from sqlalchemy import DDL, event
+from .answer import Answer
+from .question import Question
+
+# Русский стеммер; слова латиницей конфигурация russian обрабатывает английским.
+SEARCH_CONFIG = "russian"
+
+
+def postgresql_search_ddl(table: str) -> list[str]:
+    """DDL столбца search_vector и его GIN-индекса для таблицы table."""
+    return [
+        f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', text)) STORED",
+        f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)",
+    ]
+
+
+def sqlite_search_ddl(table: str) -> list[str]:
+    """DDL таблицы FTS5 {table}_fts и триггеров ее синхронизации с table."""
+    fts = f"{table}_fts"
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, text) VALUES ('delete', old.id, old.text);"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, text) VALUES (new.id, new.text);"
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(text, content='{table}', "
+        "content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN {insert_new} END",
+        # Срабатывает и при каскадном удалении ответов вместе с вопросом.
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF text ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+for model in (Question, Answer):
+    table = model.__table__
+    for statement in postgresql_search_ddl(table.name):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+    for statement in sqlite_search_ddl(table.name):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        table,
+        "after_drop",
+        DDL(f"DROP TABLE IF EXISTS {table.name}_fts").execute_if(dialect="sqlite"),
+    )
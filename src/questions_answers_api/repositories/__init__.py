@@ -2,5 +2,6 @@
 
 from .question_repository import QuestionRepository
 from .answer_repository import AnswerRepository
+from .import_repository import ImportRepository
 
-__all__ = ["QuestionRepository", "AnswerRepository"]
+__all__ = ["QuestionRepository", "AnswerRepository", "ImportRepository"]
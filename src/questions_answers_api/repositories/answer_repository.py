@@ -1,36 +1,153 @@
+from collections import Counter
+from datetime import datetime
 from typing import Optional
-from sqlalchemy.orm import Session
-from ..models import Answer
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.database import is_foreign_key_violation
+from ..models import Answer, Question
 
 
 class AnswerRepository:
     """Репозиторий для работы с ответами в базе данных."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """Инициализация репозитория."""
         self.db = db
 
-    def get_by_id(self, answer_id: int) -> Optional[Answer]:
+    async def get_by_id(self, answer_id: int) -> Optional[Answer]:
         """Получить ответ по ID."""
-        return self.db.query(Answer).filter(Answer.id == answer_id).first()
+        return await self.db.get(Answer, answer_id)
 
-    def get_by_question_id(self, question_id: int) -> list[Answer]:
+    async def get_by_question_id(self, question_id: int) -> list[Answer]:
         """Получить все ответы для вопроса."""
-        return self.db.query(Answer).filter(Answer.question_id == question_id).all()
-
-    def create(self, question_id: int, user_id: str, text: str) -> Answer:
-        """Создать новый ответ."""
-        answer = Answer(question_id=question_id, user_id=user_id, text=text)
-        self.db.add(answer)
-        self.db.commit()
-        self.db.refresh(answer)
+        result = await self.db.execute(
+            select(Answer).where(Answer.question_id == question_id)
+        )
+        return list(result.scalars().all())
+
+    async def create(
+        self, question_id: int, user_id: str, text: str
+    ) -> Optional[Answer]:
+        """Создать ответ одним INSERT ... RETURNING (None, если вопроса нет).
+
+        Существование вопроса проверяет внешний ключ, а не отдельный SELECT:
+        вопрос, удаленный между проверкой и вставкой, тоже дает None.
+        """
+        try:
+            answer = await self.db.scalar(
+                insert(Answer)
+                .values(question_id=question_id, user_id=user_id, text=text)
+                .returning(Answer)
+            )
+        except IntegrityError as exc:
+            await self.db.rollback()
+            if is_foreign_key_violation(exc):
+                return None
+            raise
+        await self._update_question(question_id, 1)
+        await self.db.commit()
         return answer
 
-    def delete(self, answer: Answer) -> None:
-        """Удалить ответ."""
-        self.db.delete(answer)
-        self.db.commit()
+    async def create_many(
+        self, question_id: int, items: list[tuple[str, str]]
+    ) -> Optional[list[Answer]]:
+        """Создать несколько ответов к вопросу одним INSERT ... RETURNING.
+
+        None, если вопроса нет: как и в create, это проверяет внешний ключ.
+        """
+        try:
+            result = await self.db.scalars(
+                insert(Answer).returning(Answer, sort_by_parameter_order=True),
+                [
+                    {"question_id": question_id, "user_id": user_id, "text": text}
+                    for user_id, text in items
+                ],
+            )
+        except IntegrityError as exc:
+            await self.db.rollback()
+            if is_foreign_key_violation(exc):
+                return None
+            raise
+        answers = list(result.all())
+        await self._update_question(question_id, len(answers))
+        await self.db.commit()
+        return answers
+
+    async def create_batch(self, items: list[tuple[int, str, str]]) -> list[Answer]:
+        """Создать ответы к разным вопросам в одной транзакции.
+
+        items — (question_id, user_id, text); ответы вставляются одним
+        INSERT ... RETURNING в порядке items, счетчики вопросов меняются одним
+        UPDATE на каждый вопрос. Если какого-то вопроса нет, вся пачка
+        откатывается и IntegrityError передается вызывающему.
 
-    def exists(self, answer_id: int) -> bool:
+        Вопросы обновляются в порядке ID: пачки разных воркеров блокируют
+        общие строки questions в одном порядке и не попадают во
+        взаимоблокировку.
+        """
+        result = await self.db.scalars(
+            insert(Answer).returning(Answer, sort_by_parameter_order=True),
+            [
+                {"question_id": question_id, "user_id": user_id, "text": text}
+                for question_id, user_id, text in items
+            ],
+        )
+        answers = list(result.all())
+        questions = Question.__table__
+        await self.db.execute(
+            update(questions)
+            .where(questions.c.id == bindparam("target_id"))
+            .values(
+                version=questions.c.version + 1,
+                answers_count=questions.c.answers_count + bindparam("delta"),
+            ),
+            [
+                {"target_id": question_id, "delta": delta}
+                for question_id, delta in sorted(
+                    Counter(item[0] for item in items).items()
+                )
+            ],
+        )
+        await self.db.commit()
+        return answers
+
+    async def delete_by_id(self, answer_id: int) -> Optional[int]:
+        """Удалить ответ одним DELETE и вернуть ID его вопроса (None, если ответа нет)."""
+        result = await self.db.execute(
+            delete(Answer)
+            .where(Answer.id == answer_id)
+            .returning(Answer.question_id)
+            .execution_options(synchronize_session=False)
+        )
+        question_id = result.scalar_one_or_none()
+        if question_id is not None:
+            await self._update_question(question_id, -1)
+        await self.db.commit()
+        return question_id
+
+    async def get_created_at(self, answer_id: int) -> Optional[datetime]:
+        """Получить время создания ответа (None, если ответа нет)."""
+        return await self.db.scalar(
+            select(Answer.created_at).where(Answer.id == answer_id)
+        )
+
+    async def exists(self, answer_id: int) -> bool:
         """Проверить существование ответа."""
-        return self.db.query(Answer).filter(Answer.id == answer_id).first() is not None
+        result = await self.db.execute(select(Answer.id).where(Answer.id == answer_id))
+        return result.first() is not None
+
+    async def _update_question(self, question_id: int, answers_delta: int) -> None:
+        """Изменить счетчик ответов и увеличить версию вопроса (для ETag).
+
+        Выполняется в транзакции записи ответов одним атомарным UPDATE.
+        """
+        await self.db.execute(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(
+                version=Question.version + 1,
+                answers_count=Question.answers_count + answers_delta,
+            )
+            .execution_options(synchronize_session=False)
+        )
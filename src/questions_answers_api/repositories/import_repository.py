@@ -0,0 +1,133 @@
+from typing import Any, Sequence
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    bindparam,
+    func,
+    insert,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Answer, Question
+
+# Соответствие исходных ID вопросов новым; временная таблица живет, пока
+# открыто соединение, поэтому импорт выполняется в одном соединении.
+question_id_map = Table(
+    "import_question_ids",
+    MetaData(),
+    Column("source_id", String, primary_key=True),
+    Column("id", Integer, nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
+
+class ImportRepository:
+    """Репозиторий массовой загрузки данных.
+
+    В PostgreSQL строки пишутся через COPY, в остальных СУБД — пакетным
+    executemany. Транзакцией управляет вызывающий код.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Инициализация репозитория."""
+        self.db = db
+
+    @property
+    def is_postgresql(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    async def reserve_question_ids(self, count: int) -> list[int]:
+        """Выделить ID для count новых вопросов."""
+        if self.is_postgresql:
+            result = await self.db.execute(
+                text(
+                    "SELECT nextval(pg_get_serial_sequence('questions', 'id')) "
+                    "FROM generate_series(1, :count)"
+                ),
+                {"count": count},
+            )
+            return list(result.scalars().all())
+        # В SQLite ID выделяются после максимального, поэтому max(id) читается
+        # под блокировкой записи: до фиксации транзакции их не займет никто
+        # другой. Драйвер сам начинает транзакцию только перед первым
+        # изменением, так что блокировка берется явно.
+        await self._begin_immediate()
+        last_id = await self.db.scalar(select(func.coalesce(func.max(Question.id), 0)))
+        return list(range(last_id + 1, last_id + count + 1))
+
+    async def write_questions(self, rows: Sequence[tuple[int, str, Any, int]]) -> None:
+        """Записать вопросы (id, text, created_at, answers_count)."""
+        await self._write(
+            Question.__table__, ("id", "text", "created_at", "answers_count"), rows
+        )
+
+    async def write_answers(self, rows: Sequence[tuple[int, str, str, Any]]) -> None:
+        """Записать ответы (question_id, user_id, text, created_at)."""
+        await self._write(
+            Answer.__table__, ("question_id", "user_id", "text", "created_at"), rows
+        )
+
+    async def add_answers_counts(self, counts: dict[int, int]) -> None:
+        """Увеличить answers_count (и версию) вопросов: {ID: число новых ответов}."""
+        if not counts:
+            return
+        # Таблица, а не модель: executemany, а не ORM-обновление по ключу.
+        questions = Question.__table__
+        await self.db.execute(
+            update(questions)
+            .where(questions.c.id == bindparam("question_id"))
+            .values(
+                answers_count=questions.c.answers_count + bindparam("delta"),
+                version=questions.c.version + 1,
+            ),
+            [
+                {"question_id": question_id, "delta": delta}
+                for question_id, delta in counts.items()
+            ],
+        )
+
+    async def create_id_map(self) -> None:
+        """Создать временную таблицу соответствия исходных и новых ID вопросов."""
+        connection = await self.db.connection()
+        await connection.run_sync(question_id_map.create, checkfirst=True)
+
+    async def save_id_map(self, pairs: Sequence[tuple[str, int]]) -> None:
+        """Сохранить пары (исходный ID, новый ID)."""
+        await self._write(question_id_map, ("source_id", "id"), pairs)
+
+    async def get_id_map(self, source_ids: Sequence[str]) -> dict[str, int]:
+        """Получить новые ID вопросов по исходным."""
+        result = await self.db.execute(
+            select(question_id_map.c.source_id, question_id_map.c.id).where(
+                question_id_map.c.source_id.in_(source_ids)
+            )
+        )
+        return dict(result.tuples().all())
+
+    async def _begin_immediate(self) -> None:
+        """Начать транзакцию SQLite с блокировкой записи, если она еще не начата.
+
+        Драйвер начинает транзакцию перед первым изменением, поэтому открытая
+        транзакция уже держит блокировку записи.
+        """
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        if not raw.driver_connection.in_transaction:
+            await self.db.execute(text("BEGIN IMMEDIATE"))
+
+    async def _write(self, table: Table, columns: Sequence[str], rows) -> None:
+        if not rows:
+            return
+        if self.is_postgresql:
+            connection = await self.db.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                table.name, records=rows, columns=list(columns)
+            )
+            return
+        await self.db.execute(insert(table), [dict(zip(columns, row)) for row in rows])
@@ -1,39 +1,344 @@
-from typing import Optional
-from sqlalchemy.orm import Session
-from ..models import Question
+import re
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy import (
+    Float,
+    Integer,
+    and_,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Answer, Question
+from ..models.search import SEARCH_CONFIG
+
+# Совпадение в ответе весит меньше, чем совпадение в тексте вопроса.
+ANSWER_MATCH_WEIGHT = 0.5
+
+# Чтения для ответов API возвращают словари из этих столбцов, а не объекты
+# ORM: создание объектов с identity map дороже самого запроса, а ответ
+# кодируется из словарей напрямую (core/serialization.py).
+QUESTION_COLUMNS = (
+    Question.id,
+    Question.text,
+    Question.created_at,
+    Question.answers_count,
+    Question.version,
+)
 
 
 class QuestionRepository:
     """Репозиторий для работы с вопросами в базе данных."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """Инициализация репозитория."""
         self.db = db
 
-    def get_all(self) -> list[Question]:
-        """Получить все вопросы."""
-        return self.db.query(Question).all()
+    async def get_page(
+        self, limit: int, after: Optional[tuple[datetime, int]] = None
+    ) -> list[dict]:
+        """Получить страницу вопросов, упорядоченных по (created_at, id)."""
+        query = select(*QUESTION_COLUMNS).order_by(Question.created_at, Question.id)
+        if after is not None:
+            query = query.where(tuple_(Question.created_at, Question.id) > after)
+        result = await self.db.execute(query.limit(limit))
+        return [row._asdict() for row in result]
 
-    def get_by_id(self, question_id: int) -> Optional[Question]:
+    async def get_page_by_answers_count(
+        self, limit: int, after: Optional[tuple[int, int]] = None
+    ) -> list[dict]:
+        """Получить страницу вопросов по убыванию (answers_count, id)."""
+        query = select(*QUESTION_COLUMNS).order_by(
+            Question.answers_count.desc(), Question.id.desc()
+        )
+        if after is not None:
+            query = query.where(tuple_(Question.answers_count, Question.id) < after)
+        result = await self.db.execute(query.limit(limit))
+        return [row._asdict() for row in result]
+
+    async def get_by_id(self, question_id: int) -> Optional[Question]:
         """Получить вопрос по ID."""
-        return self.db.query(Question).filter(Question.id == question_id).first()
-
-    def create(self, text: str) -> Question:
-        """Создать новый вопрос."""
-        question = Question(text=text)
-        self.db.add(question)
-        self.db.commit()
-        self.db.refresh(question)
+        return await self.db.get(Question, question_id)
+
+    async def get_version(self, question_id: int) -> Optional[tuple[int, datetime]]:
+        """Получить версию и время создания вопроса без загрузки ответов."""
+        result = await self.db.execute(
+            select(Question.version, Question.created_at).where(
+                Question.id == question_id
+            )
+        )
+        return result.tuples().one_or_none()
+
+    async def get_with_answers(
+        self,
+        question_id: int,
+        answers_limit: int,
+        answers_after: Optional[tuple[datetime, int]] = None,
+    ) -> Optional[tuple[dict, list[dict]]]:
+        """Получить вопрос и страницу его ответов одним запросом."""
+        join_condition = Answer.question_id == Question.id
+        if answers_after is not None:
+            join_condition = and_(
+                join_condition, tuple_(Answer.created_at, Answer.id) > answers_after
+            )
+        result = await self.db.execute(
+            select(
+                *QUESTION_COLUMNS,
+                Answer.id.label("answer_id"),
+                Answer.user_id,
+                Answer.text.label("answer_text"),
+                Answer.created_at.label("answer_created_at"),
+            )
+            .outerjoin(Answer, join_condition)
+            .where(Question.id == question_id)
+            .order_by(Answer.created_at, Answer.id)
+            .limit(answers_limit)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        first = rows[0]
+        question = {
+            column.key: getattr(first, column.key) for column in QUESTION_COLUMNS
+        }
+        answers = [
+            {
+                "id": row.answer_id,
+                "question_id": question_id,
+                "user_id": row.user_id,
+                "text": row.answer_text,
+                "created_at": row.answer_created_at,
+            }
+            for row in rows
+            if row.answer_id is not None
+        ]
+        return question, answers
+
+    async def stream_with_answers(self, batch_size: int) -> AsyncIterator[dict]:
+        """Потоково перебрать все вопросы с ответами в порядке ID вопроса.
+
+        Строки читаются серверным курсором пачками по batch_size, в памяти
+        одновременно находятся только текущая пачка и ответы одного вопроса.
+        Вопросы возвращаются словарями с ключом answers: выгрузка только
+        читает данные, и объекты ORM с identity map для нее лишние.
+        """
+        result = await self.db.stream(
+            select(
+                Question.id,
+                Question.text,
+                Question.created_at,
+                Answer.id.label("answer_id"),
+                Answer.user_id,
+                Answer.text.label("answer_text"),
+                Answer.created_at.label("answer_created_at"),
+            )
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .order_by(Question.id, Answer.created_at, Answer.id)
+            .execution_options(yield_per=batch_size)
+        )
+        current = None
+        # Пачками, а не по строке: каждое чтение из AsyncResult — переключение
+        # greenlet, и построчный перебор в разы медленнее.
+        async for partition in result.partitions():
+            for row in partition:
+                if current is None or row.id != current["id"]:
+                    if current is not None:
+                        yield current
+                    current = {
+                        "id": row.id,
+                        "text": row.text,
+                        "created_at": row.created_at,
+                        "answers_count": 0,
+                        "answers": [],
+                    }
+                if row.answer_id is not None:
+                    current["answers_count"] += 1
+                    current["answers"].append(
+                        {
+                            "id": row.answer_id,
+                            "question_id": row.id,
+                            "user_id": row.user_id,
+                            "text": row.answer_text,
+                            "created_at": row.answer_created_at,
+                        }
+                    )
+        if current is not None:
+            yield current
+
+    async def search(
+        self, query: str, limit: int, after: Optional[tuple[float, int]] = None
+    ) -> list[dict]:
+        """Найти вопросы по тексту вопроса и ответов.
+
+        Возвращает вопросы с релевантностью rank по убыванию релевантности,
+        при равной релевантности — по ID. Кандидатов находит полнотекстовый
+        индекс, поэтому время не зависит от общего числа вопросов.
+        """
+        is_postgresql = self.db.get_bind().dialect.name == "postgresql"
+        matches = self._search_matches(query, is_postgresql)
+        if matches is None:
+            return []
+        if is_postgresql:
+            # Обобщенный план подготовленного запроса не знает tsquery и
+            # переоценивает число совпадений (вплоть до параллельного плана);
+            # план под конкретный запрос дешевле. Действует до конца транзакции.
+            await self.db.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+        matches = matches.subquery("matches")
+        ranked = (
+            select(matches.c.question_id, func.max(matches.c.rank).label("rank"))
+            .group_by(matches.c.question_id)
+            .subquery("ranked")
+        )
+        statement = select(*QUESTION_COLUMNS, ranked.c.rank).join(
+            ranked, ranked.c.question_id == Question.id
+        )
+        if after is not None:
+            rank, question_id = after
+            statement = statement.where(
+                or_(
+                    ranked.c.rank < rank,
+                    and_(ranked.c.rank == rank, Question.id > question_id),
+                )
+            )
+        result = await self.db.execute(
+            statement.order_by(ranked.c.rank.desc(), Question.id).limit(limit)
+        )
+        return [row._asdict() for row in result]
+
+    def _search_matches(self, query: str, is_postgresql: bool):
+        """Запрос совпадений (question_id, rank) в вопросах и ответах."""
+        if is_postgresql:
+            sql = f"""
+                SELECT id AS question_id, ts_rank(search_vector, query)::float8 AS rank
+                FROM questions, websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS query
+                WHERE search_vector @@ query
+                UNION ALL
+                SELECT question_id, ts_rank(search_vector, query)::float8 * :weight
+                FROM answers, websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS query
+                WHERE search_vector @@ query
+            """
+        else:
+            # Слова запроса берутся в кавычки, чтобы синтаксис FTS5 (AND, *,
+            # скобки) во вводе пользователя не ломал запрос.
+            words = re.findall(r"\w+", query)
+            if not words:
+                return None
+            query = " ".join(f'"{word}"' for word in words)
+            sql = """
+                SELECT rowid AS question_id, -bm25(questions_fts) AS rank
+                FROM questions_fts WHERE questions_fts MATCH :query
+                UNION ALL
+                SELECT answers.question_id, -bm25(answers_fts) * :weight
+                FROM answers_fts JOIN answers ON answers.id = answers_fts.rowid
+                WHERE answers_fts MATCH :query
+            """
+        return (
+            text(sql)
+            .bindparams(query=query, weight=ANSWER_MATCH_WEIGHT)
+            .columns(question_id=Integer, rank=Float)
+        )
+
+    async def create(self, text: str) -> Question:
+        """Создать новый вопрос одним INSERT ... RETURNING, без перечитывания."""
+        question = await self.db.scalar(
+            insert(Question).values(text=text).returning(Question)
+        )
+        await self.db.commit()
         return question
 
-    def delete(self, question: Question) -> None:
-        """Удалить вопрос."""
-        self.db.delete(question)
-        self.db.commit()
+    async def create_many(self, texts: list[str]) -> list[Question]:
+        """Создать несколько вопросов одним INSERT ... RETURNING."""
+        result = await self.db.scalars(
+            insert(Question).returning(Question, sort_by_parameter_order=True),
+            [{"text": text} for text in texts],
+        )
+        questions = list(result.all())
+        await self.db.commit()
+        return questions
+
+    async def delete_by_id(self, question_id: int) -> bool:
+        """Удалить вопрос одним DELETE; ответы удаляет ON DELETE CASCADE."""
+        deleted = await self.delete_by_ids([question_id])
+        return bool(deleted)
 
-    def exists(self, question_id: int) -> bool:
+    async def delete_by_ids(self, question_ids: list[int]) -> list[int]:
+        """Удалить вопросы по списку ID одним DELETE и вернуть удаленные ID."""
+        result = await self.db.execute(
+            delete(Question)
+            .where(Question.id.in_(question_ids))
+            .returning(Question.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = list(result.scalars().all())
+        await self.db.commit()
+        return deleted
+
+    async def delete_created_before(self, before: datetime, limit: int) -> list[int]:
+        """Удалить не более limit самых старых вопросов, созданных до before."""
+        oldest = (
+            select(Question.id)
+            .where(Question.created_at < before)
+            .order_by(Question.created_at, Question.id)
+            .limit(limit)
+        )
+        result = await self.db.execute(
+            delete(Question)
+            .where(Question.id.in_(oldest.scalar_subquery()))
+            .returning(Question.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = list(result.scalars().all())
+        await self.db.commit()
+        return deleted
+
+    async def reconcile_answers_counts(
+        self, after_id: int, limit: int
+    ) -> tuple[list[int], list[int]]:
+        """Пересчитать answers_count у не более limit вопросов с ID > after_id.
+
+        Исправляет только расходящиеся счетчики (и увеличивает их версию).
+        Возвращает ID проверенных и ID исправленных вопросов.
+        """
+        # Блокировка строк дожидается транзакций записи ответов, уже
+        # изменивших счетчик, и задерживает новые до фиксации пересчета:
+        # иначе UPDATE может посчитать ответы по снимку без их изменений.
+        ids = list(
+            await self.db.scalars(
+                select(Question.id)
+                .where(Question.id > after_id)
+                .order_by(Question.id)
+                .limit(limit)
+                .with_for_update()
+            )
+        )
+        if not ids:
+            return [], []
+
+        actual = (
+            select(func.count(Answer.id))
+            .where(Answer.question_id == Question.id)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(Question)
+            .where(Question.id.in_(ids), Question.answers_count != actual)
+            .values(answers_count=actual, version=Question.version + 1)
+            .returning(Question.id)
+            .execution_options(synchronize_session=False)
+        )
+        fixed = list(result.scalars().all())
+        await self.db.commit()
+        return ids, fixed
+
+    async def exists(self, question_id: int) -> bool:
         """Проверить существование вопроса."""
-        return (
-            self.db.query(Question).filter(Question.id == question_id).first()
-            is not None
+        result = await self.db.execute(
+            select(Question.id).where(Question.id == question_id)
         )
+        return result.first() is not None
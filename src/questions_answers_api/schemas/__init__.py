@@ -1,16 +1,60 @@
-from .answer import AnswerCreate, AnswerResponse
+from .admin import (
+    AnswersCountReconcile,
+    AnswersCountReconcileResult,
+    CacheStatsResponse,
+    PoolStatsResponse,
+    QuestionPurge,
+    QuestionPurgeResult,
+)
+from .answer import (
+    AnswerBulkCreate,
+    AnswerBulkResult,
+    AnswerCreate,
+    AnswerImport,
+    AnswerResponse,
+)
+from .bulk import BulkItemError, BulkMode
 from .question import (
+    QuestionBulkCreate,
+    QuestionBulkResult,
     QuestionCreate,
+    QuestionExport,
+    QuestionImport,
+    QuestionPage,
     QuestionResponse,
+    QuestionSearchPage,
+    QuestionSearchResult,
+    QuestionSort,
     QuestionWithAnswers,
 )
 
 QuestionWithAnswers.model_rebuild()
+QuestionExport.model_rebuild()
+QuestionImport.model_rebuild()
 
 __all__ = [
+    "AnswersCountReconcile",
+    "AnswersCountReconcileResult",
+    "CacheStatsResponse",
+    "PoolStatsResponse",
+    "BulkItemError",
+    "BulkMode",
+    "QuestionBulkCreate",
+    "QuestionBulkResult",
     "QuestionCreate",
+    "QuestionExport",
+    "QuestionImport",
+    "QuestionPage",
+    "QuestionPurge",
+    "QuestionPurgeResult",
     "QuestionResponse",
+    "QuestionSearchPage",
+    "QuestionSearchResult",
+    "QuestionSort",
     "QuestionWithAnswers",
+    "AnswerBulkCreate",
+    "AnswerBulkResult",
     "AnswerCreate",
+    "AnswerImport",
     "AnswerResponse",
 ]
@@ -0,0 +1,96 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+MAX_PURGE_BATCH_SIZE = 5000
+MAX_PURGE_IDS = 100_000
+MAX_RECONCILE_BATCH_SIZE = 10_000
+
+
+class QuestionPurge(BaseModel):
+    """Схема массового удаления вопросов."""
+
+    ids: Optional[list[int]] = Field(
+        None, min_length=1, max_length=MAX_PURGE_IDS, description="ID вопросов"
+    )
+    older_than: Optional[datetime] = Field(
+        None, description="Удалить вопросы, созданные раньше этого момента (UTC)"
+    )
+    batch_size: int = Field(
+        500,
+        ge=1,
+        le=MAX_PURGE_BATCH_SIZE,
+        description="Количество вопросов, удаляемых одной транзакцией",
+    )
+
+    @field_validator("older_than")
+    @classmethod
+    def validate_older_than(cls, v: Optional[datetime]) -> Optional[datetime]:
+        # В базе время хранится наивным UTC: смещение нужно учесть здесь,
+        # иначе SQLite его молча отбросит, а asyncpg откажется сравнивать.
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+    @model_validator(mode="after")
+    def validate_criteria(self) -> "QuestionPurge":
+        if (self.ids is None) == (self.older_than is None):
+            raise ValueError("Нужно указать ровно один критерий: ids или older_than")
+        return self
+
+
+class QuestionPurgeResult(BaseModel):
+    """Результат массового удаления вопросов."""
+
+    deleted: int = Field(..., description="Количество удаленных вопросов")
+    batches: int = Field(..., description="Количество выполненных пачек")
+
+
+class AnswersCountReconcile(BaseModel):
+    """Схема пересчета счетчиков ответов."""
+
+    batch_size: int = Field(
+        1000,
+        ge=1,
+        le=MAX_RECONCILE_BATCH_SIZE,
+        description="Количество вопросов, проверяемых одной транзакцией",
+    )
+
+
+class AnswersCountReconcileResult(BaseModel):
+    """Результат пересчета счетчиков ответов."""
+
+    checked: int = Field(..., description="Количество проверенных вопросов")
+    fixed: int = Field(..., description="Количество исправленных счетчиков")
+    batches: int = Field(..., description="Количество выполненных пачек")
+
+
+class CacheStatsResponse(BaseModel):
+    """Статистика кэша чтения."""
+
+    backend: str = Field(..., description="Бэкенд кэша: none, memory или redis")
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+class PoolStatsResponse(BaseModel):
+    """Состояние пула соединений с базой данных."""
+
+    pool_class: str = Field(..., description="Класс пула SQLAlchemy")
+    size: Optional[int] = Field(None, description="Постоянный размер пула")
+    checked_in: Optional[int] = Field(None, description="Свободные соединения")
+    checked_out: Optional[int] = Field(None, description="Выданные соединения")
+    overflow: Optional[int] = Field(None, description="Соединения сверх size")
+    max_overflow: Optional[int] = None
+    timeout: Optional[float] = Field(None, description="Таймаут ожидания, с")
+    waits: int = Field(0, description="Количество выдач соединений")
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    timeouts: int = Field(0, description="Количество таймаутов ожидания")
+    wait_histogram: dict[str, int] = Field(
+        default_factory=dict,
+        description="Накопительная гистограмма ожидания: граница в секундах → количество",
+    )
@@ -1,6 +1,8 @@
 from datetime import datetime
+from typing import Optional, Union
 
 from pydantic import BaseModel, Field, field_validator
+from .bulk import BulkCreateBase, BulkItemError
 
 
 class AnswerBase(BaseModel):
@@ -32,6 +34,15 @@ class AnswerCreate(AnswerBase):
     pass
 
 
+class AnswerImport(AnswerCreate):
+    """Схема ответа при импорте: ссылка на исходный ID вопроса и дата создания."""
+
+    question_id: Optional[Union[int, str]] = Field(
+        None, description="ID вопроса в исходных данных"
+    )
+    created_at: Optional[datetime] = None
+
+
 class AnswerResponse(AnswerBase):
     """Схема ответа с ответом."""
 
@@ -41,3 +52,16 @@ class AnswerResponse(AnswerBase):
 
     class Config:
         from_attributes = True
+
+
+class AnswerBulkCreate(BulkCreateBase):
+    """Схема для массового создания ответов (элементы в формате AnswerCreate)."""
+
+    pass
+
+
+class AnswerBulkResult(BaseModel):
+    """Результат массового создания ответов."""
+
+    created: list[AnswerResponse]
+    errors: list[BulkItemError] = []
@@ -0,0 +1,36 @@
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+MAX_BULK_SIZE = 1000
+
+
+class BulkMode(str, Enum):
+    """Режим обработки ошибок при массовом создании."""
+
+    ATOMIC = "atomic"
+    PARTIAL = "partial"
+
+
+class BulkItemError(BaseModel):
+    """Ошибка валидации одного элемента массового запроса."""
+
+    index: int = Field(..., description="Позиция элемента в списке items")
+    errors: list[dict[str, Any]] = Field(..., description="Ошибки валидации")
+
+
+class BulkCreateBase(BaseModel):
+    """Базовая схема массового создания."""
+
+    items: list[Any] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BULK_SIZE,
+        description="Элементы для создания, валидируются по одному",
+    )
+    mode: BulkMode = Field(
+        BulkMode.ATOMIC,
+        description="atomic — при любой ошибке ничего не создается; "
+        "partial — создаются только валидные элементы",
+    )
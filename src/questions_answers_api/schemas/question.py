@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from enum import Enum
+from typing import TYPE_CHECKING, Optional, Union
 from pydantic import BaseModel, Field, field_validator
+from .bulk import BulkCreateBase, BulkItemError
 
 if TYPE_CHECKING:
-    from .answer import AnswerResponse
+    from .answer import AnswerImport, AnswerResponse
 
 
 class QuestionBase(BaseModel):
@@ -25,20 +27,83 @@ class QuestionCreate(QuestionBase):
     pass
 
 
+class QuestionImport(QuestionCreate):
+    """Схема вопроса при импорте: исходный ID, дата создания и ответы."""
+
+    id: Optional[Union[int, str]] = Field(None, description="ID в исходных данных")
+    created_at: Optional[datetime] = None
+    answers: list["AnswerImport"] = []
+
+
 class QuestionResponse(QuestionBase):
     """Схема ответа с вопросом."""
 
     id: int
     created_at: datetime
+    answers_count: int = Field(..., description="Количество ответов")
 
     class Config:
         from_attributes = True
 
 
+class QuestionBulkCreate(BulkCreateBase):
+    """Схема для массового создания вопросов (элементы в формате QuestionCreate)."""
+
+    pass
+
+
+class QuestionBulkResult(BaseModel):
+    """Результат массового создания вопросов."""
+
+    created: list[QuestionResponse]
+    errors: list[BulkItemError] = []
+
+
+class QuestionSort(str, Enum):
+    """Порядок списка вопросов."""
+
+    CREATED_AT = "created_at"
+    ANSWERS_COUNT = "answers_count"
+
+
+class QuestionPage(BaseModel):
+    """Схема страницы списка вопросов."""
+
+    items: list[QuestionResponse]
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы или null, если страниц больше нет"
+    )
+
+
+class QuestionSearchResult(QuestionResponse):
+    """Схема найденного вопроса."""
+
+    rank: float = Field(..., description="Релевантность, чем больше, тем лучше")
+
+
+class QuestionSearchPage(BaseModel):
+    """Схема страницы результатов поиска."""
+
+    items: list[QuestionSearchResult]
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы или null, если страниц больше нет"
+    )
+
+
 class QuestionWithAnswers(QuestionResponse):
     """Схема вопроса с ответами."""
 
     answers: list["AnswerResponse"] = []
+    answers_next_cursor: Optional[str] = Field(
+        None,
+        description="Курсор следующей страницы ответов или null, если ответов больше нет",
+    )
 
     class Config:
         from_attributes = True
+
+
+class QuestionExport(QuestionResponse):
+    """Схема строки экспорта: вопрос со всеми ответами."""
+
+    answers: list["AnswerResponse"] = []
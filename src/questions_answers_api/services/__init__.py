@@ -2,5 +2,6 @@
 
 from .question_service import QuestionService
 from .answer_service import AnswerService
+from .import_service import ImportService
 
-__all__ = ["QuestionService", "AnswerService"]
+__all__ = ["QuestionService", "AnswerService", "ImportService"]
@@ -0,0 +1,209 @@
+"""Групповая фиксация ответов: много POST-запросов — одна транзакция.
+
+При ANSWER_BATCH_MAX_DELAY_MS > 0 ответы, создаваемые конкурентно, не
+фиксируются каждый своей транзакцией, а ставятся в очередь. Фоновая задача
+забирает из нее до ANSWER_BATCH_MAX_ROWS ответов, накопившихся за
+ANSWER_BATCH_MAX_DELAY_MS, и записывает их одним INSERT ... RETURNING
+в одной транзакции (AnswerRepository.create_batch): один COMMIT и один
+fsync на пачку вместо одного на ответ.
+
+Надежность та же, что без группировки: запрос получает 201 только после
+COMMIT транзакции, в которую попал его ответ. Если процесс упадет раньше,
+потеряются только ответы, о создании которых клиентам еще не сообщили.
+Цена — задержка до ANSWER_BATCH_MAX_DELAY_MS на запрос.
+
+Если в пачке есть ответ к несуществующему вопросу, транзакция откатывается
+и ответы пачки записываются по одному, чтобы каждый запрос получил свой
+результат (ответ или 404). Пачка, откаченная из-за взаимоблокировки или
+ошибки сериализации, повторяется один раз. Прочие ошибки базы получают все
+запросы пачки.
+
+Очередь ограничена ANSWER_BATCH_MAX_QUEUE ответами. Когда она заполнена,
+новые запросы сразу получают 503 с Retry-After, а не ждут: база и так не
+успевает за входящим потоком. Очередь своя у каждого воркера.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from fastapi import HTTPException, status
+from prometheus_client import Histogram
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
+from ..core.database import is_transaction_conflict
+
+from ..models import Answer
+from ..repositories.answer_repository import AnswerRepository
+
+logger = logging.getLogger(__name__)
+
+ANSWER_BATCH_MAX_DELAY_MS = float(os.getenv("ANSWER_BATCH_MAX_DELAY_MS", "0"))
+ANSWER_BATCH_MAX_ROWS = int(os.getenv("ANSWER_BATCH_MAX_ROWS", "500"))
+ANSWER_BATCH_MAX_QUEUE = int(os.getenv("ANSWER_BATCH_MAX_QUEUE", "10000"))
+# Повторов пачки после взаимоблокировки или ошибки сериализации.
+BATCH_CONFLICT_RETRIES = 1
+
+BATCH_ROWS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+BATCH_ROWS = Histogram(
+    "answer_batch_rows",
+    "Ответов в одной транзакции групповой фиксации",
+    buckets=BATCH_ROWS_BUCKETS,
+)
+
+Item = tuple[int, str, str]
+Pending = tuple[Item, asyncio.Future]
+
+
+class AnswerBatcher:
+    """Очередь создания ответов с групповой фиксацией."""
+
+    def __init__(
+        self,
+        sessions,
+        max_delay: float = ANSWER_BATCH_MAX_DELAY_MS / 1000,
+        max_rows: int = ANSWER_BATCH_MAX_ROWS,
+        max_queue: int = ANSWER_BATCH_MAX_QUEUE,
+    ):
+        self.sessions = sessions
+        self.max_delay = max_delay
+        self.max_rows = max_rows
+        self._queue: asyncio.Queue[Pending] = asyncio.Queue(max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def start(self) -> None:
+        """Запустить фоновую запись пачек."""
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Перестать принимать ответы, записать очередь и остановиться."""
+        self._closing = True
+        await self._queue.join()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(
+        self, question_id: int, user_id: str, text: str
+    ) -> Optional[Answer]:
+        """Поставить ответ в очередь и дождаться фиксации его пачки.
+
+        Возвращает созданный ответ или None, если вопроса нет.
+        """
+        if self._closing or self._task is None:
+            raise self._unavailable()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(((question_id, user_id, text), future))
+        except asyncio.QueueFull:
+            raise self._unavailable()
+        return await future
+
+    @staticmethod
+    def _unavailable() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Очередь записи ответов переполнена, повторите запрос позже",
+            headers={"Retry-After": "1"},
+        )
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            try:
+                await self._flush(batch)
+            except Exception as exc:
+                logger.exception("Ошибка записи пачки из %d ответов", len(batch))
+                for _, future in batch:
+                    resolve(future, exception=exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _collect(self) -> list[Pending]:
+        """Дождаться первого ответа и добрать пачку за max_delay."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay
+        while len(batch) < self.max_rows:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: list[Pending]) -> None:
+        BATCH_ROWS.observe(len(batch))
+        try:
+            answers = await self._create_batch([item for item, _ in batch])
+        except IntegrityError:
+            # Вопроса какого-то ответа нет: каждый ответ — своей транзакцией.
+            for item, future in batch:
+                try:
+                    async with self.sessions() as db:
+                        answer = await AnswerRepository(db).create(*item)
+                except Exception as exc:
+                    resolve(future, exception=exc)
+                else:
+                    resolve(future, answer)
+            return
+        for (_, future), answer in zip(batch, answers):
+            resolve(future, answer)
+
+    async def _create_batch(self, items: list[Item]) -> list[Answer]:
+        """Записать пачку, повторив ее после конфликта транзакций."""
+        for attempt in range(BATCH_CONFLICT_RETRIES + 1):
+            try:
+                async with self.sessions() as db:
+                    return await AnswerRepository(db).create_batch(items)
+            except DBAPIError as exc:
+                last_attempt = attempt == BATCH_CONFLICT_RETRIES
+                if last_attempt or not is_transaction_conflict(exc):
+                    raise
+                logger.warning(
+                    "Пачка из %d ответов откачена из-за конфликта, повтор", len(items)
+                )
+
+
+def resolve(
+    future: asyncio.Future,
+    result: Optional[Answer] = None,
+    exception: Optional[BaseException] = None,
+) -> None:
+    """Сообщить результат ожидающему запросу, если он еще ждет."""
+    # Клиент мог отключиться, не дождавшись ответа.
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+_batcher: Optional[AnswerBatcher] = None
+
+
+def get_answer_batcher() -> Optional[AnswerBatcher]:
+    """Получить очередь групповой фиксации (None — фиксировать каждый ответ)."""
+    return _batcher
+
+
+def set_answer_batcher(batcher: Optional[AnswerBatcher]) -> None:
+    """Заменить очередь групповой фиксации (при запуске приложения и в тестах)."""
+    global _batcher
+    _batcher = batcher
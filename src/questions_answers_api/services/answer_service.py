@@ -1,46 +1,153 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from ..core.admission import (
+    ANSWER_RATE_LIMITED,
+    get_answer_rate_limiter,
+    retry_after_header,
+)
+from ..core.cache import answer_key, get_cache, question_key
+from ..core.etag import row_stamp
+from ..core.replicas import is_pinned
+from ..core.singleflight import SingleFlight
 from ..models import Answer
-from ..schemas import AnswerCreate
+from ..schemas import AnswerBulkCreate, AnswerCreate, AnswerResponse
 from ..repositories.answer_repository import AnswerRepository
 from ..repositories.question_repository import QuestionRepository
+from .answer_batcher import get_answer_batcher
+from .bulk import validate_bulk_items
+
+# Одинаковые конкурентные чтения ответа выполняют один запрос к базе.
+ANSWER_FLIGHTS = SingleFlight("answer")
 
 
 class AnswerService:
     """Сервис для работы с ответами."""
 
     @staticmethod
-    def get_answer_by_id(db: Session, answer_id: int) -> Answer:
-        """Получить ответ по ID."""
+    async def get_answer_by_id(db: AsyncSession, answer_id: int) -> tuple[str, bytes]:
+        """Получить метку строки ответа для ETag (core/etag.py) и его JSON.
+
+        Конкурентные запросы одного ответа ждут одну загрузку
+        (core/singleflight.py).
+        """
+        return await ANSWER_FLIGHTS.do(
+            answer_key(answer_id),
+            is_pinned(db),
+            lambda: AnswerService._load_answer(db, answer_id),
+        )
+
+    @staticmethod
+    async def _load_answer(db: AsyncSession, answer_id: int) -> tuple[str, bytes]:
+        cache = get_cache()
+        # Ответ хранится под ключом своего вопроса, чтобы удаление вопроса
+        # или изменение его ответов инвалидировало и эту запись.
+        cached = (
+            None
+            if is_pinned(db)
+            else await cache.get_linked(answer_key(answer_id), answer_key(answer_id))
+        )
+        if cached is not None:
+            stamp, _, body = cached.partition(b"\n")
+            return stamp.decode(), body
+
+        generation = await cache.generation()
         repo = AnswerRepository(db)
-        answer = repo.get_by_id(answer_id)
+        answer = await repo.get_by_id(answer_id)
         if not answer:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Ответ не найден"
             )
-        return answer
+        body = AnswerResponse.model_validate(answer).model_dump_json().encode()
+        stamp = row_stamp(answer.created_at)
+        # JSON не содержит переводов строк, поэтому метка отделяется ими.
+        await cache.set_linked(
+            answer_key(answer_id),
+            question_key(answer.question_id),
+            answer_key(answer_id),
+            b"%s\n%s" % (stamp.encode(), body),
+            generation,
+        )
+        return stamp, body
+
+    @staticmethod
+    async def get_answer_stamp(db: AsyncSession, answer_id: int) -> str:
+        """Получить метку строки ответа для ETag, не загружая ответ."""
+        created_at = await AnswerRepository(db).get_created_at(answer_id)
+        if created_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Ответ не найден"
+            )
+        return row_stamp(created_at)
 
     @staticmethod
-    def create_answer(
-        db: Session, question_id: int, answer_data: AnswerCreate
+    async def create_answer(
+        db: AsyncSession, question_id: int, answer_data: AnswerCreate
     ) -> Answer:
-        """Создать новый ответ к вопросу."""
-        question_repo = QuestionRepository(db)
-        if not question_repo.exists(question_id):
+        """Создать новый ответ к вопросу.
+
+        При включенной групповой фиксации ответ записывается в общей с
+        конкурентными запросами транзакции (см. answer_batcher.py). При
+        лимите частоты на пользователя сверх лимита — 429 до обращения к базе.
+        """
+        limiter = get_answer_rate_limiter()
+        if limiter is not None:
+            wait = limiter.acquire(answer_data.user_id)
+            if wait:
+                ANSWER_RATE_LIMITED.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Слишком много ответов от пользователя, повторите позже",
+                    headers={"Retry-After": retry_after_header(wait)},
+                )
+        batcher = get_answer_batcher()
+        if batcher is not None:
+            answer = await batcher.submit(
+                question_id, answer_data.user_id, answer_data.text
+            )
+        else:
+            answer = await AnswerRepository(db).create(
+                question_id, answer_data.user_id, answer_data.text
+            )
+        if answer is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Вопрос не найден"
             )
+        await get_cache().invalidate(question_key(question_id))
+        return answer
 
-        answer_repo = AnswerRepository(db)
-        return answer_repo.create(question_id, answer_data.user_id, answer_data.text)
+    @staticmethod
+    async def create_answers_bulk(
+        db: AsyncSession, question_id: int, bulk_data: AnswerBulkCreate
+    ) -> dict:
+        """Создать несколько ответов к вопросу в одной транзакции.
+
+        Существование вопроса проверяет внешний ключ при вставке; отдельный
+        запрос нужен, только если вставлять нечего.
+        """
+        valid, errors = validate_bulk_items(
+            AnswerCreate, bulk_data.items, bulk_data.mode
+        )
+        if valid:
+            answers = await AnswerRepository(db).create_many(
+                question_id, [(item.user_id, item.text) for item in valid]
+            )
+        else:
+            answers = [] if await QuestionRepository(db).exists(question_id) else None
+        if answers is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Вопрос не найден"
+            )
+        if answers:
+            await get_cache().invalidate(question_key(question_id))
+        return {"created": answers, "errors": errors}
 
     @staticmethod
-    def delete_answer(db: Session, answer_id: int) -> None:
+    async def delete_answer(db: AsyncSession, answer_id: int) -> None:
         """Удалить ответ."""
         repo = AnswerRepository(db)
-        answer = repo.get_by_id(answer_id)
-        if not answer:
+        question_id = await repo.delete_by_id(answer_id)
+        if question_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Ответ не найден"
             )
-        repo.delete(answer)
+        await get_cache().invalidate(question_key(question_id), answer_key(answer_id))
@@ -0,0 +1,31 @@
+from typing import Any
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from ..schemas import BulkItemError, BulkMode
+
+
+def validate_bulk_items(
+    schema: type[BaseModel], items: list[Any], mode: BulkMode
+) -> tuple[list[BaseModel], list[BulkItemError]]:
+    """Провалидировать элементы массового запроса по одному."""
+    valid = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            valid.append(schema.model_validate(item))
+        except ValidationError as exc:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    errors=exc.errors(
+                        include_url=False, include_context=False, include_input=False
+                    ),
+                )
+            )
+
+    if errors and mode == BulkMode.ATOMIC:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors],
+        )
+    return valid, errors
@@ -0,0 +1,237 @@
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..repositories import ImportRepository
+from ..schemas import AnswerImport, QuestionImport
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMPORT_CHUNK_SIZE = 5000
+
+T = TypeVar("T")
+
+
+@dataclass
+class ImportStats:
+    """Счетчики импорта."""
+
+    questions: int = 0
+    answers: int = 0
+    rejected: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def reject(self, line: int, reason) -> None:
+        """Учесть пропущенную строку входных данных."""
+        self.rejected += 1
+        logger.warning("Строка %s пропущена: %s", line, reason)
+
+    def as_dict(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        rows = self.questions + self.answers
+        return {
+            "questions": self.questions,
+            "answers": self.answers,
+            "rejected": self.rejected,
+            "seconds": round(elapsed, 3),
+            "rows_per_s": round(rows / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+Progress = Optional[Callable[[ImportStats], None]]
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Разбить поток на списки не длиннее size, не читая его целиком."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def utc_now() -> datetime:
+    """Текущее время в наивном UTC, как даты хранятся в базе."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def naive_utc(value: Optional[datetime], default: datetime) -> datetime:
+    """Привести дату к наивному UTC, как она хранится в базе."""
+    if value is None:
+        return default
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def non_empty(row: dict) -> dict:
+    """Убрать пустые ячейки CSV, чтобы для них сработали значения по умолчанию."""
+    return {key: value for key, value in row.items() if value not in ("", None)}
+
+
+def validation_reason(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()
+    )
+
+
+class ImportService:
+    """Сервис массового импорта вопросов и ответов.
+
+    Данные читаются и записываются пачками по chunk_size строк, каждая пачка
+    фиксируется отдельной транзакцией; некорректные строки пропускаются и
+    пишутся в лог. Память не зависит от объема входных данных.
+    """
+
+    @staticmethod
+    async def import_ndjson(
+        db: AsyncSession,
+        lines: Iterable[str],
+        chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+        progress: Progress = None,
+    ) -> ImportStats:
+        """Импортировать NDJSON: строка — вопрос с вложенными ответами.
+
+        Формат совпадает с выгрузкой GET /export; ID из файла не сохраняются,
+        ответы привязываются к новым ID своих вопросов.
+        """
+        repo = ImportRepository(db)
+        stats = ImportStats()
+        for chunk in chunked(enumerate(lines, start=1), chunk_size):
+            questions = []
+            for line_number, line in chunk:
+                if not line.strip():
+                    continue
+                try:
+                    questions.append(QuestionImport.model_validate_json(line))
+                except ValidationError as exc:
+                    stats.reject(line_number, validation_reason(exc))
+            await ImportService._write_questions(repo, questions, stats)
+            await db.commit()
+            if progress:
+                progress(stats)
+        return stats
+
+    @staticmethod
+    async def import_csv(
+        db: AsyncSession,
+        question_rows: Iterable[dict],
+        answer_rows: Iterable[dict] = (),
+        chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+        progress: Progress = None,
+    ) -> ImportStats:
+        """Импортировать CSV: вопросы (id, text, created_at) и ответы
+        (question_id, user_id, text, created_at).
+
+        question_id ответа ссылается на id вопроса из файла вопросов;
+        соответствие исходных и новых ID хранится во временной таблице.
+        """
+        repo = ImportRepository(db)
+        stats = ImportStats()
+        await repo.create_id_map()
+
+        # Строка 1 в CSV — заголовок.
+        for chunk in chunked(enumerate(question_rows, start=2), chunk_size):
+            questions = []
+            for line_number, row in chunk:
+                try:
+                    question = QuestionImport.model_validate(non_empty(row))
+                except ValidationError as exc:
+                    stats.reject(line_number, validation_reason(exc))
+                    continue
+                questions.append((line_number, question))
+
+            source_ids = [str(q.id) for _, q in questions if q.id is not None]
+            seen = set(await repo.get_id_map(source_ids))
+            unique = []
+            for line_number, question in questions:
+                if question.id is not None:
+                    if str(question.id) in seen:
+                        stats.reject(line_number, f"повторяющийся id {question.id}")
+                        continue
+                    seen.add(str(question.id))
+                unique.append(question)
+
+            ids = await ImportService._write_questions(repo, unique, stats)
+            await repo.save_id_map(
+                [
+                    (str(q.id), new_id)
+                    for q, new_id in zip(unique, ids)
+                    if q.id is not None
+                ]
+            )
+            await db.commit()
+            if progress:
+                progress(stats)
+
+        now = utc_now()
+        for chunk in chunked(enumerate(answer_rows, start=2), chunk_size):
+            answers = []
+            for line_number, row in chunk:
+                try:
+                    answer = AnswerImport.model_validate(non_empty(row))
+                except ValidationError as exc:
+                    stats.reject(line_number, validation_reason(exc))
+                    continue
+                if answer.question_id is None:
+                    stats.reject(line_number, "не указан question_id")
+                    continue
+                answers.append((line_number, answer))
+
+            id_map = await repo.get_id_map(
+                list({str(a.question_id) for _, a in answers})
+            )
+            rows = []
+            for line_number, answer in answers:
+                question_id = id_map.get(str(answer.question_id))
+                if question_id is None:
+                    stats.reject(line_number, f"вопрос {answer.question_id} не найден")
+                    continue
+                rows.append(
+                    (
+                        question_id,
+                        answer.user_id,
+                        answer.text,
+                        naive_utc(answer.created_at, now),
+                    )
+                )
+            await repo.write_answers(rows)
+            await repo.add_answers_counts(Counter(row[0] for row in rows))
+            stats.answers += len(rows)
+            await db.commit()
+            if progress:
+                progress(stats)
+        return stats
+
+    @staticmethod
+    async def _write_questions(
+        repo: ImportRepository, questions: list[QuestionImport], stats: ImportStats
+    ) -> list[int]:
+        """Записать вопросы с вложенными ответами и вернуть их новые ID."""
+        if not questions:
+            return []
+        now = utc_now()
+        ids = await repo.reserve_question_ids(len(questions))
+        await repo.write_questions(
+            [
+                (
+                    new_id,
+                    question.text,
+                    naive_utc(question.created_at, now),
+                    len(question.answers),
+                )
+                for new_id, question in zip(ids, questions)
+            ]
+        )
+        answers = [
+            (new_id, answer.user_id, answer.text, naive_utc(answer.created_at, now))
+            for new_id, question in zip(ids, questions)
+            for answer in question.answers
+        ]
+        await repo.write_answers(answers)
+        stats.questions += len(questions)
+        stats.answers += len(answers)
+        return ids
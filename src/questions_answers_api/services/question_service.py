@@ -1,43 +1,329 @@
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from ..core.cache import get_cache, question_key
+from ..core.etag import row_stamp
+from ..core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    decode_count_cursor,
+    decode_cursor,
+    decode_rank_cursor,
+    encode_count_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+from ..core.replicas import is_pinned
+from ..core.serialization import QUESTION_EXPORT, QUESTION_WITH_ANSWERS
+from ..core.singleflight import SingleFlight
 from ..models import Question
-from ..schemas import QuestionCreate
+from ..schemas import (
+    QuestionBulkCreate,
+    QuestionCreate,
+    QuestionPurge,
+    QuestionSort,
+)
 from ..repositories.question_repository import QuestionRepository
+from .bulk import validate_bulk_items
+
+# Одинаковые конкурентные чтения вопроса выполняют один запрос к базе.
+QUESTION_FLIGHTS = SingleFlight("question")
+
+
+def etag_version(version: int, created_at: datetime) -> str:
+    """Версия вопроса для ETag: номер версии и метка строки (core/etag.py)."""
+    return f"{version}-{row_stamp(created_at)}"
+
+
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+MAX_EXPORT_BATCH_SIZE = 10_000
+# Строки экспорта отдаются кусками примерно такого размера, а не по одной.
+EXPORT_CHUNK_BYTES = 64 * 1024
 
 
 class QuestionService:
     """Сервис для работы с вопросами."""
 
     @staticmethod
-    def get_all_questions(db: Session) -> list[Question]:
-        """Получить все вопросы."""
+    async def get_questions_page(
+        db: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: QuestionSort = QuestionSort.CREATED_AT,
+    ) -> dict:
+        """Получить страницу вопросов и курсор следующей страницы.
+
+        Курсор привязан к порядку sort: с другим порядком он не декодируется
+        или указывает на другую позицию.
+        """
+        by_count = sort == QuestionSort.ANSWERS_COUNT
+        try:
+            if not cursor:
+                after = None
+            elif by_count:
+                after = decode_count_cursor(cursor)
+            else:
+                after = decode_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            )
+
+        limit = min(limit, MAX_PAGE_SIZE)
+        repo = QuestionRepository(db)
+        if by_count:
+            questions = await repo.get_page_by_answers_count(limit + 1, after)
+        else:
+            questions = await repo.get_page(limit + 1, after)
+
+        next_cursor = None
+        if len(questions) > limit:
+            questions = questions[:limit]
+            last = questions[-1]
+            if by_count:
+                next_cursor = encode_count_cursor(last["answers_count"], last["id"])
+            else:
+                next_cursor = encode_cursor(last["created_at"], last["id"])
+        return {"items": questions, "next_cursor": next_cursor}
+
+    @staticmethod
+    async def search_questions(
+        db: AsyncSession, query: str, limit: int, cursor: Optional[str] = None
+    ) -> dict:
+        """Найти вопросы по тексту вопроса и ответов, страница по релевантности."""
+        try:
+            after = decode_rank_cursor(cursor) if cursor else None
+        except InvalidCursorError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            )
+
+        limit = min(limit, MAX_PAGE_SIZE)
+        repo = QuestionRepository(db)
+        found = await repo.search(query, limit + 1, after)
+
+        next_cursor = None
+        if len(found) > limit:
+            found = found[:limit]
+            last = found[-1]
+            next_cursor = encode_rank_cursor(last["rank"], last["id"])
+        return {"items": found, "next_cursor": next_cursor}
+
+    @staticmethod
+    async def get_question_version(db: AsyncSession, question_id: int) -> str:
+        """Получить версию вопроса для ETag, не загружая ответы."""
+        cache = get_cache()
+        # После записи клиента кэш пропускается: его могло заполнить чтение
+        # с отстающей реплики (см. core/replicas.py).
+        cached = (
+            None
+            if is_pinned(db)
+            else await cache.get(question_key(question_id), "version")
+        )
+        if cached is not None:
+            return cached.decode()
+
+        # Номер берется до чтения: запись, зафиксированная после него,
+        # отменит сохранение прочитанной версии в кэш.
+        generation = await cache.generation()
         repo = QuestionRepository(db)
-        return repo.get_all()
+        found = await repo.get_version(question_id)
+        if found is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Вопрос не найден"
+            )
+        version = etag_version(*found)
+        await cache.set(
+            question_key(question_id), "version", version.encode(), generation
+        )
+        return version
 
     @staticmethod
-    def get_question_by_id(db: Session, question_id: int) -> Question:
-        """Получить вопрос по ID."""
+    async def get_question_by_id(
+        db: AsyncSession,
+        question_id: int,
+        answers_limit: int = DEFAULT_PAGE_SIZE,
+        answers_cursor: Optional[str] = None,
+    ) -> tuple[str, bytes]:
+        """Получить версию вопроса и JSON вопроса со страницей ответов.
+
+        В кэше JSON хранится готовым, вместе с версией: попадание не требует
+        ни запроса к базе, ни повторного кодирования. Конкурентные запросы
+        одной страницы при промахе ждут одну загрузку (core/singleflight.py).
+        """
+        try:
+            answers_after = decode_cursor(answers_cursor) if answers_cursor else None
+        except InvalidCursorError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            )
+
+        answers_limit = min(answers_limit, MAX_PAGE_SIZE)
+        # Чтение после записи клиента не должно получить результат загрузки
+        # с реплики, поэтому оно объединяется только с такими же.
+        return await QUESTION_FLIGHTS.do(
+            question_key(question_id),
+            (answers_limit, answers_cursor, is_pinned(db)),
+            lambda: QuestionService._load_question(
+                db, question_id, answers_limit, answers_cursor, answers_after
+            ),
+        )
+
+    @staticmethod
+    async def _load_question(
+        db: AsyncSession,
+        question_id: int,
+        answers_limit: int,
+        answers_cursor: Optional[str],
+        answers_after: Optional[tuple[datetime, int]],
+    ) -> tuple[str, bytes]:
+        cache = get_cache()
+        cache_field = f"json:{answers_limit}:{answers_cursor or ''}"
+        cached = (
+            None
+            if is_pinned(db)
+            else await cache.get(question_key(question_id), cache_field)
+        )
+        if cached is not None:
+            version, _, body = cached.partition(b"\n")
+            return version.decode(), body
+
+        generation = await cache.generation()
         repo = QuestionRepository(db)
-        question = repo.get_by_id(question_id)
-        if not question:
+        found = await repo.get_with_answers(
+            question_id, answers_limit + 1, answers_after
+        )
+        if not found:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Вопрос не найден"
             )
-        return question
+
+        question, answers = found
+        answers_next_cursor = None
+        if len(answers) > answers_limit:
+            answers = answers[:answers_limit]
+            last = answers[-1]
+            answers_next_cursor = encode_cursor(last["created_at"], last["id"])
+        body = QUESTION_WITH_ANSWERS.dump_json(
+            {**question, "answers": answers, "answers_next_cursor": answers_next_cursor}
+        )
+        version = etag_version(question["version"], question["created_at"])
+        # JSON не содержит переводов строк, поэтому версия отделяется ими.
+        await cache.set(
+            question_key(question_id),
+            cache_field,
+            b"%s\n%s" % (version.encode(), body),
+            generation,
+        )
+        await cache.set(
+            question_key(question_id), "version", version.encode(), generation
+        )
+        return version, body
+
+    @staticmethod
+    async def export_questions(
+        db: AsyncSession, batch_size: int = DEFAULT_EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Выгрузить все вопросы с ответами в формате NDJSON (строка на вопрос)."""
+        repo = QuestionRepository(db)
+        chunk = bytearray()
+        async for question in repo.stream_with_answers(batch_size):
+            chunk += QUESTION_EXPORT.dump_json(question)
+            chunk += b"\n"
+            if len(chunk) >= EXPORT_CHUNK_BYTES:
+                yield bytes(chunk)
+                chunk.clear()
+        if chunk:
+            yield bytes(chunk)
 
     @staticmethod
-    def create_question(db: Session, question_data: QuestionCreate) -> Question:
+    async def create_question(
+        db: AsyncSession, question_data: QuestionCreate
+    ) -> Question:
         """Создать новый вопрос."""
         repo = QuestionRepository(db)
-        return repo.create(question_data.text)
+        return await repo.create(question_data.text)
+
+    @staticmethod
+    async def create_questions_bulk(
+        db: AsyncSession, bulk_data: QuestionBulkCreate
+    ) -> dict:
+        """Создать несколько вопросов в одной транзакции."""
+        valid, errors = validate_bulk_items(
+            QuestionCreate, bulk_data.items, bulk_data.mode
+        )
+        questions = []
+        if valid:
+            repo = QuestionRepository(db)
+            questions = await repo.create_many([item.text for item in valid])
+        return {"created": questions, "errors": errors}
 
     @staticmethod
-    def delete_question(db: Session, question_id: int) -> None:
+    async def delete_question(db: AsyncSession, question_id: int) -> None:
         """Удалить вопрос (каскадно удаляются все ответы)."""
         repo = QuestionRepository(db)
-        question = repo.get_by_id(question_id)
-        if not question:
+        if not await repo.delete_by_id(question_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Вопрос не найден"
             )
-        repo.delete(question)
+        await get_cache().invalidate(question_key(question_id))
+
+    @staticmethod
+    async def purge_questions(db: AsyncSession, purge_data: QuestionPurge) -> dict:
+        """Удалить вопросы по списку ID или по возрасту ограниченными пачками."""
+        repo = QuestionRepository(db)
+        batch_size = purge_data.batch_size
+        deleted = 0
+        batches = 0
+
+        cache = get_cache()
+
+        if purge_data.ids is not None:
+            ids = list(dict.fromkeys(purge_data.ids))
+            for start in range(0, len(ids), batch_size):
+                batch_ids = await repo.delete_by_ids(ids[start : start + batch_size])
+                await cache.invalidate(*map(question_key, batch_ids))
+                deleted += len(batch_ids)
+                batches += 1
+        else:
+            while True:
+                batch_ids = await repo.delete_created_before(
+                    purge_data.older_than, batch_size
+                )
+                await cache.invalidate(*map(question_key, batch_ids))
+                deleted += len(batch_ids)
+                batches += 1
+                if len(batch_ids) < batch_size:
+                    break
+
+        return {"deleted": deleted, "batches": batches}
+
+    @staticmethod
+    async def reconcile_answers_counts(db: AsyncSession, batch_size: int) -> dict:
+        """Сверить answers_count с числом ответов и исправить расхождения.
+
+        Вопросы проверяются пачками по batch_size в порядке ID, каждая пачка —
+        один UPDATE в отдельной транзакции.
+        """
+        repo = QuestionRepository(db)
+        cache = get_cache()
+        checked = 0
+        fixed = 0
+        batches = 0
+        after_id = 0
+        while True:
+            checked_ids, fixed_ids = await repo.reconcile_answers_counts(
+                after_id, batch_size
+            )
+            if not checked_ids:
+                break
+            await cache.invalidate(*map(question_key, fixed_ids))
+            checked += len(checked_ids)
+            fixed += len(fixed_ids)
+            batches += 1
+            if len(checked_ids) < batch_size:
+                break
+            after_id = checked_ids[-1]
+        return {"checked": checked, "fixed": fixed, "batches": batches}
@@ -10,4 +10,4 @@ echo "Применяем миграции базы данных..."
 alembic upgrade head
 
 echo "Запускаем приложение..."
-exec uvicorn src.questions_answers_api.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec python -m src.questions_answers_api.cli.serve --host 0.0.0.0 --port 8000
\ No newline at end of file
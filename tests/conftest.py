@@ -1,10 +1,23 @@
+import os
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-
-from src.questions_answers_api.core.database import Base, get_db
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+# Фоновая проверка готовности обращалась бы к рабочей базе, а не к тестовой.
+os.environ.setdefault("HEALTH_CHECK_INTERVAL", "0")
+
+from src.questions_answers_api.core.cache import MemoryCache, set_cache
+from src.questions_answers_api.core.database import (
+    Base,
+    enable_sqlite_foreign_keys,
+    get_db,
+    to_async_url,
+)
+from src.questions_answers_api.core.metrics import collect_requests, instrument_engine
 from src.questions_answers_api.main import app
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -12,16 +25,20 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(
+    to_async_url(SQLALCHEMY_DATABASE_URL), poolclass=NullPool
+)
+enable_sqlite_foreign_keys(async_engine)
+instrument_engine(async_engine)
+TestingSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 
-def override_get_db():
+async def override_get_db():
     """Переопределение зависимости базы данных для тестов."""
-    try:
-        db = TestingSessionLocal()
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 app.dependency_overrides[get_db] = override_get_db
@@ -31,11 +48,59 @@ app.dependency_overrides[get_db] = override_get_db
 def client():
     """Фикстура клиента для тестов."""
     Base.metadata.create_all(bind=engine)
+    set_cache(MemoryCache())
     with TestClient(app) as c:
         yield c
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def sql_statements():
+    """Фикстура со списком SQL-запросов, выполненных во время теста."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        async_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    yield statements
+    event.remove(
+        async_engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+
+@pytest.fixture
+def query_budget():
+    """Фикстура бюджета SQL-запросов на HTTP-запрос.
+
+    Каждый HTTP-запрос внутри блока with query_budget(n) должен выполнить
+    не больше n запросов к базе и не повторять запросы одной формы (N+1).
+    """
+
+    @contextmanager
+    def budget(max_queries: int, allow_repeats: bool = False):
+        with collect_requests() as reports:
+            yield reports
+        assert reports, "В блоке query_budget не было HTTP-запросов"
+        for report in reports:
+            usage = report.usage
+            statements = "\n".join(
+                f"  {count} × {shape}" for shape, count in usage.shapes().items()
+            )
+            assert usage.db_queries <= max_queries, (
+                f"{report.method} {report.path}: {usage.db_queries} запросов "
+                f"к базе при бюджете {max_queries}:\n{statements}"
+            )
+            assert allow_repeats or usage.repeated_queries() == 0, (
+                f"{report.method} {report.path}: повторяющиеся запросы "
+                f"(N+1):\n{statements}"
+            )
+
+    return budget
+
+
 @pytest.fixture
 def sample_question_data():
     """Фикстура с данными для создания вопроса."""
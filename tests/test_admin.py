@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from tests.conftest import engine
+
+
+class TestQuestionPurge:
+    """Тесты массового удаления вопросов."""
+
+    def test_purge_by_ids(self, client: TestClient, multiple_questions):
+        """Тест удаления вопросов по списку ID пачками."""
+        ids = [q["id"] for q in multiple_questions[:2]]
+        response = client.post(
+            "/admin/questions/purge", json={"ids": ids + [999], "batch_size": 1}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"deleted": 2, "batches": 3}
+
+        remaining = client.get("/questions/").json()["items"]
+        assert [q["id"] for q in remaining] == [multiple_questions[2]["id"]]
+
+    def test_purge_older_than(self, client: TestClient, question_with_answers):
+        """Тест удаления вопросов по возрасту вместе с ответами."""
+        client.post("/questions/", json={"text": "Еще один вопрос"})
+        response = client.post(
+            "/admin/questions/purge",
+            json={"older_than": "2999-01-01T00:00:00", "batch_size": 1},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"deleted": 2, "batches": 3}
+        assert client.get("/questions/").json()["items"] == []
+
+        for answer in question_with_answers["answers"]:
+            assert client.get(f"/answers/{answer['id']}").status_code == 404
+
+    def test_purge_keeps_newer_questions(self, client: TestClient, created_question):
+        """Тест: вопросы новее older_than не удаляются."""
+        response = client.post(
+            "/admin/questions/purge", json={"older_than": "2000-01-01T00:00:00"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["deleted"] == 0
+        assert client.get(f"/questions/{created_question['id']}").status_code == 200
+
+    def test_purge_older_than_utc_designator(
+        self, client: TestClient, created_question
+    ):
+        """Тест: граница с суффиксом Z принимается как UTC."""
+        response = client.post(
+            "/admin/questions/purge", json={"older_than": "2999-01-01T00:00:00Z"}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["deleted"] == 1
+
+    def test_purge_older_than_respects_offset(
+        self, client: TestClient, created_question
+    ):
+        """Тест: смещение границы учитывается, а не отбрасывается."""
+        created_at = datetime.fromisoformat(created_question["created_at"])
+        # За минуту до создания вопроса, но по часам UTC+5 — на пять часов позже.
+        cutoff = (
+            (created_at - timedelta(minutes=1))
+            .replace(tzinfo=timezone.utc)
+            .astimezone(timezone(timedelta(hours=5)))
+        )
+        response = client.post(
+            "/admin/questions/purge", json={"older_than": cutoff.isoformat()}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["deleted"] == 0
+        assert client.get(f"/questions/{created_question['id']}").status_code == 200
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {},
+            {"ids": [1], "older_than": "2000-01-01T00:00:00"},
+            {"ids": []},
+            {"ids": [1], "batch_size": 0},
+            {"ids": [1], "batch_size": 5001},
+        ],
+    )
+    def test_purge_invalid_payload(self, client: TestClient, payload):
+        """Тест валидации параметров массового удаления."""
+        response = client.post("/admin/questions/purge", json=payload)
+        assert response.status_code == 422
+
+
+class TestAnswersCountReconcile:
+    """Тесты пересчета счетчиков ответов."""
+
+    def test_reconcile_fixes_drift(
+        self, client: TestClient, multiple_questions, question_with_answers
+    ):
+        """Тест: расхождения, внесенные в обход API, исправляются пачками."""
+        question_id = question_with_answers["question"]["id"]
+        etag = client.get(f"/questions/{question_id}").headers["ETag"]
+        with engine.begin() as connection:
+            connection.execute(
+                text("UPDATE questions SET answers_count = 7 WHERE id = :id"),
+                {"id": question_id},
+            )
+            connection.execute(
+                text("UPDATE questions SET answers_count = -1 WHERE id = :id"),
+                {"id": multiple_questions[0]["id"]},
+            )
+
+        response = client.post(
+            "/admin/questions/answers-count/reconcile", json={"batch_size": 2}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"checked": 4, "fixed": 2, "batches": 2}
+        data = client.get(f"/questions/{question_id}")
+        assert data.json()["answers_count"] == 2
+        assert data.headers["ETag"] != etag
+        counts = {q["id"]: q["answers_count"] for q in multiple_questions}
+        for question in client.get("/questions/").json()["items"]:
+            assert question["answers_count"] == counts.get(question["id"], 2)
+
+        response = client.post("/admin/questions/answers-count/reconcile", json={})
+        assert response.json() == {"checked": 4, "fixed": 0, "batches": 1}
+
+    @pytest.mark.parametrize("batch_size", [0, 10_001])
+    def test_reconcile_invalid_batch_size(self, client: TestClient, batch_size):
+        """Тест валидации размера пачки пересчета."""
+        response = client.post(
+            "/admin/questions/answers-count/reconcile",
+            json={"batch_size": batch_size},
+        )
+        assert response.status_code == 422
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.questions_answers_api.core import admission
+from src.questions_answers_api.core.admission import (
+    AdmissionControl,
+    ConcurrencyLimiter,
+    Overloaded,
+    TokenBucketLimiter,
+    set_admission,
+    set_answer_rate_limiter,
+)
+
+
+@pytest.fixture
+def read_limiter(client: TestClient):
+    """Фикстура: одно место для чтений, без очереди."""
+    limiter = ConcurrencyLimiter(1, max_queue=0)
+    set_admission(AdmissionControl(read=limiter))
+    yield limiter
+    set_admission(None)
+
+
+@pytest.fixture
+def rate_limiter(client: TestClient):
+    """Фикстура: два ответа от пользователя, дальше — очень редко."""
+    limiter = TokenBucketLimiter(rate=0.01, burst=2)
+    set_answer_rate_limiter(limiter)
+    yield limiter
+    set_answer_rate_limiter(None)
+
+
+class TestConcurrencyLimiter:
+    """Тесты предела одновременных запросов."""
+
+    def test_waiters_get_slots_in_order(self):
+        """Тест: освобожденное место получает первый в очереди."""
+
+        async def run():
+            limiter = ConcurrencyLimiter(1, max_queue=2, max_wait=1)
+            order = []
+            await limiter.acquire()
+
+            async def wait(name):
+                await limiter.acquire()
+                order.append(name)
+                limiter.release(0.01)
+
+            tasks = [asyncio.create_task(wait(name)) for name in ("first", "second")]
+            await asyncio.sleep(0)
+            assert limiter.queued == 2
+            limiter.release(0.01)
+            await asyncio.gather(*tasks)
+            return order, limiter.active
+
+        assert asyncio.run(run()) == (["first", "second"], 0)
+
+    def test_full_queue_rejects_immediately(self):
+        """Тест: при заполненной очереди отказ без ожидания."""
+
+        async def run():
+            limiter = ConcurrencyLimiter(1, max_queue=1, max_wait=1)
+            await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            with pytest.raises(Overloaded) as error:
+                await limiter.acquire()
+            waiter.cancel()
+            return error.value.reason
+
+        assert asyncio.run(run()) == "queue_full"
+
+    def test_expected_wait_over_deadline_rejects(self):
+        """Тест: если ждать дольше max_wait, отказ сразу, с оценкой ожидания."""
+
+        async def run():
+            limiter = ConcurrencyLimiter(2, max_queue=10, max_wait=0.5)
+            limiter.service_time = 2.0
+            await limiter.acquire()
+            await limiter.acquire()
+            with pytest.raises(Overloaded) as error:
+                await limiter.acquire()
+            return error.value
+
+        error = asyncio.run(run())
+        assert error.reason == "deadline"
+        assert error.retry_after == 1.0
+
+    def test_wait_timeout_leaves_queue(self):
+        """Тест: не дождавшийся запрос уходит из очереди и не занимает место."""
+
+        async def run():
+            limiter = ConcurrencyLimiter(1, max_queue=5, max_wait=0.02)
+            await limiter.acquire()
+            with pytest.raises(Overloaded) as error:
+                await limiter.acquire()
+            return error.value.reason, limiter.queued, limiter.active
+
+        assert asyncio.run(run()) == ("timeout", 0, 1)
+
+
+class TestAdmissionMiddleware:
+    """Тесты контроля допуска запросов к API."""
+
+    def test_overloaded_reads_get_503(self, client: TestClient, read_limiter):
+        """Тест: чтение сверх предела — 503 с Retry-After, пока место занято."""
+        client.portal.call(read_limiter.acquire)
+
+        response = client.get("/questions/")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+        read_limiter.release()
+        assert client.get("/questions/").status_code == 200
+        assert read_limiter.active == 0
+
+    def test_other_classes_and_system_routes_pass(
+        self, client: TestClient, read_limiter
+    ):
+        """Тест: изменения и служебные эндпоинты не ждут предела чтений."""
+        client.portal.call(read_limiter.acquire)
+
+        assert client.post("/questions/", json={"text": "Вопрос"}).status_code == 201
+        assert client.get("/health/ready").status_code == 200
+        assert client.get("/metrics").status_code == 200
+        read_limiter.release()
+
+    def test_disabled_by_default(self):
+        """Тест: без настроек контроль допуска выключен."""
+        assert admission.ADMISSION_READ_CONCURRENCY == 0
+        assert admission.create_admission() is None
+
+
+class TestAnswerRateLimit:
+    """Тесты лимита частоты ответов на пользователя."""
+
+    def test_token_bucket_refills(self, monkeypatch):
+        """Тест: запас burst, затем токены копятся со скоростью rate."""
+        now = [100.0]
+        monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+        limiter = TokenBucketLimiter(rate=2, burst=2)
+
+        assert [limiter.acquire("u") for _ in range(3)] == [0, 0, 0.5]
+        now[0] += 0.5
+        assert limiter.acquire("u") == 0
+        assert limiter.acquire("other") == 0
+
+    def test_token_bucket_evicts_old_keys(self):
+        """Тест: корзин не больше max_keys."""
+        limiter = TokenBucketLimiter(rate=1, burst=1, max_keys=2)
+        for key in ("a", "b", "c"):
+            limiter.acquire(key)
+
+        assert list(limiter._buckets) == ["b", "c"]
+
+    def test_user_over_limit_gets_429(
+        self, client: TestClient, created_question, rate_limiter
+    ):
+        """Тест: сверх лимита — 429 этому пользователю, другим — 201."""
+        url = f"/questions/{created_question['id']}/answers/"
+        statuses = [
+            client.post(url, json={"user_id": "spammer", "text": f"Ответ {i}"})
+            for i in range(3)
+        ]
+
+        assert [r.status_code for r in statuses] == [201, 201, 429]
+        assert int(statuses[2].headers["Retry-After"]) >= 1
+        response = client.post(url, json={"user_id": "other", "text": "Ответ"})
+        assert response.status_code == 201
+        question = client.get(f"/questions/{created_question['id']}").json()
+        assert question["answers_count"] == 3
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+
+from src.questions_answers_api.core.database import PG_DEADLOCK_DETECTED
+from src.questions_answers_api.repositories.answer_repository import AnswerRepository
+from src.questions_answers_api.services.answer_batcher import (
+    AnswerBatcher,
+    set_answer_batcher,
+)
+from tests.conftest import TestingSessionLocal, async_engine
+
+
+@pytest.fixture
+def batcher(client: TestClient):
+    """Фикстура: групповая фиксация ответов в цикле событий приложения."""
+    answer_batcher = AnswerBatcher(TestingSessionLocal, max_delay=0.05)
+    client.portal.call(answer_batcher.start)
+    set_answer_batcher(answer_batcher)
+    yield answer_batcher
+    set_answer_batcher(None)
+    client.portal.call(answer_batcher.stop)
+
+
+def submit_all(client: TestClient, batcher: AnswerBatcher, question_ids: list[int]):
+    """Создать ответы конкурентно; вернуть результаты или исключения."""
+
+    async def submit():
+        return await asyncio.gather(
+            *(
+                batcher.submit(question_id, f"user{i}", f"Ответ {i}")
+                for i, question_id in enumerate(question_ids)
+            ),
+            return_exceptions=True,
+        )
+
+    return client.portal.call(submit)
+
+
+class TestAnswerBatcher:
+    """Тесты групповой фиксации ответов."""
+
+    def test_concurrent_answers_share_one_commit(
+        self, client: TestClient, created_question, batcher
+    ):
+        """Тест: конкурентные ответы фиксируются одним COMMIT, каждый получает свой."""
+        question_id = created_question["id"]
+        commits = []
+
+        def count_commit(conn):
+            commits.append(conn)
+
+        event.listen(async_engine.sync_engine, "commit", count_commit)
+        try:
+            answers = submit_all(client, batcher, [question_id] * 5)
+        finally:
+            event.remove(async_engine.sync_engine, "commit", count_commit)
+
+        assert [a.text for a in answers] == [f"Ответ {i}" for i in range(5)]
+        assert len({a.id for a in answers}) == 5
+        assert len(commits) == 1
+        question = client.get(f"/questions/{question_id}").json()
+        assert question["answers_count"] == 5
+
+    def test_missing_question_fails_only_its_answer(
+        self, client: TestClient, multiple_questions, batcher
+    ):
+        """Тест: ответ к несуществующему вопросу не мешает остальным."""
+        first, second = multiple_questions[0]["id"], multiple_questions[1]["id"]
+
+        answers = submit_all(client, batcher, [first, 999, second, first])
+
+        assert answers[1] is None
+        assert [a.question_id for a in answers if a] == [first, second, first]
+        counts = [
+            client.get(f"/questions/{question_id}").json()["answers_count"]
+            for question_id in (first, second)
+        ]
+        assert counts == [2, 1]
+
+    def test_endpoint_uses_batcher(
+        self, client: TestClient, created_question, sample_answer_data, batcher
+    ):
+        """Тест: POST ответа при групповой фиксации — те же 201 и 404."""
+        response = client.post(
+            f"/questions/{created_question['id']}/answers/", json=sample_answer_data
+        )
+        assert response.status_code == 201
+        assert response.json()["text"] == sample_answer_data["text"]
+
+        response = client.post("/questions/999/answers/", json=sample_answer_data)
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Вопрос не найден"
+
+    def test_full_queue_rejects_with_503(self, client: TestClient, created_question):
+        """Тест: переполненная очередь сразу отвечает 503 с Retry-After."""
+        answer_batcher = AnswerBatcher(TestingSessionLocal, max_delay=0.05, max_queue=1)
+        client.portal.call(answer_batcher.start)
+        try:
+            results = submit_all(client, answer_batcher, [created_question["id"]] * 3)
+        finally:
+            client.portal.call(answer_batcher.stop)
+
+        assert results[0].question_id == created_question["id"]
+        for error in results[1:]:
+            assert isinstance(error, HTTPException)
+            assert error.status_code == 503
+            assert error.headers["Retry-After"] == "1"
+
+    def test_question_counters_updated_in_id_order(
+        self, client: TestClient, multiple_questions, batcher
+    ):
+        """Тест: счетчики вопросов пачки обновляются в порядке ID."""
+        first, second = multiple_questions[0]["id"], multiple_questions[1]["id"]
+        updated = []
+
+        def record_update(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().startswith("UPDATE questions"):
+                updated.extend(params[-1] for params in parameters)
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record_update)
+        try:
+            submit_all(client, batcher, [second, first, second])
+        finally:
+            event.remove(
+                async_engine.sync_engine, "before_cursor_execute", record_update
+            )
+
+        assert updated == [first, second]
+
+    def test_batch_retried_after_deadlock(
+        self, client: TestClient, created_question, batcher, monkeypatch
+    ):
+        """Тест: пачка, откаченная из-за взаимоблокировки, повторяется."""
+        create_batch = AnswerRepository.create_batch
+        attempts = []
+
+        class Deadlock(Exception):
+            sqlstate = PG_DEADLOCK_DETECTED
+
+        async def deadlock_once(self, items):
+            attempts.append(len(items))
+            if len(attempts) == 1:
+                raise DBAPIError("UPDATE questions", {}, Deadlock())
+            return await create_batch(self, items)
+
+        monkeypatch.setattr(AnswerRepository, "create_batch", deadlock_once)
+        answers = submit_all(client, batcher, [created_question["id"]] * 3)
+
+        assert attempts == [3, 3]
+        assert [a.text for a in answers] == [f"Ответ {i}" for i in range(3)]
+        question = client.get(f"/questions/{created_question['id']}").json()
+        assert question["answers_count"] == 3
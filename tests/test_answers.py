@@ -33,6 +33,28 @@ class TestAnswerCreation:
         )
         assert response.status_code == 404
 
+    def test_create_answer_is_single_insert(
+        self, client: TestClient, created_question, sample_answer_data, sql_statements
+    ):
+        """Тест: ответ создается INSERT ... RETURNING без проверки и перечитывания."""
+        question_id = created_question["id"]
+
+        sql_statements.clear()
+        response = client.post(
+            f"/questions/{question_id}/answers/", json=sample_answer_data
+        )
+
+        assert response.status_code == 201
+        assert not any(s.lstrip().startswith("SELECT") for s in sql_statements)
+        assert client.get(f"/questions/{question_id}").json()["answers_count"] == 1
+
+        sql_statements.clear()
+        response = client.post("/questions/999/answers/", json=sample_answer_data)
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Вопрос не найден"
+        assert [s.split()[0] for s in sql_statements] == ["INSERT"]
+
     @pytest.mark.parametrize("invalid_text", ["", "   ", "\t\n"])
     def test_create_answer_invalid_text(
         self, client: TestClient, created_question, invalid_text
@@ -78,6 +100,90 @@ class TestAnswerCreation:
         assert data["text"] == answer_text
 
 
+class TestAnswerBulkCreation:
+    """Тесты массового создания ответов."""
+
+    def test_bulk_create_answers(self, client: TestClient, created_question):
+        """Тест создания нескольких ответов одним запросом."""
+        question_id = created_question["id"]
+        items = [{"user_id": i, "text": f"Ответ {i}"} for i in range(3)]
+        response = client.post(
+            f"/questions/{question_id}/answers/bulk", json={"items": items}
+        )
+
+        assert response.status_code == 201
+        created = response.json()["created"]
+        assert [a["user_id"] for a in created] == ["0", "1", "2"]
+        assert all(a["question_id"] == question_id for a in created)
+
+        question = client.get(f"/questions/{question_id}").json()
+        assert [a["id"] for a in question["answers"]] == [a["id"] for a in created]
+
+    def test_bulk_create_answers_partial(self, client: TestClient, created_question):
+        """Тест режима partial для ответов."""
+        question_id = created_question["id"]
+        items = [{"user_id": "", "text": "Ответ"}, {"user_id": "u", "text": "Ответ"}]
+        response = client.post(
+            f"/questions/{question_id}/answers/bulk",
+            json={"items": items, "mode": "partial"},
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert len(data["created"]) == 1
+        assert data["errors"][0]["index"] == 0
+
+    def test_bulk_create_answers_atomic_rejects_all(
+        self, client: TestClient, created_question
+    ):
+        """Тест режима atomic для ответов."""
+        question_id = created_question["id"]
+        items = [{"user_id": "u", "text": "Ответ"}, {"user_id": "u", "text": " "}]
+        response = client.post(
+            f"/questions/{question_id}/answers/bulk", json={"items": items}
+        )
+
+        assert response.status_code == 422
+        question = client.get(f"/questions/{question_id}").json()
+        assert question["answers"] == []
+
+    def test_bulk_create_answers_for_nonexistent_question(self, client: TestClient):
+        """Тест массового создания ответов к несуществующему вопросу."""
+        response = client.post(
+            "/questions/999/answers/bulk",
+            json={"items": [{"user_id": "u", "text": "Ответ"}]},
+        )
+        assert response.status_code == 404
+
+    def test_bulk_create_answers_checks_question_by_foreign_key(
+        self, client: TestClient, created_question, sql_statements
+    ):
+        """Тест: вопрос проверяется внешним ключом, без SELECT перед вставкой."""
+        items = [{"user_id": "u", "text": "Ответ"}] * 2
+
+        sql_statements.clear()
+        response = client.post(
+            f"/questions/{created_question['id']}/answers/bulk", json={"items": items}
+        )
+        assert response.status_code == 201
+        assert not any(s.lstrip().startswith("SELECT") for s in sql_statements)
+
+        sql_statements.clear()
+        response = client.post("/questions/999/answers/bulk", json={"items": items})
+        assert response.status_code == 404
+        assert [s.split()[0] for s in sql_statements] == ["INSERT"]
+
+    def test_bulk_create_nothing_valid_for_nonexistent_question(
+        self, client: TestClient
+    ):
+        """Тест: без допустимых ответов несуществующий вопрос — тоже 404."""
+        response = client.post(
+            "/questions/999/answers/bulk",
+            json={"items": [{"user_id": "", "text": "Ответ"}], "mode": "partial"},
+        )
+        assert response.status_code == 404
+
+
 class TestAnswerRetrieval:
     """Тесты получения ответов."""
 
@@ -118,6 +224,49 @@ class TestAnswerRetrieval:
         assert returned_answer_ids == expected_answer_ids
 
 
+class TestAnswerConditionalRequests:
+    """Тесты ETag и условных запросов для ответов."""
+
+    def test_answer_etag_and_not_modified(self, client: TestClient, created_answer):
+        """Тест: совпавший If-None-Match возвращает 304."""
+        answer_id = created_answer["id"]
+        etag = client.get(f"/answers/{answer_id}").headers["ETag"]
+
+        response = client.get(
+            f"/answers/{answer_id}", headers={"If-None-Match": f'W/{etag}, "other"'}
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+    def test_answer_not_modified_after_delete(self, client: TestClient, created_answer):
+        """Тест: для удаленного ответа старый ETag дает 404."""
+        answer_id = created_answer["id"]
+        etag = client.get(f"/answers/{answer_id}").headers["ETag"]
+        client.delete(f"/answers/{answer_id}")
+
+        response = client.get(f"/answers/{answer_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 404
+
+    def test_recreated_answer_with_reused_id_is_modified(
+        self, client: TestClient, created_answer
+    ):
+        """Тест: новый ответ с ID удаленного не совпадает с ним по ETag."""
+        answer_id = created_answer["id"]
+        etag = client.get(f"/answers/{answer_id}").headers["ETag"]
+        client.delete(f"/answers/{answer_id}")
+        recreated = client.post(
+            f"/questions/{created_answer['question_id']}/answers/",
+            json={"user_id": "other", "text": "Другой ответ"},
+        ).json()
+        assert recreated["id"] == answer_id
+
+        response = client.get(f"/answers/{answer_id}", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json()["text"] == "Другой ответ"
+        assert response.headers["ETag"] != etag
+
+
 class TestAnswerDeletion:
     """Тесты удаления ответов."""
 
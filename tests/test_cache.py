@@ -0,0 +1,296 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.questions_answers_api.core.cache import MemoryCache, RedisCache, get_cache
+from src.questions_answers_api.repositories import AnswerRepository, QuestionRepository
+from src.questions_answers_api.schemas import AnswerCreate
+from src.questions_answers_api.services import AnswerService, QuestionService
+from tests.conftest import TestingSessionLocal
+
+
+class TestMemoryCache:
+    """Тесты кэша в памяти процесса."""
+
+    def test_get_set_and_stats(self):
+        """Тест попаданий и промахов."""
+        cache = MemoryCache(max_entries=10, ttl=60)
+
+        async def scenario():
+            assert await cache.get("question:1", "page") is None
+            await cache.set("question:1", "page", b"data")
+            assert await cache.get("question:1", "page") == b"data"
+
+        asyncio.run(scenario())
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованных ключей."""
+        cache = MemoryCache(max_entries=2, ttl=60)
+
+        async def scenario():
+            await cache.set("a", "f", b"1")
+            await cache.set("b", "f", b"2")
+            await cache.get("a", "f")
+            await cache.set("c", "f", b"3")
+            return [await cache.get(key, "f") for key in ("a", "b", "c")]
+
+        assert asyncio.run(scenario()) == [b"1", None, b"3"]
+        assert cache.stats.evictions == 1
+
+    def test_ttl_expiration(self):
+        """Тест истечения времени жизни записи."""
+        cache = MemoryCache(max_entries=10, ttl=0)
+
+        async def scenario():
+            await cache.set("a", "f", b"1")
+            return await cache.get("a", "f")
+
+        assert asyncio.run(scenario()) is None
+        assert len(cache) == 0
+
+    def test_invalidate_removes_all_fields_and_links(self):
+        """Тест удаления всех полей ключа и записей, найденных по ссылке."""
+        cache = MemoryCache(max_entries=10, ttl=60)
+
+        async def scenario():
+            await cache.set("question:1", "page:20:", b"page")
+            await cache.set_linked("answer:5", "question:1", "answer:5", b"answer")
+            assert await cache.get_linked("answer:5", "answer:5") == b"answer"
+            await cache.invalidate("question:1")
+            return (
+                await cache.get("question:1", "page:20:"),
+                await cache.get_linked("answer:5", "answer:5"),
+            )
+
+        assert asyncio.run(scenario()) == (None, None)
+        assert cache.stats.invalidations == 1
+
+    def test_set_loses_to_later_invalidation(self):
+        """Тест: запись чтения, начатого до инвалидации, не попадает в кэш."""
+        cache = MemoryCache(max_entries=10, ttl=60)
+
+        async def scenario():
+            before = await cache.generation()
+            await cache.invalidate("question:1")
+            await cache.set("question:1", "version", b"1", before)
+            stale = await cache.get("question:1", "version")
+            await cache.set("question:1", "version", b"2", await cache.generation())
+            return stale, await cache.get("question:1", "version")
+
+        assert asyncio.run(scenario()) == (None, b"2")
+
+    def test_forgotten_invalidations_stay_conservative(self):
+        """Тест: вытесненная отметка инвалидации не пропускает старую запись."""
+        cache = MemoryCache(max_entries=1, ttl=60)
+
+        async def scenario():
+            before = await cache.generation()
+            await cache.invalidate("a")
+            await cache.invalidate("b")
+            await cache.set("a", "f", b"stale", before)
+            return await cache.get("a", "f")
+
+        assert asyncio.run(scenario()) is None
+
+
+class TestRedisCache:
+    """Тесты кэша Redis на локальной заглушке сервера."""
+
+    def test_redis_roundtrip_and_invalidation(self):
+        """Тест чтения, записи, TTL и инвалидации через протокол Redis."""
+        fakeredis = pytest.importorskip("fakeredis")
+        client = fakeredis.FakeAsyncRedis()
+        cache = RedisCache(client, ttl=30)
+
+        async def scenario():
+            await cache.set_linked("answer:5", "question:1", "answer:5", b"answer")
+            hit = await cache.get_linked("answer:5", "answer:5")
+            ttl = await client.pttl("qa:question:1")
+            await cache.invalidate("question:1")
+            miss = await cache.get_linked("answer:5", "answer:5")
+            return hit, ttl, miss
+
+        hit, ttl, miss = asyncio.run(scenario())
+        assert hit == b"answer"
+        assert 0 < ttl <= 30_000
+        assert miss is None
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_redis_set_loses_to_later_invalidation(self):
+        """Тест: в Redis запись тоже проигрывает инвалидации после начала чтения."""
+        fakeredis = pytest.importorskip("fakeredis")
+        cache = RedisCache(fakeredis.FakeAsyncRedis(), ttl=30)
+
+        async def scenario():
+            before = await cache.generation()
+            await cache.invalidate("question:1")
+            await cache.set_linked("answer:5", "question:1", "answer:5", b"old", before)
+            stale = await cache.get_linked("answer:5", "answer:5")
+            after = await cache.generation()
+            await cache.set_linked("answer:5", "question:1", "answer:5", b"new", after)
+            return stale, await cache.get_linked("answer:5", "answer:5")
+
+        assert asyncio.run(scenario()) == (None, b"new")
+
+
+def write_during_read(client: TestClient, monkeypatch, repo, method, write, read):
+    """Выполнить read, а write — сразу после того, как read прочитал базу.
+
+    Так запись фиксируется и инвалидирует кэш раньше, чем чтение сохраняет
+    прочитанное в кэш.
+    """
+    original = getattr(repo, method)
+
+    async def read_then_write(self, *args, **kwargs):
+        result = await original(self, *args, **kwargs)
+        async with TestingSessionLocal() as db:
+            await write(db)
+        return result
+
+    monkeypatch.setattr(repo, method, read_then_write)
+
+    async def run():
+        async with TestingSessionLocal() as db:
+            return await read(db)
+
+    try:
+        return client.portal.call(run)
+    finally:
+        monkeypatch.setattr(repo, method, original)
+
+
+def next_version(version: str) -> str:
+    """Версия для ETag после одного изменения вопроса."""
+    number, _, stamp = version.partition("-")
+    return f"{int(number) + 1}-{stamp}"
+
+
+class TestReadThroughCache:
+    """Тесты кэширования и инвалидации на уровне API."""
+
+    def test_question_served_from_cache(self, client: TestClient, created_question):
+        """Тест повторного чтения вопроса из кэша."""
+        question_id = created_question["id"]
+        first = client.get(f"/questions/{question_id}")
+        second = client.get(f"/questions/{question_id}")
+
+        assert first.json() == second.json()
+        stats = client.get("/admin/cache").json()
+        assert stats["backend"] == "memory"
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_create_answer_invalidates_question(
+        self, client: TestClient, created_question, sample_answer_data
+    ):
+        """Тест: новый ответ сразу виден в закэшированном вопросе."""
+        question_id = created_question["id"]
+        assert client.get(f"/questions/{question_id}").json()["answers"] == []
+
+        client.post(f"/questions/{question_id}/answers/", json=sample_answer_data)
+
+        answers = client.get(f"/questions/{question_id}").json()["answers"]
+        assert len(answers) == 1
+
+    def test_delete_answer_invalidates_answer_and_question(
+        self, client: TestClient, created_answer
+    ):
+        """Тест: удаленный ответ не возвращается из кэша."""
+        answer_id = created_answer["id"]
+        question_id = created_answer["question_id"]
+        assert client.get(f"/answers/{answer_id}").status_code == 200
+        assert len(client.get(f"/questions/{question_id}").json()["answers"]) == 1
+
+        assert client.delete(f"/answers/{answer_id}").status_code == 204
+
+        assert client.get(f"/answers/{answer_id}").status_code == 404
+        assert client.get(f"/questions/{question_id}").json()["answers"] == []
+
+    def test_delete_question_invalidates_its_answers(
+        self, client: TestClient, created_answer
+    ):
+        """Тест: удаление вопроса инвалидирует закэшированные ответы."""
+        answer_id = created_answer["id"]
+        question_id = created_answer["question_id"]
+        assert client.get(f"/answers/{answer_id}").status_code == 200
+        assert client.get(f"/answers/{answer_id}").status_code == 200
+        assert get_cache().stats.hits == 1
+
+        assert client.delete(f"/questions/{question_id}").status_code == 204
+
+        assert client.get(f"/questions/{question_id}").status_code == 404
+        assert client.get(f"/answers/{answer_id}").status_code == 404
+
+    def test_read_racing_new_answer_does_not_cache_old_version(
+        self, client: TestClient, monkeypatch, created_question, sample_answer_data
+    ):
+        """Тест: вопрос, прочитанный до нового ответа, не возвращается в кэш."""
+        question_id = created_question["id"]
+
+        def create_answer(db):
+            return AnswerService.create_answer(
+                db, question_id, AnswerCreate(**sample_answer_data)
+            )
+
+        version, _ = write_during_read(
+            client,
+            monkeypatch,
+            QuestionRepository,
+            "get_with_answers",
+            create_answer,
+            lambda db: QuestionService.get_question_by_id(db, question_id),
+        )
+
+        async def current_version():
+            async with TestingSessionLocal() as db:
+                return await QuestionService.get_question_version(db, question_id)
+
+        assert client.get(f"/questions/{question_id}").json()["answers_count"] == 1
+        assert client.portal.call(current_version) == next_version(version)
+
+    def test_version_read_racing_new_answer_is_not_cached(
+        self, client: TestClient, monkeypatch, created_question, sample_answer_data
+    ):
+        """Тест: версия для ETag, прочитанная до нового ответа, не кэшируется."""
+        question_id = created_question["id"]
+
+        def create_answer(db):
+            return AnswerService.create_answer(
+                db, question_id, AnswerCreate(**sample_answer_data)
+            )
+
+        old_version = write_during_read(
+            client,
+            monkeypatch,
+            QuestionRepository,
+            "get_version",
+            create_answer,
+            lambda db: QuestionService.get_question_version(db, question_id),
+        )
+
+        async def current_version():
+            async with TestingSessionLocal() as db:
+                return await QuestionService.get_question_version(db, question_id)
+
+        assert client.portal.call(current_version) == next_version(old_version)
+
+    def test_answer_read_racing_question_delete_is_not_cached(
+        self, client: TestClient, monkeypatch, created_answer
+    ):
+        """Тест: ответ, прочитанный до удаления вопроса, не возвращается в кэш."""
+        answer_id = created_answer["id"]
+        question_id = created_answer["question_id"]
+
+        write_during_read(
+            client,
+            monkeypatch,
+            AnswerRepository,
+            "get_by_id",
+            lambda db: QuestionService.delete_question(db, question_id),
+            lambda db: AnswerService.get_answer_by_id(db, answer_id),
+        )
+
+        assert client.get(f"/answers/{answer_id}").status_code == 404
@@ -0,0 +1,173 @@
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.questions_answers_api.core.compression import (
+    CODECS,
+    CompressedCache,
+    choose_encoding,
+)
+
+SERVER_ORDER = ["zstd", "br", "gzip"]
+
+
+@pytest.fixture
+def popular_question(client: TestClient, created_question):
+    """Фикстура: вопрос с ответами на несколько килобайт кириллицы."""
+    question_id = created_question["id"]
+    for i in range(20):
+        response = client.post(
+            f"/questions/{question_id}/answers/",
+            json={"user_id": f"user{i}", "text": f"Подробный ответ номер {i}. " * 5},
+        )
+        assert response.status_code == 201
+    return question_id
+
+
+def cache_hits() -> float:
+    return REGISTRY.get_sample_value("http_compression_cache_hits_total") or 0.0
+
+
+class TestChooseEncoding:
+    """Тесты выбора кодека по Accept-Encoding."""
+
+    @pytest.mark.parametrize(
+        "accept_encoding,expected",
+        [
+            ("gzip, deflate", "gzip"),
+            ("gzip, br, zstd", "zstd"),
+            ("br;q=0.5, gzip;q=1.0", "br"),
+            ("zstd;q=0, gzip", "gzip"),
+            ("*", "zstd"),
+            ("*;q=0, gzip", "gzip"),
+            ("identity", None),
+            ("", None),
+            ("gzip;q=0", None),
+        ],
+    )
+    def test_server_preference_among_accepted(self, accept_encoding, expected):
+        """Тест: выбирается первый кодек сервера, принятый клиентом."""
+        assert choose_encoding(accept_encoding, SERVER_ORDER) == expected
+
+    def test_compressed_cache_is_bounded_by_bytes(self):
+        """Тест: старые записи вытесняются, когда кэш превышает предел."""
+        cache = CompressedCache(max_bytes=10)
+        cache.set(("a",), b"12345")
+        cache.set(("b",), b"12345")
+        cache.get(("a",))
+        cache.set(("c",), b"12345")
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == b"12345"
+        assert cache.size == 10
+
+
+class TestCompressionMiddleware:
+    """Тесты сжатия ответов."""
+
+    def test_large_response_is_gzipped(self, client: TestClient, popular_question):
+        """Тест: большой ответ сжимается, содержимое то же, ETag слабый."""
+        url = f"/questions/{popular_question}"
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+        compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in plain.headers
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["vary"] == "Accept-Encoding"
+        assert int(compressed.headers["content-length"]) < len(plain.content) / 3
+        assert compressed.json() == plain.json()
+        assert compressed.headers["etag"] == "W/" + plain.headers["etag"]
+
+    def test_small_response_is_not_compressed(
+        self, client: TestClient, created_question
+    ):
+        """Тест: ответ меньше порога отдается как есть."""
+        response = client.get(
+            f"/questions/{created_question['id']}",
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_weak_etag_revalidates(self, client: TestClient, popular_question):
+        """Тест: слабый ETag сжатого ответа дает 304."""
+        url = f"/questions/{popular_question}"
+        etag = client.get(url, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+        response = client.get(
+            url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+
+    def test_unchanged_resource_is_compressed_once(
+        self, client: TestClient, popular_question
+    ):
+        """Тест: неизменный ответ берется из кэша сжатых, новая версия — нет."""
+        url = f"/questions/{popular_question}"
+        headers = {"Accept-Encoding": "gzip"}
+        first = client.get(url, headers=headers)
+        hits = cache_hits()
+        second = client.get(url, headers=headers)
+        assert cache_hits() == hits + 1
+        assert second.content == first.content
+
+        client.post(f"{url}/answers/", json={"user_id": "late", "text": "Новый ответ"})
+        third = client.get(url, headers=headers)
+        assert cache_hits() == hits + 1
+        assert third.headers["etag"] != first.headers["etag"]
+
+    def test_recreated_question_is_not_served_from_cache(self, client: TestClient):
+        """Тест: вопрос с ID удаленного не получает его сжатое тело."""
+        headers = {"Accept-Encoding": "gzip"}
+        deleted = client.post("/questions/", json={"text": "Старый вопрос." * 200})
+        url = f"/questions/{deleted.json()['id']}"
+        client.get(url, headers=headers)
+        client.delete(url)
+        text = "Новый вопрос." * 200
+        recreated = client.post("/questions/", json={"text": text})
+        assert recreated.json()["id"] == deleted.json()["id"]
+
+        response = client.get(url, headers=headers)
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["text"] == text
+
+    def test_export_is_streamed_compressed(self, client: TestClient, popular_question):
+        """Тест: выгрузка NDJSON сжимается потоком и читается целиком."""
+        plain = client.get("/export", headers={"Accept-Encoding": "identity"})
+
+        with client.stream(
+            "GET", "/export?batch_size=5", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            assert response.headers["content-encoding"] == "gzip"
+            assert "content-length" not in response.headers
+            raw = b"".join(response.iter_raw())
+
+        lines = gzip.decompress(raw).decode().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            json.loads(line) for line in plain.text.splitlines()
+        ]
+
+    @pytest.mark.parametrize(
+        "encoding,module", [("br", "brotli"), ("zstd", "zstandard")]
+    )
+    def test_optional_codecs(
+        self, client: TestClient, popular_question, encoding, module
+    ):
+        """Тест: br и zstd, если установлены их пакеты."""
+        pytest.importorskip(module)
+        codec = CODECS[encoding]()
+        url = f"/questions/{popular_question}"
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+
+        response = client.get(url, headers={"Accept-Encoding": encoding})
+
+        assert response.headers["content-encoding"] == encoding
+        assert response.json() == plain.json()
+        stream = codec.stream()
+        assert stream.compress(b"x" * 10) + stream.finish()
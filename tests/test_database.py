@@ -0,0 +1,33 @@
+import pytest
+
+from src.questions_answers_api.core.database import to_async_url
+
+
+class TestAsyncDatabaseUrl:
+    """Тесты выбора асинхронного драйвера."""
+
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            (
+                "postgresql://postgres:postgres@db:5432/qa",
+                "postgresql+asyncpg://postgres:postgres@db:5432/qa",
+            ),
+            (
+                "postgresql+psycopg2://postgres@localhost/qa",
+                "postgresql+asyncpg://postgres@localhost/qa",
+            ),
+            (
+                "sqlite:///./questions_answers.db",
+                "sqlite+aiosqlite:///./questions_answers.db",
+            ),
+            ("sqlite+aiosqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+            (
+                "mysql+aiomysql://root@localhost/qa",
+                "mysql+aiomysql://root@localhost/qa",
+            ),
+        ],
+    )
+    def test_to_async_url(self, url, expected):
+        """Тест замены драйвера в URL базы данных."""
+        assert to_async_url(url) == expected
@@ -0,0 +1,68 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from src.questions_answers_api.cli import export as export_cli
+from tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+def parse_ndjson(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode().splitlines()]
+
+
+class TestExport:
+    """Тесты потокового экспорта вопросов и ответов."""
+
+    def test_export_empty(self, client: TestClient):
+        """Тест экспорта пустой базы."""
+        response = client.get("/export")
+
+        assert response.status_code == 200
+        assert response.content == b""
+
+    def test_export_questions_with_answers(
+        self, client: TestClient, question_with_answers, multiple_questions
+    ):
+        """Тест: каждая строка — вопрос со всеми ответами, вопросы по ID."""
+        response = client.get("/export", params={"batch_size": 1})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = parse_ndjson(response.content)
+
+        question = question_with_answers["question"]
+        assert [line["id"] for line in lines] == [question["id"]] + [
+            q["id"] for q in multiple_questions
+        ]
+        assert lines[0]["text"] == question["text"]
+        assert lines[0]["answers"] == question_with_answers["answers"]
+        assert all(line["answers"] == [] for line in lines[1:])
+
+    def test_export_invalid_batch_size(self, client: TestClient):
+        """Тест валидации размера пачки."""
+        response = client.get("/export", params={"batch_size": 0})
+        assert response.status_code == 422
+
+
+class TestExportCli:
+    """Тесты консольной команды экспорта."""
+
+    def test_cli_writes_same_dump(
+        self, client: TestClient, question_with_answers, tmp_path
+    ):
+        """Тест: CLI пишет в файл ту же выгрузку, что и эндпоинт."""
+        output = tmp_path / "dump.ndjson"
+
+        export_cli.main(
+            [
+                "--url",
+                SQLALCHEMY_DATABASE_URL,
+                "--output",
+                str(output),
+                "--batch-size",
+                "2",
+            ]
+        )
+
+        assert output.read_bytes() == client.get("/export").content
+        assert len(parse_ndjson(output.read_bytes())) == 1
@@ -0,0 +1,131 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from src.questions_answers_api.core.health import (
+    HealthProber,
+    migration_heads,
+    readiness,
+    set_health_prober,
+)
+from tests.conftest import SQLALCHEMY_DATABASE_URL, engine
+
+
+@pytest.fixture
+def start_prober(client: TestClient):
+    """Фикстура: запуск фоновой проверки в цикле событий приложения."""
+    probers = []
+
+    def start(
+        url: str = SQLALCHEMY_DATABASE_URL, interval: float = 60, **options
+    ) -> HealthProber:
+        prober = HealthProber(url, interval=interval, **options)
+        client.portal.call(prober.start)
+        set_health_prober(prober)
+        probers.append(prober)
+        return prober
+
+    yield start
+    set_health_prober(None)
+    for prober in probers:
+        client.portal.call(prober.stop)
+
+
+class TestHealth:
+    """Тесты проверок живости и готовности."""
+
+    def test_liveness(self, client: TestClient):
+        """Тест: живость не зависит от базы."""
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    def test_ready_without_prober_checks_pool(self, client: TestClient):
+        """Тест: без фоновой проверки готовность определяет пул."""
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["pool"]["ok"] is True
+
+    def test_ready_with_database(self, client: TestClient, start_prober):
+        """Тест: доступная база — воркер готов."""
+        start_prober()
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["database"] == {"ok": True}
+
+    def test_unreachable_database_is_not_ready(
+        self, client: TestClient, tmp_path, start_prober
+    ):
+        """Тест: недоступная база — 503, живость при этом 200."""
+        start_prober(f"sqlite:///{tmp_path}/missing/dir/db.sqlite")
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+        assert response.json()["database"]["ok"] is False
+        assert client.get("/health/live").status_code == 200
+
+    def test_migrations_must_be_at_head(self, client: TestClient, start_prober):
+        """Тест: база без последней миграции не готова, после нее — готова."""
+        heads = migration_heads()
+        prober = start_prober(expected_heads=heads)
+
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["migrations"]["current"] == []
+        assert response.json()["migrations"]["head"] == sorted(heads)
+
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE alembic_version (version_num TEXT)"))
+            connection.execute(
+                text("INSERT INTO alembic_version VALUES (:head)"),
+                {"head": next(iter(heads))},
+            )
+        try:
+            client.portal.call(prober.check)
+            assert client.get("/health/ready").status_code == 200
+        finally:
+            with engine.begin() as connection:
+                connection.execute(text("DROP TABLE alembic_version"))
+
+    def test_stale_result_is_not_ready(self, client: TestClient, start_prober):
+        """Тест: давно не обновлявшийся результат не считается готовностью."""
+        prober = start_prober(interval=1)
+        prober.state.checked_at = time.monotonic() - 10
+
+        assert client.get("/health/ready").status_code == 503
+
+    def test_exhausted_pool_is_not_ready(self, tmp_path):
+        """Тест: все соединения пула заняты — воркер не готов до их возврата."""
+        pool_engine = create_engine(
+            f"sqlite:///{tmp_path}/pool.db",
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=1,
+        )
+        try:
+            with pool_engine.connect(), pool_engine.connect():
+                checks = readiness(pool_engine.pool)
+                assert checks["status"] == "not_ready"
+                assert checks["pool"] == {
+                    "ok": False,
+                    "checked_out": 2,
+                    "max_connections": 2,
+                }
+            assert readiness(pool_engine.pool)["status"] == "ready"
+        finally:
+            pool_engine.dispose()
+
+    def test_migration_heads(self, tmp_path):
+        """Тест: head миграций берется из alembic.ini рядом с кодом."""
+        assert len(migration_heads()) == 1
+        assert migration_heads(tmp_path / "alembic.ini") is None
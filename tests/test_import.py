@@ -0,0 +1,136 @@
+import json
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.questions_answers_api.cli import import_data
+from src.questions_answers_api.repositories import ImportRepository
+from src.questions_answers_api.services.import_service import utc_now
+from tests.conftest import SQLALCHEMY_DATABASE_URL, TestingSessionLocal
+
+
+def run_import(capsys, *args: str) -> dict:
+    import_data.main(["--url", SQLALCHEMY_DATABASE_URL, "--chunk-size", "2", *args])
+    return json.loads(capsys.readouterr().out)
+
+
+class TestNdjsonImport:
+    """Тесты импорта NDJSON."""
+
+    def test_import_export_roundtrip(
+        self, client: TestClient, question_with_answers, tmp_path, capsys
+    ):
+        """Тест: выгрузка, загруженная обратно, дает копии вопросов с новыми ID."""
+        dump = tmp_path / "dump.ndjson"
+        dump.write_bytes(client.get("/export").content)
+
+        stats = run_import(capsys, "ndjson", str(dump))
+
+        assert stats["questions"] == 1
+        assert stats["answers"] == 2
+        assert stats["rejected"] == 0
+        original, copy = [
+            json.loads(line) for line in client.get("/export").iter_lines()
+        ]
+        assert copy["id"] != original["id"]
+        assert copy["answers_count"] == original["answers_count"] == 2
+        assert copy["text"] == original["text"]
+        assert copy["created_at"] == original["created_at"]
+        assert [(a["user_id"], a["text"]) for a in copy["answers"]] == [
+            (a["user_id"], a["text"]) for a in original["answers"]
+        ]
+        assert {a["question_id"] for a in copy["answers"]} == {copy["id"]}
+
+    def test_invalid_lines_are_skipped(self, client: TestClient, tmp_path, capsys):
+        """Тест: строки, не прошедшие валидацию, пропускаются."""
+        dump = tmp_path / "dump.ndjson"
+        lines = [
+            {"text": "Первый", "answers": [{"user_id": "u1", "text": "Ответ"}]},
+            {"text": "   "},
+            "не json",
+            {"text": "Второй", "answers": [{"user_id": "", "text": "Ответ"}]},
+            {"text": "Третий", "created_at": "2020-01-01T03:00:00+03:00"},
+        ]
+        dump.write_text(
+            "\n".join(
+                json.dumps(line) if isinstance(line, dict) else line for line in lines
+            )
+        )
+
+        stats = run_import(capsys, "ndjson", str(dump))
+
+        assert (stats["questions"], stats["answers"], stats["rejected"]) == (2, 1, 3)
+        items = client.get("/questions/").json()["items"]
+        assert [q["text"] for q in items] == ["Третий", "Первый"]
+        assert items[0]["created_at"].startswith("2020-01-01T00:00:00")
+
+
+class TestCsvImport:
+    """Тесты импорта CSV."""
+
+    def test_import_csv_remaps_ids(
+        self, client: TestClient, created_question, tmp_path, capsys
+    ):
+        """Тест: ответы привязываются к новым ID вопросов по исходным ID."""
+        questions = tmp_path / "questions.csv"
+        questions.write_text(
+            "id,text,created_at\n"
+            "q-1,Первый,2021-05-01T10:00:00\n"
+            "q-2,Второй,\n"
+            "q-1,Дубликат,\n"
+            ",,\n"
+        )
+        answers = tmp_path / "answers.csv"
+        answers.write_text(
+            "question_id,user_id,text,created_at\n"
+            "q-2,u1,Ответ на второй,\n"
+            "q-1,u2,Ответ на первый,2021-05-02T10:00:00\n"
+            "q-1,u3,Еще ответ на первый,\n"
+            "q-9,u4,Вопроса нет,\n"
+            ",u5,Без вопроса,\n"
+        )
+
+        stats = run_import(capsys, "csv", str(questions), "--answers", str(answers))
+
+        assert (stats["questions"], stats["answers"], stats["rejected"]) == (2, 3, 4)
+        items = client.get("/questions/").json()["items"]
+        by_text = {q["text"]: q for q in items}
+        assert set(by_text) == {created_question["text"], "Первый", "Второй"}
+
+        first = client.get(f"/questions/{by_text['Первый']['id']}").json()
+        assert first["created_at"].startswith("2021-05-01T10:00:00")
+        assert [a["user_id"] for a in first["answers"]] == ["u2", "u3"]
+        assert first["answers_count"] == 2
+        second = client.get(f"/questions/{by_text['Второй']['id']}").json()
+        assert [a["text"] for a in second["answers"]] == ["Ответ на второй"]
+
+
+class TestQuestionIdReservation:
+    """Тесты выделения ID вопросов при импорте."""
+
+    def test_sqlite_reservation_holds_write_lock(self, client: TestClient):
+        """Тест: до фиксации импорта другие записи в SQLite ждут."""
+
+        async def reserve_and_write():
+            async with TestingSessionLocal() as db:
+                repo = ImportRepository(db)
+                ids = await repo.reserve_question_ids(2)
+                other = sqlite3.connect(
+                    SQLALCHEMY_DATABASE_URL.split("///")[1], timeout=0
+                )
+                try:
+                    with pytest.raises(sqlite3.OperationalError, match="locked"):
+                        other.execute("INSERT INTO questions (text) VALUES ('x')")
+                finally:
+                    other.close()
+                await repo.write_questions(
+                    [(question_id, "Вопрос", utc_now(), 0) for question_id in ids]
+                )
+                await db.commit()
+                return ids
+
+        ids = client.portal.call(reserve_and_write)
+
+        items = client.get("/questions/").json()["items"]
+        assert sorted(item["id"] for item in items) == ids
@@ -90,7 +90,7 @@ class TestAPIIntegration:
 
         all_questions_response = client.get("/questions/")
         assert all_questions_response.status_code == 200
-        all_questions = all_questions_response.json()
+        all_questions = all_questions_response.json()["items"]
         assert len(all_questions) == num_questions
 
         for question in created_questions:
@@ -210,9 +210,9 @@ class TestAPIPerformance:
                 )
                 assert response.status_code == 201
 
-        all_questions_response = client.get("/questions/")
+        all_questions_response = client.get("/questions/", params={"limit": 100})
         assert all_questions_response.status_code == 200
-        all_questions = all_questions_response.json()
+        all_questions = all_questions_response.json()["items"]
         assert len(all_questions) == batch_size
 
         for question_id in question_ids:
@@ -0,0 +1,123 @@
+import os
+import subprocess
+import sys
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+ROUTE = "/questions/{question_id}"
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsEndpoint:
+    """Тесты метрик Prometheus."""
+
+    def test_route_metrics_use_path_template(
+        self, client: TestClient, question_with_answers
+    ):
+        """Тест: запросы учитываются по шаблону маршрута и статусу."""
+        question_id = question_with_answers["question"]["id"]
+        labels = {"method": "GET", "route": ROUTE}
+        ok_before = sample("http_requests_total", status="200", **labels)
+        missing_before = sample("http_requests_total", status="404", **labels)
+        duration_before = sample("http_request_duration_seconds_count", **labels)
+        size_before = sample("http_response_size_bytes_sum", **labels)
+
+        response = client.get(f"/questions/{question_id}")
+        client.get("/questions/999")
+
+        assert sample("http_requests_total", status="200", **labels) == ok_before + 1
+        assert (
+            sample("http_requests_total", status="404", **labels) == missing_before + 1
+        )
+        assert (
+            sample("http_request_duration_seconds_count", **labels)
+            == duration_before + 2
+        )
+        assert sample("http_response_size_bytes_sum", **labels) >= size_before + len(
+            response.content
+        )
+
+    def test_request_size_and_db_queries(self, client: TestClient, created_question):
+        """Тест: учитываются размер тела запроса и запросы к базе."""
+        labels = {"method": "POST", "route": "/questions/{question_id}/answers/"}
+        body_before = sample("http_request_size_bytes_sum", **labels)
+        queries_before = sample("http_request_db_queries_sum", **labels)
+        count_before = sample("http_request_db_queries_count", **labels)
+
+        body = '{"user_id": "user1", "text": "Ответ"}'.encode()
+
+        response = client.post(
+            f"/questions/{created_question['id']}/answers/",
+            content=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == 201
+        assert sample("http_request_size_bytes_sum", **labels) == body_before + len(
+            body
+        )
+        assert sample("http_request_db_queries_count", **labels) == count_before + 1
+        assert sample("http_request_db_queries_sum", **labels) >= queries_before + 2
+        assert sample("http_request_db_seconds_count", **labels) >= 1
+
+    def test_unmatched_paths_share_label(self, client: TestClient):
+        """Тест: неизвестные пути не создают отдельных временных рядов."""
+        before = sample(
+            "http_requests_total", method="GET", route="<unmatched>", status="404"
+        )
+
+        client.get("/no/such/path")
+        client.get("/another/missing/path")
+
+        assert (
+            sample(
+                "http_requests_total", method="GET", route="<unmatched>", status="404"
+            )
+            == before + 2
+        )
+
+    def test_metrics_endpoint_exposition(self, client: TestClient):
+        """Тест: /metrics отдает метрики HTTP и пула в формате Prometheus."""
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+        assert "db_pool_max_connections" in body
+        assert "db_pool_wait_seconds_bucket" in body
+
+
+class TestMultiprocessMetrics:
+    """Тесты метрик при нескольких воркерах."""
+
+    def test_multiprocess_aggregation(self, tmp_path):
+        """Тест: значения нескольких процессов суммируются в /metrics."""
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        record = (
+            "from src.questions_answers_api.core.metrics import HTTP_REQUESTS;"
+            "HTTP_REQUESTS.labels('GET', '/health', '200').inc()"
+        )
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", record], env=env, check=True)
+
+        render = (
+            "from src.questions_answers_api.core.metrics import render_metrics;"
+            "print(render_metrics()[0].decode())"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", render],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+        assert 'http_requests_total{method="GET",route="/health",status="200"} 2.0' in (
+            output
+        )
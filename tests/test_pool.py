@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.questions_answers_api.core.pool import (
+    ObservedQueuePool,
+    PoolStats,
+    pool_options,
+    pool_status,
+)
+
+
+class TestPoolStats:
+    """Тесты счетчиков ожидания соединений."""
+
+    def test_histogram_is_cumulative(self):
+        """Тест накопительной гистограммы ожиданий."""
+        stats = PoolStats()
+        for seconds in (0.0005, 0.003, 0.003, 2.0, 100.0):
+            stats.observe(seconds)
+
+        histogram = stats.histogram()
+        assert histogram["0.001"] == 1
+        assert histogram["0.005"] == 3
+        assert histogram["5.0"] == 4
+        assert histogram["30.0"] == 4
+        assert histogram["+Inf"] == 5
+        assert stats.wait_seconds_max == 100.0
+
+
+class TestObservedQueuePool:
+    """Тесты пула соединений с наблюдением."""
+
+    def test_checkout_timeout_is_counted_and_logged(self, tmp_path, caplog):
+        """Тест: исчерпание пула дает таймаут, счетчик и событие в логе."""
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            **{
+                **pool_options(),
+                "pool_size": 1,
+                "max_overflow": 0,
+                "pool_timeout": 0.05,
+            },
+        )
+
+        async def scenario():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                status_in_use = pool_status(engine.pool)
+                gauge_in_use = REGISTRY.get_sample_value(
+                    "db_pool_connections", {"state": "checked_out"}
+                )
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+            await engine.dispose()
+            return status_in_use, gauge_in_use
+
+        status_in_use, gauge_in_use = asyncio.run(scenario())
+
+        assert isinstance(engine.pool, ObservedQueuePool)
+        assert status_in_use["checked_out"] == 1
+        assert status_in_use["size"] == 1
+        status = pool_status(engine.pool)
+        assert status["timeouts"] == 1
+        assert status["waits"] == 1
+        assert status["checked_out"] == 0
+        assert gauge_in_use == 1
+        assert REGISTRY.get_sample_value("db_pool_timeouts_total") >= 1
+        assert (
+            REGISTRY.get_sample_value("db_pool_connections", {"state": "checked_out"})
+            == 0
+        )
+        assert "Таймаут ожидания соединения из пула" in caplog.text
+
+
+class TestPoolStatsEndpoint:
+    """Тесты служебного эндпоинта статистики пула."""
+
+    def test_get_pool_stats(self, client: TestClient):
+        """Тест получения статистики пула приложения."""
+        response = client.get("/admin/pool")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["pool_class"] == "ObservedQueuePool"
+        assert data["size"] == pool_options()["pool_size"]
+        assert "+Inf" in data["wait_histogram"]
@@ -0,0 +1,161 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from src.questions_answers_api.core import metrics
+from src.questions_answers_api.core.metrics import (
+    MetricsMiddleware,
+    RequestUsage,
+    statement_shape,
+)
+from tests.conftest import async_engine
+
+
+class TestStatementShapes:
+    """Тесты группировки SQL-запросов по форме."""
+
+    @pytest.mark.parametrize(
+        "first,second",
+        [
+            ("SELECT 1 FROM t WHERE id IN (?, ?)", "SELECT 1 FROM t WHERE id IN (?)"),
+            (
+                "SELECT 1 FROM t WHERE id IN ($1::INTEGER, $2::INTEGER) AND x = $3",
+                "SELECT 1 FROM t WHERE id IN ($1::INTEGER) AND x = $2",
+            ),
+            ("SELECT 1\n  FROM t", "SELECT 1 FROM t"),
+        ],
+    )
+    def test_same_shape(self, first, second):
+        """Тест: запросы, различающиеся только параметрами, имеют одну форму."""
+        assert statement_shape(first) == statement_shape(second)
+
+    def test_repeated_queries(self):
+        """Тест подсчета повторов одной формы."""
+        usage = RequestUsage(
+            db_queries=4,
+            statements={
+                "SELECT a FROM t WHERE id IN (?)": 1,
+                "SELECT a FROM t WHERE id IN (?, ?)": 2,
+                "UPDATE t SET a = ?": 1,
+            },
+        )
+
+        assert usage.shapes() == {
+            "SELECT a FROM t WHERE id IN (?...)": 3,
+            "UPDATE t SET a = ?": 1,
+        }
+        assert usage.repeated_queries() == 2
+
+
+class TestEndpointQueryBudgets:
+    """Бюджеты SQL-запросов эндпоинтов: рост числа запросов — регрессия."""
+
+    def test_question_reads(
+        self, client: TestClient, question_with_answers, query_budget
+    ):
+        """Тест: чтение вопросов — один запрос, повторное — из кэша."""
+        question_id = question_with_answers["question"]["id"]
+        with query_budget(1):
+            client.get("/questions/")
+            client.get("/questions/", params={"sort": "answers_count"})
+            client.get("/questions/search", params={"q": "Ответ"})
+            client.get(f"/questions/{question_id}")
+        with query_budget(0):
+            client.get(f"/questions/{question_id}")
+            client.get(
+                f"/questions/{question_id}", headers={"If-None-Match": '"stale"'}
+            )
+
+    def test_question_writes(self, client: TestClient, created_question, query_budget):
+        """Тест бюджетов создания и удаления вопроса."""
+        with query_budget(1):
+            client.post("/questions/", json={"text": "Новый вопрос"})
+        with query_budget(1):
+            client.delete(f"/questions/{created_question['id']}")
+
+    def test_answer_endpoints(self, client: TestClient, created_question, query_budget):
+        """Тест бюджетов эндпоинтов ответов."""
+        question_id = created_question["id"]
+        with query_budget(2):
+            answer = client.post(
+                f"/questions/{question_id}/answers/",
+                json={"user_id": "user1", "text": "Ответ"},
+            ).json()
+        with query_budget(1):
+            client.get(f"/answers/{answer['id']}")
+        with query_budget(2):
+            client.delete(f"/answers/{answer['id']}")
+
+    def test_export_is_single_query(
+        self, client: TestClient, question_with_answers, query_budget
+    ):
+        """Тест: выгрузка читает вопросы с ответами одним запросом."""
+        client.post("/questions/", json={"text": "Вопрос без ответов"})
+        with query_budget(1):
+            client.get("/export")
+
+
+class TestRepeatedQueryDetection:
+    """Тесты обнаружения N+1 и отладочных заголовков."""
+
+    @pytest.fixture
+    def n_plus_one_client(self, client):
+        """Клиент приложения с эндпоинтом, повторяющим один запрос."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items")
+        async def items(count: int = 3):
+            async with async_engine.connect() as connection:
+                for item_id in range(count):
+                    await connection.execute(text("SELECT :id AS id"), {"id": item_id})
+            return {"count": count}
+
+        return TestClient(app)
+
+    def test_repeated_queries_are_logged(self, n_plus_one_client, caplog):
+        """Тест: повтор формы запроса не меньше порога пишется в лог и метрики."""
+        labels = {"method": "GET", "route": "/items"}
+        before = (
+            REGISTRY.get_sample_value("http_request_repeated_queries_total", labels)
+            or 0.0
+        )
+
+        with caplog.at_level(logging.WARNING, logger=metrics.__name__):
+            n_plus_one_client.get("/items", params={"count": 2})
+            assert "N+1" not in caplog.text
+            n_plus_one_client.get("/items", params={"count": 3})
+
+        assert "Возможный N+1 в GET /items: 3 × SELECT ? AS id" in caplog.text
+        assert (
+            REGISTRY.get_sample_value("http_request_repeated_queries_total", labels)
+            == before + 1
+        )
+
+    def test_debug_headers(self, n_plus_one_client, monkeypatch):
+        """Тест: в режиме отладки число запросов передается в заголовках."""
+        response = n_plus_one_client.get("/items")
+        assert "X-DB-Queries" not in response.headers
+
+        monkeypatch.setattr(metrics, "SQL_DEBUG_HEADERS", True)
+        response = n_plus_one_client.get("/items", params={"count": 4})
+
+        assert response.headers["X-DB-Queries"] == "4"
+        assert response.headers["X-DB-Repeated-Queries"] == "3"
+
+    def test_query_budget_fixture_reports_violation(
+        self, n_plus_one_client, query_budget
+    ):
+        """Тест: фикстура бюджета падает с перечнем запросов."""
+        with pytest.raises(AssertionError, match="3 запросов к базе при бюджете 2"):
+            with query_budget(2):
+                n_plus_one_client.get("/items")
+        with pytest.raises(AssertionError, match="повторяющиеся запросы"):
+            with query_budget(5):
+                n_plus_one_client.get("/items")
+        with query_budget(5, allow_repeats=True):
+            n_plus_one_client.get("/items")
@@ -45,6 +45,50 @@ class TestQuestionCreation:
         assert data["text"] == question_text
 
 
+class TestQuestionBulkCreation:
+    """Тесты массового создания вопросов."""
+
+    def test_bulk_create_questions(self, client: TestClient):
+        """Тест создания нескольких вопросов одним запросом."""
+        items = [{"text": f"  Вопрос {i}  "} for i in range(5)]
+        response = client.post("/questions/bulk", json={"items": items})
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["errors"] == []
+        assert [q["text"] for q in data["created"]] == [f"Вопрос {i}" for i in range(5)]
+
+        page = client.get("/questions/").json()
+        assert [q["id"] for q in page["items"]] == [q["id"] for q in data["created"]]
+
+    def test_bulk_create_questions_atomic_rejects_all(self, client: TestClient):
+        """Тест режима atomic: ошибка одного элемента отменяет весь запрос."""
+        items = [{"text": "Валидный"}, {"text": "   "}, {"wrong": 1}]
+        response = client.post("/questions/bulk", json={"items": items})
+
+        assert response.status_code == 422
+        assert [error["index"] for error in response.json()["detail"]] == [1, 2]
+        assert client.get("/questions/").json()["items"] == []
+
+    def test_bulk_create_questions_partial(self, client: TestClient):
+        """Тест режима partial: создаются только валидные элементы."""
+        items = [{"text": "Первый"}, {"text": ""}, {"text": "Третий"}]
+        response = client.post(
+            "/questions/bulk", json={"items": items, "mode": "partial"}
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert [q["text"] for q in data["created"]] == ["Первый", "Третий"]
+        assert [error["index"] for error in data["errors"]] == [1]
+
+    @pytest.mark.parametrize("items", [[], [{"text": "x"}] * 1001])
+    def test_bulk_create_questions_size_limits(self, client: TestClient, items):
+        """Тест ограничений на размер массового запроса."""
+        response = client.post("/questions/bulk", json={"items": items})
+        assert response.status_code == 422
+
+
 class TestQuestionRetrieval:
     """Тесты получения вопросов."""
 
@@ -54,7 +98,7 @@ class TestQuestionRetrieval:
 
         assert response.status_code == 200
         data = response.json()
-        assert data == []
+        assert data == {"items": [], "next_cursor": None}
 
     def test_get_all_questions_with_data(self, client: TestClient, multiple_questions):
         """Тест получения списка вопросов с данными."""
@@ -62,12 +106,103 @@ class TestQuestionRetrieval:
 
         assert response.status_code == 200
         data = response.json()
-        assert len(data) == len(multiple_questions)
+        assert len(data["items"]) == len(multiple_questions)
+        assert data["next_cursor"] is None
 
         created_ids = {q["id"] for q in multiple_questions}
-        returned_ids = {q["id"] for q in data}
+        returned_ids = {q["id"] for q in data["items"]}
         assert created_ids == returned_ids
 
+    def test_get_questions_paginated(self, client: TestClient, multiple_questions):
+        """Тест обхода списка вопросов по курсору."""
+        returned_ids = []
+        cursor = None
+        for _ in range(len(multiple_questions)):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/questions/", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert len(data["items"]) <= 2
+            returned_ids.extend(q["id"] for q in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert cursor is None
+        assert returned_ids == [q["id"] for q in multiple_questions]
+
+    @pytest.mark.parametrize("limit", [0, -1, 101])
+    def test_get_questions_invalid_limit(self, client: TestClient, limit):
+        """Тест ограничения размера страницы."""
+        response = client.get("/questions/", params={"limit": limit})
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize("cursor", ["garbage", "W10", "WyJ4IiwxXQ"])
+    def test_get_questions_invalid_cursor(self, client: TestClient, cursor):
+        """Тест получения страницы с некорректным курсором."""
+        response = client.get("/questions/", params={"cursor": cursor})
+        assert response.status_code == 400
+
+    def test_get_questions_sorted_by_answers_count(
+        self, client: TestClient, multiple_questions
+    ):
+        """Тест обхода списка вопросов по убыванию количества ответов."""
+        first, second, third = (q["id"] for q in multiple_questions)
+        for question_id, count in ((second, 2), (third, 1)):
+            for i in range(count):
+                client.post(
+                    f"/questions/{question_id}/answers/",
+                    json={"user_id": f"user{i}", "text": f"Ответ {i}"},
+                )
+
+        returned = []
+        params = {"limit": 1, "sort": "answers_count"}
+        while True:
+            response = client.get("/questions/", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            returned.extend((q["id"], q["answers_count"]) for q in data["items"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        assert returned == [(second, 2), (third, 1), (first, 0)]
+
+    def test_get_questions_sort_cursor_mismatch(
+        self, client: TestClient, multiple_questions
+    ):
+        """Тест: курсор одного порядка не принимается для другого."""
+        cursor = client.get("/questions/", params={"limit": 1}).json()["next_cursor"]
+        response = client.get(
+            "/questions/", params={"cursor": cursor, "sort": "answers_count"}
+        )
+        assert response.status_code == 400
+
+        response = client.get("/questions/", params={"sort": "text"})
+        assert response.status_code == 422
+
+    def test_answers_count_follows_answers(self, client: TestClient, created_question):
+        """Тест: answers_count меняется при создании и удалении ответов."""
+        question_id = created_question["id"]
+        assert created_question["answers_count"] == 0
+
+        answer = client.post(
+            f"/questions/{question_id}/answers/",
+            json={"user_id": "user1", "text": "Ответ"},
+        ).json()
+        client.post(
+            f"/questions/{question_id}/answers/bulk",
+            json={"items": [{"user_id": "user2", "text": "Еще"}] * 3},
+        )
+        assert client.get(f"/questions/{question_id}").json()["answers_count"] == 4
+
+        client.delete(f"/answers/{answer['id']}")
+        data = client.get(f"/questions/{question_id}").json()
+        assert data["answers_count"] == len(data["answers"]) == 3
+        assert client.get("/questions/").json()["items"][0]["answers_count"] == 3
+
     def test_get_question_by_id_success(self, client: TestClient, created_question):
         """Тест успешного получения вопроса по ID."""
         question_id = created_question["id"]
@@ -93,6 +228,220 @@ class TestQuestionRetrieval:
         assert response.status_code == 200
         data = response.json()
         assert len(data["answers"]) == len(question_with_answers["answers"])
+        assert data["answers_next_cursor"] is None
+
+    def test_get_question_answers_paginated(self, client: TestClient, created_question):
+        """Тест постраничного получения ответов на вопрос."""
+        question_id = created_question["id"]
+        answer_ids = []
+        for i in range(5):
+            response = client.post(
+                f"/questions/{question_id}/answers/",
+                json={"user_id": f"user{i}", "text": f"Ответ {i}"},
+            )
+            assert response.status_code == 201
+            answer_ids.append(response.json()["id"])
+
+        returned_ids = []
+        params = {"answers_limit": 2}
+        while True:
+            response = client.get(f"/questions/{question_id}", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["id"] == question_id
+            assert len(data["answers"]) <= 2
+            returned_ids.extend(a["id"] for a in data["answers"])
+            if data["answers_next_cursor"] is None:
+                break
+            params["answers_cursor"] = data["answers_next_cursor"]
+
+        assert returned_ids == answer_ids
+
+    def test_get_question_answers_invalid_params(
+        self, client: TestClient, created_question
+    ):
+        """Тест некорректных параметров страницы ответов."""
+        question_id = created_question["id"]
+
+        response = client.get(
+            f"/questions/{question_id}", params={"answers_limit": 101}
+        )
+        assert response.status_code == 422
+
+        response = client.get(
+            f"/questions/{question_id}", params={"answers_cursor": "garbage"}
+        )
+        assert response.status_code == 400
+
+
+class TestQuestionSearch:
+    """Тесты полнотекстового поиска вопросов."""
+
+    @pytest.fixture
+    def corpus(self, client: TestClient):
+        """Вопросы, на которые поиск отвечает по-разному."""
+        texts = [
+            "Как настроить индекс в PostgreSQL?",
+            "Что такое индекс покрытия?",
+            "Как сварить кофе?",
+        ]
+        questions = [
+            client.post("/questions/", json={"text": text}).json() for text in texts
+        ]
+        client.post(
+            f"/questions/{questions[2]['id']}/answers/",
+            json={"user_id": "barista", "text": "Нужен хороший индекс помола"},
+        )
+        return questions
+
+    def test_search_by_question_and_answer_text(self, client: TestClient, corpus):
+        """Тест: совпадения в вопросе ранжируются выше совпадений в ответах."""
+        response = client.get("/questions/search", params={"q": "индекс"})
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert {item["id"] for item in items} == {q["id"] for q in corpus}
+        assert items[-1]["id"] == corpus[2]["id"]
+        ranks = [item["rank"] for item in items]
+        assert ranks == sorted(ranks, reverse=True)
+        assert response.json()["next_cursor"] is None
+
+    def test_search_requires_all_words(self, client: TestClient, corpus):
+        """Тест: находятся только вопросы со всеми словами запроса."""
+        response = client.get("/questions/search", params={"q": "индекс PostgreSQL"})
+
+        assert [item["id"] for item in response.json()["items"]] == [corpus[0]["id"]]
+
+    def test_search_pagination(self, client: TestClient, corpus):
+        """Тест постраничного обхода результатов поиска."""
+        seen = []
+        cursor = None
+        while True:
+            params = {"q": "индекс", "limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/questions/search", params=params).json()
+            seen += [item["id"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        full = client.get("/questions/search", params={"q": "индекс"}).json()
+        assert seen == [item["id"] for item in full["items"]]
+
+    def test_search_ignores_deleted(self, client: TestClient, corpus):
+        """Тест: удаленные вопросы и ответы не находятся."""
+        client.delete(f"/questions/{corpus[0]['id']}")
+        answer = client.get(f"/questions/{corpus[2]['id']}").json()["answers"][0]
+        client.delete(f"/answers/{answer['id']}")
+
+        response = client.get("/questions/search", params={"q": "индекс"})
+
+        assert [item["id"] for item in response.json()["items"]] == [corpus[1]["id"]]
+
+    @pytest.mark.parametrize("query", ['"индекс* AND (', "-", "NEAR(a b)"])
+    def test_search_query_syntax_is_safe(self, client: TestClient, corpus, query):
+        """Тест: служебные символы в запросе не приводят к ошибке."""
+        response = client.get("/questions/search", params={"q": query})
+        assert response.status_code == 200
+
+    def test_search_validation(self, client: TestClient):
+        """Тест валидации параметров поиска."""
+        assert client.get("/questions/search").status_code == 422
+        assert client.get("/questions/search", params={"q": ""}).status_code == 422
+        response = client.get("/questions/search", params={"q": "a", "cursor": "xx"})
+        assert response.status_code == 400
+
+
+class TestQuestionConditionalRequests:
+    """Тесты ETag и условных запросов для вопросов."""
+
+    def test_question_etag_and_not_modified(
+        self, client: TestClient, created_question, sql_statements
+    ):
+        """Тест: совпавший If-None-Match возвращает 304 без загрузки ответов."""
+        question_id = created_question["id"]
+        response = client.get(f"/questions/{question_id}")
+        etag = response.headers["ETag"]
+        assert etag.startswith('"') and etag.endswith('"')
+
+        sql_statements.clear()
+        response = client.get(
+            f"/questions/{question_id}", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+        assert not any("answers" in statement for statement in sql_statements)
+
+    def test_question_etag_changes_with_answers(
+        self, client: TestClient, created_question, sample_answer_data
+    ):
+        """Тест: добавление и удаление ответа меняет ETag вопроса."""
+        question_id = created_question["id"]
+        etag = client.get(f"/questions/{question_id}").headers["ETag"]
+
+        answer = client.post(
+            f"/questions/{question_id}/answers/", json=sample_answer_data
+        ).json()
+        response = client.get(
+            f"/questions/{question_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert len(response.json()["answers"]) == 1
+        etag_after_create = response.headers["ETag"]
+        assert etag_after_create != etag
+
+        client.delete(f"/answers/{answer['id']}")
+        response = client.get(
+            f"/questions/{question_id}", headers={"If-None-Match": etag_after_create}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] not in (etag, etag_after_create)
+
+    def test_question_not_modified_for_deleted_question(
+        self, client: TestClient, created_question
+    ):
+        """Тест: для удаленного вопроса старый ETag дает 404."""
+        question_id = created_question["id"]
+        etag = client.get(f"/questions/{question_id}").headers["ETag"]
+        client.delete(f"/questions/{question_id}")
+
+        response = client.get(
+            f"/questions/{question_id}", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 404
+
+    def test_recreated_question_with_reused_id_is_modified(
+        self, client: TestClient, created_question
+    ):
+        """Тест: новый вопрос с ID удаленного не совпадает с ним по ETag."""
+        question_id = created_question["id"]
+        etag = client.get(f"/questions/{question_id}").headers["ETag"]
+        client.delete(f"/questions/{question_id}")
+        recreated = client.post("/questions/", json={"text": "Другой вопрос"}).json()
+        assert recreated["id"] == question_id
+
+        response = client.get(
+            f"/questions/{question_id}", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["text"] == "Другой вопрос"
+        assert response.headers["ETag"] != etag
+
+    def test_questions_list_etag(self, client: TestClient, multiple_questions):
+        """Тест условных запросов для списка вопросов."""
+        etag = client.get("/questions/").headers["ETag"]
+
+        response = client.get("/questions/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        client.post("/questions/", json={"text": "Новый вопрос"})
+        response = client.get("/questions/", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
 
 
 class TestQuestionDeletion:
@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.questions_answers_api.core.database import Base
+from src.questions_answers_api.core.replicas import (
+    READ_YOUR_WRITES_COOKIE,
+    ReplicaSet,
+    parse_urls,
+    set_replicas,
+)
+from src.questions_answers_api.models import Question
+
+
+@pytest.fixture
+def replica_urls(tmp_path):
+    """Фикстура: две реплики — отдельные файлы SQLite со схемой."""
+    urls = [f"sqlite:///{tmp_path}/replica{i}.db" for i in range(2)]
+    for url in urls:
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        engine.dispose()
+    return urls
+
+
+@pytest.fixture
+def replicas(client, replica_urls):
+    """Фикстура: приложение читает с реплик (запись — в основную базу)."""
+    replica_set = ReplicaSet.from_urls(replica_urls)
+    set_replicas(replica_set)
+    yield replica_set
+    set_replicas(None)
+    asyncio.run(replica_set.dispose())
+
+
+def seed_replica(url: str, text: str) -> None:
+    """Записать вопрос напрямую в реплику, в обход приложения."""
+    engine = create_engine(url)
+    with Session(engine) as db:
+        db.add(Question(text=text))
+        db.commit()
+    engine.dispose()
+
+
+def question_texts(client: TestClient) -> list[str]:
+    return [q["text"] for q in client.get("/questions/").json()["items"]]
+
+
+class TestReadReplicas:
+    """Тесты маршрутизации чтений на реплики."""
+
+    def test_parse_urls(self):
+        """Тест разбора списка реплик через запятую."""
+        assert parse_urls("") == []
+        assert parse_urls(" sqlite:///a.db , sqlite:///b.db,") == [
+            "sqlite:///a.db",
+            "sqlite:///b.db",
+        ]
+
+    def test_reads_go_to_replicas_round_robin(
+        self, client: TestClient, replicas, replica_urls
+    ):
+        """Тест: GET читает с реплик по очереди, а не из основной базы."""
+        seed_replica(replica_urls[0], "С первой реплики")
+        seed_replica(replica_urls[1], "Со второй реплики")
+        client.post("/questions/", json={"text": "В основной базе"})
+        client.cookies.clear()
+
+        texts = [question_texts(client) for _ in range(4)]
+
+        assert texts == [
+            ["С первой реплики"],
+            ["Со второй реплики"],
+            ["С первой реплики"],
+            ["Со второй реплики"],
+        ]
+
+    def test_writes_go_to_primary_and_pin_reads(
+        self, client: TestClient, replicas, replica_urls
+    ):
+        """Тест: после записи чтения клиента идут в основную базу."""
+        response = client.post("/questions/", json={"text": "Новый вопрос"})
+
+        assert response.status_code == 201
+        assert READ_YOUR_WRITES_COOKIE in response.cookies
+        assert question_texts(client) == ["Новый вопрос"]
+
+        client.cookies.clear()
+        assert question_texts(client) == []
+
+    def test_expired_pin_reads_from_replica(self, client: TestClient, replicas):
+        """Тест: по истечении окна чтения снова идут на реплики."""
+        client.post("/questions/", json={"text": "Новый вопрос"})
+        client.cookies.set(READ_YOUR_WRITES_COOKIE, str(time.time() - 1))
+
+        assert question_texts(client) == []
+
+    def test_failed_write_does_not_pin(self, client: TestClient, replicas):
+        """Тест: неуспешная запись не закрепляет чтения за основной базой."""
+        response = client.post(
+            "/questions/999/answers/", json={"user_id": "u", "text": "Ответ"}
+        )
+
+        assert response.status_code == 404
+        assert READ_YOUR_WRITES_COOKIE not in response.cookies
+
+    def test_pinned_read_skips_stale_cache(
+        self, client: TestClient, replicas, replica_urls
+    ):
+        """Тест: кэш, заполненный с отстающей реплики, не скрывает свою запись."""
+        question_id = client.post("/questions/", json={"text": "Вопрос"}).json()["id"]
+        for url in replica_urls:
+            seed_replica(url, "Вопрос")
+        client.post(
+            f"/questions/{question_id}/answers/",
+            json={"user_id": "u", "text": "Ответ"},
+        )
+        pin = client.cookies.get(READ_YOUR_WRITES_COOKIE)
+
+        client.cookies.clear()
+        stale = client.get(f"/questions/{question_id}").json()
+        client.cookies.set(READ_YOUR_WRITES_COOKIE, pin)
+        fresh = client.get(f"/questions/{question_id}").json()
+
+        assert stale["answers"] == []
+        assert [a["text"] for a in fresh["answers"]] == ["Ответ"]
+
+    def test_no_pin_without_replicas(self, client: TestClient):
+        """Тест: без реплик cookie не ставится."""
+        response = client.post("/questions/", json={"text": "Вопрос"})
+
+        assert READ_YOUR_WRITES_COOKIE not in response.cookies
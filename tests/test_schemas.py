@@ -49,12 +49,14 @@ class TestQuestionSchemas:
             "id": 1,
             "text": "Тестовый вопрос",
             "created_at": datetime.now(),
+            "answers_count": 3,
         }
         schema = QuestionResponse(**data)
 
         assert schema.id == 1
         assert schema.text == "Тестовый вопрос"
         assert isinstance(schema.created_at, datetime)
+        assert schema.answers_count == 3
 
     def test_question_with_answers_schema(self):
         """Тест схемы вопроса с ответами."""
@@ -70,6 +72,7 @@ class TestQuestionSchemas:
             "id": 1,
             "text": "Тестовый вопрос",
             "created_at": datetime.now(),
+            "answers_count": 1,
             "answers": [answer_data],
         }
 
@@ -236,6 +239,7 @@ class TestSchemaValidation:
             "id": 1,
             "text": "Вопрос с датой",
             "created_at": now,
+            "answers_count": 0,
         }
         question_schema = QuestionResponse(**question_data)
         assert question_schema.created_at == now
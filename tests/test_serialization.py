@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.questions_answers_api.core.serialization import (
+    QUESTION_EXPORT,
+    QUESTION_PAGE,
+    QUESTION_SEARCH_PAGE,
+    QUESTION_WITH_ANSWERS,
+    FastJSONResponse,
+)
+from src.questions_answers_api.schemas import (
+    QuestionExport,
+    QuestionPage,
+    QuestionSearchPage,
+    QuestionWithAnswers,
+)
+
+QUESTION = {
+    "id": 1,
+    "text": "Что такое\n«индекс»?",
+    "created_at": datetime(2024, 1, 2, 3, 4, 5, 678901),
+    "answers_count": 1,
+    "version": 3,
+}
+ANSWER = {
+    "id": 7,
+    "question_id": 1,
+    "user_id": "user1",
+    "text": 'Ответ с "кавычками"',
+    "created_at": datetime(2024, 1, 2, 3, 4, 6),
+}
+
+
+class TestFastSerialization:
+    """Тесты быстрой сериализации: JSON совпадает со схемами ответов."""
+
+    @pytest.mark.parametrize(
+        "adapter,schema,data",
+        [
+            (
+                QUESTION_PAGE,
+                QuestionPage,
+                {"items": [QUESTION], "next_cursor": "abc"},
+            ),
+            (
+                QUESTION_SEARCH_PAGE,
+                QuestionSearchPage,
+                {"items": [{**QUESTION, "rank": 0.5}], "next_cursor": None},
+            ),
+            (
+                QUESTION_WITH_ANSWERS,
+                QuestionWithAnswers,
+                {**QUESTION, "answers": [ANSWER], "answers_next_cursor": None},
+            ),
+            (QUESTION_EXPORT, QuestionExport, {**QUESTION, "answers": [ANSWER]}),
+        ],
+    )
+    def test_same_json_as_schema(self, adapter, schema, data):
+        """Тест: адаптер кодирует словари так же, как схема — объекты."""
+        expected = schema.model_validate(data).model_dump(mode="json")
+
+        assert json.loads(adapter.dump_json(data)) == expected
+
+    def test_response_passes_bytes_through(self):
+        """Тест: готовые байты отдаются без перекодирования."""
+        assert FastJSONResponse(b'{"a":1}').body == b'{"a":1}'
+        assert FastJSONResponse({"a": [1, None]}).body == b'{"a":[1,null]}'
+
+    def test_cached_question_is_same_json(
+        self, client: TestClient, question_with_answers
+    ):
+        """Тест: вопрос из кэша совпадает с первым ответом побайтно."""
+        question_id = question_with_answers["question"]["id"]
+
+        first = client.get(f"/questions/{question_id}")
+        second = client.get(f"/questions/{question_id}")
+
+        assert first.content == second.content
+        assert first.headers["ETag"] == second.headers["ETag"]
+        assert "version" not in first.json()
+        assert first.headers["content-type"] == "application/json"
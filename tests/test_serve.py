@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.questions_answers_api.cli.serve import (
+    available_cpus,
+    configure_environment,
+    prepare_metrics_dir,
+    worker_count,
+)
+from src.questions_answers_api.core.pool import split_connections
+from src.questions_answers_api.main import app, warm_up
+from tests.conftest import async_engine
+
+
+class TestServe:
+    """Тесты запуска сервиса с несколькими воркерами."""
+
+    @pytest.mark.parametrize(
+        "cpu_max,expected",
+        [
+            ("max 100000", 4),
+            ("200000 100000", 2),
+            ("150000 100000", 2),
+            ("1 100000", 1),
+        ],
+    )
+    def test_available_cpus_respects_cgroup_quota(
+        self, tmp_path, monkeypatch, cpu_max, expected
+    ):
+        """Тест: квота cgroup ограничивает число CPU сверху."""
+        monkeypatch.setattr(os, "sched_getaffinity", lambda pid: {0, 1, 2, 3})
+        path = tmp_path / "cpu.max"
+        path.write_text(cpu_max + "\n")
+
+        assert available_cpus(path) == expected
+        assert available_cpus(tmp_path / "missing") == 4
+
+    def test_worker_count(self, monkeypatch):
+        """Тест: --workers важнее WEB_CONCURRENCY, а он — числа CPU."""
+        monkeypatch.setenv("WEB_CONCURRENCY", "3")
+        assert worker_count(5) == 5
+        assert worker_count() == 3
+        monkeypatch.delenv("WEB_CONCURRENCY")
+        assert worker_count() == available_cpus()
+
+    @pytest.mark.parametrize(
+        "max_connections,workers,expected",
+        [(100, 4, (5, 10)), (40, 4, (5, 5)), (12, 4, (3, 0)), (4, 4, (1, 0))],
+    )
+    def test_split_connections(self, max_connections, workers, expected):
+        """Тест: воркеры вместе не превышают предел соединений."""
+        pool_size, max_overflow = split_connections(
+            max_connections, workers, pool_size=5, max_overflow=10
+        )
+
+        assert (pool_size, max_overflow) == expected
+        assert (pool_size + max_overflow) * workers <= max_connections
+
+    @pytest.mark.parametrize(
+        "max_connections,workers,expected",
+        [(100, 4, (5, 10)), (40, 4, (5, 4)), (12, 4, (2, 0)), (8, 4, (1, 0))],
+    )
+    def test_split_connections_reserves_probe(self, max_connections, workers, expected):
+        """Тест: соединение фоновой проверки входит в предел вместе с пулом."""
+        pool_size, max_overflow = split_connections(
+            max_connections, workers, pool_size=5, max_overflow=10, reserved=1
+        )
+
+        assert (pool_size, max_overflow) == expected
+        assert (pool_size + max_overflow + 1) * workers <= max_connections
+
+    def test_split_connections_rejects_too_many_workers(self):
+        """Тест: меньше одного соединения на воркер — ошибка конфигурации."""
+        with pytest.raises(ValueError):
+            split_connections(3, 4)
+        with pytest.raises(ValueError):
+            split_connections(4, 4, reserved=1)
+
+    def test_configure_environment_sets_worker_pool(self, monkeypatch):
+        """Тест: размер пула и прогрев передаются воркерам через окружение."""
+        for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "APP_WARMUP"):
+            monkeypatch.delenv(name, raising=False)
+        args = argparse.Namespace(db_max_connections=20, warmup=True)
+
+        configure_environment(args, workers=1)
+
+        assert os.environ["DB_POOL_SIZE"] == "5"
+        assert os.environ["DB_MAX_OVERFLOW"] == "10"
+        assert os.environ["APP_WARMUP"] == "true"
+
+    def test_prepare_metrics_dir_clears_previous_run(self, tmp_path, monkeypatch):
+        """Тест: каталог метрик создается заново, без файлов прошлого запуска."""
+        multiproc_dir = tmp_path / "metrics"
+        multiproc_dir.mkdir()
+        (multiproc_dir / "counter_1.db").write_bytes(b"old")
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(multiproc_dir))
+
+        prepare_metrics_dir()
+
+        assert multiproc_dir.is_dir()
+        assert list(multiproc_dir.iterdir()) == []
+
+    def test_launcher_creates_missing_metrics_dir(self, tmp_path):
+        """Тест: запуск с несуществующим PROMETHEUS_MULTIPROC_DIR не падает."""
+        multiproc_dir = tmp_path / "missing" / "metrics"
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+        script = (
+            "import argparse\n"
+            "from src.questions_answers_api.cli import serve\n"
+            "serve.prepare_metrics_dir()\n"
+            "args = argparse.Namespace(db_max_connections=20, warmup=False)\n"
+            "serve.configure_environment(args, workers=1)\n"
+            "import src.questions_answers_api.main\n"
+        )
+
+        for command in (
+            ["-m", "src.questions_answers_api.cli.serve", "--help"],
+            ["-c", script],
+        ):
+            result = subprocess.run(
+                [sys.executable, *command],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            assert result.returncode == 0, result.stderr
+        assert multiproc_dir.is_dir()
+
+    def test_preload_leaves_no_supervisor_gauges(self, tmp_path):
+        """Тест: после импорта в родителе его gauge не входят в сумму воркеров."""
+        multiproc_dir = tmp_path / "metrics"
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+        script = (
+            "import os\n"
+            "from src.questions_answers_api.cli import serve\n"
+            "serve.prepare_metrics_dir()\n"
+            "serve.preload_app()\n"
+            "print(os.getpid())\n"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+        pid = result.stdout.split()[-1]
+        live = [path.name for path in multiproc_dir.glob(f"gauge_live*_{pid}.db")]
+        assert live == []
+
+    def test_warm_up(self, client):
+        """Тест: прогрев строит схему и выполняет запросы к базе."""
+        app.openapi_schema = None
+
+        timings = asyncio.run(warm_up(app, async_engine))
+
+        assert app.openapi_schema is not None
+        assert timings["connections"] == 1
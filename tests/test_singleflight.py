@@ -0,0 +1,173 @@
+import asyncio
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.questions_answers_api.core.cache import (
+    CacheBackend,
+    get_cache,
+    question_key,
+    set_cache,
+)
+from src.questions_answers_api.core.singleflight import SingleFlight
+from src.questions_answers_api.services import AnswerService, QuestionService
+from tests.conftest import TestingSessionLocal
+
+
+class TestSingleFlight:
+    """Тесты объединения одинаковых конкурентных загрузок."""
+
+    def test_concurrent_calls_share_one_fetch(self):
+        """Тест: одна загрузка на ключ, результат получают все."""
+
+        async def run():
+            flights = SingleFlight("test-share")
+            fetches = []
+            release = asyncio.Event()
+
+            async def fetch():
+                fetches.append(1)
+                await release.wait()
+                return object()
+
+            tasks = [asyncio.create_task(flights.do("k", 1, fetch)) for _ in range(5)]
+            other = asyncio.create_task(flights.do("k", 2, fetch))
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*tasks)
+            await other
+            return fetches, results, flights.in_flight()
+
+        fetches, results, in_flight = asyncio.run(run())
+        assert len(fetches) == 2
+        assert all(result is results[0] for result in results)
+        assert in_flight == 0
+
+    def test_error_is_handed_to_waiters(self):
+        """Тест: ошибку загрузки получают все ожидающие."""
+
+        async def run():
+            flights = SingleFlight("test-error")
+
+            async def fetch():
+                await asyncio.sleep(0.01)
+                raise HTTPException(status_code=404, detail="Не найдено")
+
+            return await asyncio.gather(
+                *(flights.do("k", None, fetch) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        errors = asyncio.run(run())
+        assert [error.status_code for error in errors] == [404, 404, 404]
+
+    def test_cancelled_leader_hands_over_fetch(self):
+        """Тест: отмена ведущего запроса не отменяет ожидающих."""
+
+        async def run():
+            flights = SingleFlight("test-cancel")
+            fetches = []
+
+            async def fetch():
+                fetches.append(1)
+                await asyncio.sleep(0.01)
+                return len(fetches)
+
+            leader = asyncio.create_task(flights.do("k", None, fetch))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flights.do("k", None, fetch))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower, leader.cancelled()
+
+        assert asyncio.run(run()) == (2, True)
+
+    def test_forget_starts_new_fetch(self):
+        """Тест: после forget новые запросы не ждут старую загрузку."""
+
+        async def run():
+            flights = SingleFlight("test-forget")
+            versions = iter(["old", "new"])
+
+            async def fetch():
+                version = next(versions)
+                await asyncio.sleep(0.01)
+                return version
+
+            old = asyncio.create_task(flights.do("k", None, fetch))
+            await asyncio.sleep(0)
+            flights.forget("k")
+            new = asyncio.create_task(flights.do("k", None, fetch))
+            await asyncio.sleep(0)
+            joined = asyncio.create_task(flights.do("k", None, fetch))
+            return await old, await new, await joined
+
+        assert asyncio.run(run()) == ("old", "new", "new")
+
+
+def concurrently(client: TestClient, load, count: int):
+    """Выполнить load(db) в count запросах одновременно, каждый в своей сессии."""
+
+    async def one():
+        async with TestingSessionLocal() as db:
+            return await load(db)
+
+    async def run():
+        return await asyncio.gather(
+            *(one() for _ in range(count)), return_exceptions=True
+        )
+
+    return client.portal.call(run)
+
+
+class TestCoalescedReads:
+    """Тесты объединения чтений вопросов и ответов."""
+
+    def test_hot_question_reads_share_query(
+        self, client: TestClient, question_with_answers, sql_statements
+    ):
+        """Тест: одновременные чтения вопроса — одна загрузка из базы."""
+        question_id = question_with_answers["question"]["id"]
+        set_cache(CacheBackend())
+
+        def load(db):
+            return QuestionService.get_question_by_id(db, question_id)
+
+        [alone] = concurrently(client, load, 1)
+        single_load = len(sql_statements)
+        sql_statements.clear()
+        results = concurrently(client, load, 10)
+
+        assert results == [alone] * 10
+        assert len(sql_statements) == single_load
+
+    def test_missing_answer_404_is_shared(
+        self, client: TestClient, created_question, sql_statements
+    ):
+        """Тест: 404 загрузки получают все одновременные запросы."""
+        errors = concurrently(
+            client, lambda db: AnswerService.get_answer_by_id(db, 999), 5
+        )
+
+        assert [error.status_code for error in errors] == [404] * 5
+        assert len(sql_statements) == 1
+
+    def test_invalidation_forgets_flights(self, client: TestClient):
+        """Тест: инвалидация кэша забывает загрузки ключа."""
+        flights = SingleFlight("test-invalidate")
+
+        async def run():
+            started = asyncio.Event()
+
+            async def fetch():
+                started.set()
+                await asyncio.sleep(0.01)
+                return "old"
+
+            old = asyncio.create_task(flights.do(question_key(1), None, fetch))
+            await started.wait()
+            await get_cache().invalidate(question_key(1))
+            assert flights.in_flight() == 0
+            return await old
+
+        assert client.portal.call(run) == "old"